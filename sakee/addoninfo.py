@@ -1,10 +1,12 @@
 # SPDX-License-Identifier: GPL-3.0
 
+import io
 import os
 import xml.etree.ElementTree as ET
 from collections import namedtuple
 
 from sakee.colors import Colors
+from sakee.filecache import FileCache
 from sakee.stub import KodiStub
 
 # Custom AddonData type
@@ -15,10 +17,106 @@ AddonData = namedtuple('AddonData', [
     'kodi_profile_path'  # the full path to the add-on profile folder
 ])
 
+# A dependency of an add-on
+AddonImport = namedtuple('AddonImport', [
+    'addon',  # the id of the required add-on
+    'version',  # the minimum version
+    'optional'  # is the dependency optional?
+])
+
+# An extension point of an add-on
+AddonExtension = namedtuple('AddonExtension', [
+    'point',  # the extension point (xbmc.python.pluginsource, xbmc.service, ...)
+    'attributes',  # the attributes of the <extension> element as (name, value) pairs
+    'provides'  # the content types the extension provides
+])
+
+
+class AddonMetadata(object):
+    """ The (read-only) data from an addon.xml. """
+
+    __slots__ = ('path', 'id', 'name', 'version', 'author', 'type', 'attributes', 'requires', 'extensions',
+                 'metadata', 'assets', 'summary', 'description', 'disclaimer', 'news', 'icon', 'fanart')
+
+    def __init__(self, path, attributes, requires, extensions, metadata, assets):
+        """ Creates the metadata record.
+
+        :param str path:                        The full path of the add-on folder.
+        :param tuple attributes:                The attributes of the <addon> element as (name, value) pairs.
+        :param tuple[AddonImport] requires:     The required add-ons.
+        :param tuple[AddonExtension] extensions: The extension points.
+        :param tuple metadata:                  The (English) metadata as (tag, text) pairs.
+        :param tuple assets:                    The assets as (tag, relative path) pairs.
+
+        """
+
+        attribute_values = dict(attributes)
+        metadata_values = dict(metadata)
+        asset_values = dict(assets)
+        main_types = [e.point for e in extensions if e.point not in ('xbmc.addon.metadata', 'kodi.addon.metadata')]
+
+        values = dict(
+            path=path,
+            id=attribute_values.get('id'),
+            name=attribute_values.get('name'),
+            version=attribute_values.get('version'),
+            author=attribute_values.get('provider-name'),
+            type=main_types[0] if main_types else None,
+            attributes=attributes,
+            requires=requires,
+            extensions=extensions,
+            metadata=metadata,
+            assets=assets,
+            summary=metadata_values.get('summary'),
+            description=metadata_values.get('description'),
+            disclaimer=metadata_values.get('disclaimer'),
+            news=metadata_values.get('news'),
+            icon=os.path.join(path, asset_values['icon']) if 'icon' in asset_values else None,
+            fanart=os.path.join(path, asset_values['fanart']) if 'fanart' in asset_values else None,
+        )
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def get_extension_attribute(self, point, name, default=None):
+        """ Returns an attribute of the first extension with the given extension point.
+
+        :param str point:       The extension point (xbmc.python.pluginsource, ...).
+        :param str name:        The name of the attribute (library, ...).
+        :param default:         The value to return if it was not found.
+
+        """
+
+        for extension in self.extensions:
+            if extension.point == point:
+                return dict(extension.attributes).get(name, default)
+        return default
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AddonMetadata is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("AddonMetadata is read-only")
+
+    def __reduce__(self):
+        return AddonMetadata, (self.path, self.attributes, self.requires, self.extensions, self.metadata, self.assets)
+
+    def __repr__(self):
+        return "AddonMetadata(id={}, version={}, path={})".format(self.id, self.version, self.path)
+
+
 __add_on_infos = {}
 
+metadata_cache = FileCache("addon.xml")
+
 
 def get_add_on_info_from_calling_script(add_on_id=None, print_info=False):
+    from sakee.context import EmulatorContext
+
+    # An explicitly activated context takes precedence over the working directory
+    context = EmulatorContext.current()
+    if context is not None:
+        return context.get_add_on_info(add_on_id)
+
     if add_on_id is not None:
         # Always print details for specific add-ons
         print_info = True
@@ -104,35 +202,96 @@ def get_add_on_info_from_calling_script(add_on_id=None, print_info=False):
 
 def read_addon_xml(path):
     """Parse the addon.xml and return an info dictionary"""
+    metadata = get_addon_metadata(path)
+
     info = dict(
         path='./',
         profile='special://userdata',
         type='xbmc.python.pluginsource',
     )
+    info.update(metadata.attributes)  # Add 'id', 'name' and 'version'
+    info['author'] = info.pop('provider-name', None)
+
+    library = metadata.get_extension_attribute('xbmc.python.pluginsource', 'library')
+    if library is not None:
+        info['pluginsource'] = library
+
+    info.update(metadata.metadata)
+    info.update(metadata.assets)
+    return info
+
+
+def get_addon_metadata(path):
+    """ Returns the metadata of an addon.xml, parsing the file only once per change.
+
+    :param str path:    The full path to the addon.xml.
+
+    :rtype: AddonMetadata
+
+    """
+
+    return metadata_cache.get(path, parse_addon_xml)
+
 
-    tree = ET.parse(path)
-    root = tree.getroot()
+def parse_addon_xml(path):
+    """ Parses an addon.xml in a single pass.
 
-    info.update(root.attrib)  # Add 'id', 'name' and 'version'
-    info['author'] = info.pop('provider-name')
+    :param str path:    The full path to the addon.xml.
 
+    :rtype: AddonMetadata
+
+    """
+
+    with io.open(path, "rb") as fp:
+        root = ET.parse(fp).getroot()
+
+    requires = []
+    extensions = []
+    metadata = {}
+    assets = []
     for child in root:
-        if child.attrib.get('point') == 'xbmc.python.pluginsource':
-            info['pluginsource'] = child.attrib.get('library')
+        if child.tag == 'requires':
+            for dependency in child.iter('import'):
+                requires.append(AddonImport(
+                    addon=dependency.get('addon'),
+                    version=dependency.get('version'),
+                    optional=dependency.get('optional', 'false').lower() == 'true'))
             continue
 
-        if child.attrib.get('point') == 'xbmc.addon.metadata':
-            for grandchild in child:
-                # Handle assets differently
-                if grandchild.tag == 'assets':
-                    for asset in grandchild:
-                        info[asset.tag] = asset.text
-                    continue
-                # Not in English ?  Drop it
-                if grandchild.attrib.get('lang', 'en_GB') != 'en_GB':
-                    continue
-                # Add metadata
-                info[grandchild.tag] = grandchild.text
+        if child.tag != 'extension':
             continue
 
-    return info
+        extensions.append(AddonExtension(
+            point=child.get('point'),
+            attributes=tuple(child.attrib.items()),
+            provides=tuple((child.findtext('provides') or '').split())))
+
+        if child.get('point') not in ('xbmc.addon.metadata', 'kodi.addon.metadata'):
+            continue
+
+        for grandchild in child:
+            # Handle assets differently
+            if grandchild.tag == 'assets':
+                assets.extend((asset.tag, asset.text) for asset in grandchild if asset.text)
+                continue
+
+            # Keep the best matching language: en_GB (or no language), English, anything else.
+            lang = grandchild.get('lang', 'en_GB')
+            if lang.lower() == 'en_gb':
+                priority = 0
+            elif lang.lower().startswith('en'):
+                priority = 1
+            else:
+                priority = 2
+
+            if grandchild.tag not in metadata or priority < metadata[grandchild.tag][0]:
+                metadata[grandchild.tag] = (priority, grandchild.text)
+
+    return AddonMetadata(
+        path=os.path.dirname(os.path.abspath(path)),
+        attributes=tuple(root.attrib.items()),
+        requires=tuple(requires),
+        extensions=tuple(extensions),
+        metadata=tuple((tag, text) for tag, (_, text) in metadata.items()),
+        assets=tuple(assets),
+    )
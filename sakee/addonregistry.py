@@ -0,0 +1,127 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import os
+import threading
+import xml.etree.ElementTree as ElementTree
+
+from sakee import addoninfo
+
+
+class AddonRegistry(object):
+    __registries = {}
+    __registries_lock = threading.Lock()
+
+    def __init__(self, kodi_home_path):
+        """ An index of the installed add-ons: add-on id -> AddonMetadata.
+
+        The add-on folders are only scanned again when one of them changed (based on the
+        modification time of the folders), so lookups are dictionary lookups.
+
+        :param str kodi_home_path:  The Kodi home path (special://home).
+
+        """
+
+        self.kodi_home_path = kodi_home_path
+        self.addon_folders = (
+            os.path.join(kodi_home_path, "addons"),
+            # The portable_data layout has the add-ons in the parent folder.
+            os.path.abspath(os.path.join(kodi_home_path, "..", "addons")),
+        )
+        self.scans = 0
+
+        self.__signature = None
+        self.__index = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get(kodi_home_path):
+        """ Returns the shared registry for a Kodi home path.
+
+        :param str kodi_home_path:  The Kodi home path (special://home).
+
+        :rtype: AddonRegistry
+
+        """
+
+        with AddonRegistry.__registries_lock:
+            registry = AddonRegistry.__registries.get(kodi_home_path)
+            if registry is None:
+                registry = AddonRegistry(kodi_home_path)
+                AddonRegistry.__registries[kodi_home_path] = registry
+            return registry
+
+    def get_addon(self, add_on_id):
+        """ Returns the metadata for an installed add-on.
+
+        :param str add_on_id:   The ID of the add-on.
+
+        :return: The metadata or None if the add-on is not installed.
+        :rtype: addoninfo.AddonMetadata|None
+
+        """
+
+        return self.__get_index().get(add_on_id)
+
+    def has_addon(self, add_on_id):
+        """ Is an add-on installed?
+
+        :param str add_on_id:   The ID of the add-on.
+
+        :rtype: bool
+
+        """
+
+        return add_on_id in self.__get_index()
+
+    def addons(self):
+        """ All installed add-ons, sorted by id.
+
+        :rtype: list[addoninfo.AddonMetadata]
+
+        """
+
+        index = self.__get_index()
+        return [index[add_on_id] for add_on_id in sorted(index)]
+
+    def refresh(self):
+        """ Forces a new scan of the add-on folders on the next lookup. """
+
+        with self.__lock:
+            self.__signature = None
+
+    def __get_index(self):
+        signature = tuple(self.__get_mtime(folder) for folder in self.addon_folders)
+        with self.__lock:
+            if signature != self.__signature:
+                self.__index = self.__scan()
+                self.__signature = signature
+                self.scans += 1
+            return self.__index
+
+    def __scan(self):
+        index = {}
+        for folder in self.addon_folders:
+            if not os.path.isdir(folder):
+                continue
+
+            for name in os.listdir(folder):
+                add_on_xml = os.path.join(folder, name, "addon.xml")
+                if not os.path.isfile(add_on_xml):
+                    continue
+
+                try:
+                    metadata = addoninfo.get_addon_metadata(add_on_xml)
+                except ElementTree.ParseError:
+                    # Just like Kodi, skip add-ons with an invalid addon.xml
+                    continue
+
+                # Add-ons in the Kodi home take precedence over those in the parent folder.
+                index.setdefault(metadata.id or name, metadata)
+        return index
+
+    @staticmethod
+    def __get_mtime(folder):
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return None
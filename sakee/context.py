@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import contextvars
+import os
+
+_active_context = contextvars.ContextVar("sakee_emulator_context", default=None)
+# The tokens of the contexts that were activated using a with-statement in the current thread or task.
+_entered_tokens = contextvars.ContextVar("sakee_emulator_context_tokens", default=())
+
+
+class EmulatorContext(object):
+    def __init__(self, kodi_home_path, add_on_id, kodi_profile_path=None, add_on_path=None):
+        """ The Kodi environment in which an add-on is emulated.
+
+        Without an active context, SAKÉ determines the add-on from the working directory and the
+        environment variables. A context can be activated per thread or asyncio task, so a single
+        interpreter can emulate multiple add-ons at the same time.
+
+        :param str kodi_home_path:          The Kodi home path (special://home).
+        :param str add_on_id:               The ID of the emulated add-on.
+        :param str|None kodi_profile_path:  The Kodi profile path (special://profile). Defaults to
+                                            the userdata folder in the Kodi home path.
+        :param str|None add_on_path:        The path of the add-on. Defaults to the add-on's folder
+                                            in the Kodi home path.
+
+        """
+
+        self.kodi_home_path = os.path.abspath(kodi_home_path)
+        self.kodi_profile_path = os.path.abspath(kodi_profile_path or os.path.join(self.kodi_home_path, "userdata"))
+        self.add_on_id = add_on_id
+        self.add_on_path = os.path.abspath(add_on_path) if add_on_path else self.__find_add_on_path(add_on_id)
+
+    @staticmethod
+    def current():
+        """ The context that is active for the current thread or task.
+
+        :return: The active context or None if no context was activated.
+        :rtype: EmulatorContext|None
+
+        """
+
+        return _active_context.get()
+
+    def get_add_on_info(self, add_on_id=None):
+        """ Returns the paths for an add-on in this context.
+
+        :param str|None add_on_id:  The ID of the add-on, or None for the emulated add-on.
+
+        :rtype: sakee.addoninfo.AddonData
+
+        """
+
+        from sakee.addoninfo import AddonData
+
+        if add_on_id is None or add_on_id == self.add_on_id:
+            add_on_id = self.add_on_id
+            add_on_path = self.add_on_path
+        else:
+            add_on_path = self.__find_add_on_path(add_on_id)
+
+        return AddonData(
+            kodi_home_path=self.kodi_home_path,
+            add_on_id=add_on_id,
+            add_on_path=add_on_path,
+            kodi_profile_path=self.kodi_profile_path
+        )
+
+    def activate(self):
+        """ Activates this context for the current thread or task.
+
+        :return: A token that can be passed to deactivate().
+        :rtype: contextvars.Token
+
+        """
+
+        return _active_context.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        """ Restores the context that was active before activate() was called.
+
+        :param contextvars.Token token:     The token returned by activate().
+
+        """
+
+        _active_context.reset(token)
+
+    def run(self, function, *args, **kwargs):
+        """ Runs a function with this context activated, without changing the caller's context.
+
+        This can be used as a thread target, as new threads do not inherit the active context.
+
+        :param function:    The function to call.
+
+        :return: The return value of the function.
+
+        """
+
+        def run_in_context():
+            self.activate()
+            return function(*args, **kwargs)
+
+        return contextvars.copy_context().run(run_in_context)
+
+    def __find_add_on_path(self, add_on_id):
+        add_on_path = os.path.join(self.kodi_home_path, "addons", add_on_id)
+        if not os.path.isdir(add_on_path):
+            parent_path = os.path.abspath(os.path.join(self.kodi_home_path, "..", "addons", add_on_id))
+            if os.path.isdir(parent_path):
+                return parent_path
+        return add_on_path
+
+    def __enter__(self):
+        token = self.activate()
+        _entered_tokens.set(_entered_tokens.get() + (token,))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        tokens = _entered_tokens.get()
+        _entered_tokens.set(tokens[:-1])
+        EmulatorContext.deactivate(tokens[-1])
+
+    def __repr__(self):
+        return "EmulatorContext(add_on_id={}, kodi_home_path={})".format(self.add_on_id, self.kodi_home_path)
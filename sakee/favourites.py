@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import io
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from sakee.filecache import FileCache
+from sakee.persistence import write_atomic
+
+# A Kodi favourite
+Favourite = namedtuple('Favourite', [
+    'title',  # the name of the favourite
+    'type',  # media, window, script, androidapp or unknown
+    'path',  # the path for media and script favourites
+    'window',  # the window for window favourites
+    'windowparameter',  # the window parameter for window favourites
+    'thumbnail',  # the thumbnail
+    'action'  # the complete action (PlayMedia("..."), ...)
+])
+
+favourites_cache = FileCache("favourites.xml")
+
+__favourites_lock = threading.Lock()
+__action_regex = re.compile(r'^\s*([\w.]+)\s*\((.*)\)\s*$', re.DOTALL)
+__action_types = {
+    'playmedia': 'media',
+    'activatewindow': 'window',
+    'runscript': 'script',
+    'startandroidactivity': 'androidapp',
+}
+
+
+def get_favourites(path):
+    """ Returns the favourites from a favourites.xml, parsing the file only once per change.
+
+    :param str path:    The full path to the favourites.xml.
+
+    :return: The favourites or an empty list if there is no favourites.xml.
+    :rtype: list[Favourite]
+
+    """
+
+    if not os.path.isfile(path):
+        return []
+    return favourites_cache.get(path, read_favourites_xml)
+
+
+def read_favourites_xml(path):
+    """ Parses a Kodi favourites.xml.
+
+    :param str path:    The full path to the favourites.xml.
+
+    :rtype: list[Favourite]
+
+    """
+
+    with io.open(path, "rb") as fp:
+        root = ET.parse(fp).getroot()
+
+    # ElementTree already decoded the XML entities, so the values are used as they are.
+    favourites = []
+    for element in root.iter('favourite'):
+        title = element.get('name', '')
+        thumbnail = element.get('thumb', '')
+        action = (element.text or '').strip()
+        favourites.append(__create_favourite(title, action, thumbnail))
+    return favourites
+
+
+def add_favourite(path, title, favourite_type, path_or_window=None, windowparameter=None, thumbnail=None):
+    """ Adds a favourite to a favourites.xml, replacing the file atomically.
+
+    :param str path:                    The full path to the favourites.xml.
+    :param str title:                   The name of the favourite.
+    :param str favourite_type:          The type: media, window or script.
+    :param str|None path_or_window:     The path (media and script) or the window (window).
+    :param str|None windowparameter:    The window parameter (window).
+    :param str|None thumbnail:          The thumbnail.
+
+    :rtype: Favourite
+
+    """
+
+    if not path_or_window:
+        raise ValueError("A {} favourite requires a {}".format(
+            favourite_type, 'window' if favourite_type == 'window' else 'path'))
+
+    if favourite_type == 'media':
+        action = 'PlayMedia({})'.format(__quote(path_or_window))
+    elif favourite_type == 'script':
+        action = 'RunScript({})'.format(__quote(path_or_window))
+    elif favourite_type == 'window':
+        arguments = [path_or_window]
+        if windowparameter:
+            arguments.append(__quote(windowparameter))
+        action = 'ActivateWindow({})'.format(",".join(arguments))
+    else:
+        raise ValueError("Unsupported favourite type: {}".format(favourite_type))
+
+    favourite = __create_favourite(title, action, thumbnail or '')
+    with __favourites_lock:
+        favourites = list(get_favourites(path))
+        favourites.append(favourite)
+
+        root = ET.Element('favourites')
+        root.text = "\n    "
+        for item in favourites:
+            element = ET.SubElement(root, 'favourite', name=item.title)
+            if item.thumbnail:
+                element.set('thumb', item.thumbnail)
+            element.text = item.action
+            element.tail = "\n    "
+        element.tail = "\n"
+        write_atomic(path, ET.tostring(root, encoding='unicode'))
+    return favourite
+
+
+def __create_favourite(title, action, thumbnail):
+    match = __action_regex.match(action)
+    if not match:
+        return Favourite(title=title, type='unknown', path=None, window=None, windowparameter=None,
+                         thumbnail=thumbnail, action=action)
+
+    function, arguments = match.group(1), __split_arguments(match.group(2))
+    action_type = __action_types.get(function.lower(), 'unknown')
+    path = window = window_parameter = None
+    if action_type == 'window':
+        window = arguments[0] if arguments else None
+        window_parameter = arguments[1] if len(arguments) > 1 else None
+    elif arguments:
+        path = arguments[0]
+
+    return Favourite(title=title, type=action_type, path=path, window=window, windowparameter=window_parameter,
+                     thumbnail=thumbnail, action=action)
+
+
+def __split_arguments(arguments):
+    """ Splits the arguments of a Kodi action on commas outside of double quotes. """
+
+    result = []
+    current = []
+    quoted = False
+    for character in arguments:
+        if character == '"':
+            quoted = not quoted
+        elif character == ',' and not quoted:
+            result.append("".join(current).strip())
+            current = []
+        else:
+            current.append(character)
+    if current or result:
+        result.append("".join(current).strip())
+    return result
+
+
+def __quote(value):
+    return '"{}"'.format(value or '')
@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import hashlib
+import io
+import os
+import pickle
+import threading
+from collections import namedtuple
+
+from sakee.persistence import write_atomic
+
+# Statistics for a FileCache
+CacheInfo = namedtuple('CacheInfo', [
+    'hits',  # number of lookups served from the in-memory cache
+    'disk_hits',  # number of lookups served from the on-disk cache
+    'misses',  # number of lookups that required (re-)parsing the file
+    'size'  # the number of files currently cached in memory
+])
+
+# Bump this whenever the structure of the cached data changes, to invalidate on-disk caches.
+CACHE_VERSION = 2
+
+
+def get_cache_dir():
+    """ The folder for the on-disk cache, configured with the KODI_STUB_CACHE_DIR environment variable.
+
+    :return: The full path of the cache folder or None if the on-disk cache is disabled.
+    :rtype: str|None
+
+    """
+
+    cache_dir = os.environ.get("KODI_STUB_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return os.path.abspath(cache_dir)
+
+
+class FileCache(object):
+    def __init__(self, name, persistent=True):
+        """ A process wide cache for data that was parsed from files.
+
+        Entries are keyed by the file path and validated against the modification time and
+        size of the file, so a file is only parsed again once it actually changed on disk.
+
+        If an on-disk cache folder is configured (see get_cache_dir()) and the cache is
+        persistent, the parsed data is also stored there (pickled), so a new process can load
+        the pre-parsed data instead of parsing the file again.
+
+        :param str name:            The name of the cache (used for reporting and on-disk files).
+        :param bool persistent:     Should the parsed data also be stored in the on-disk cache?
+
+        """
+
+        self.name = name
+        self.persistent = persistent
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.__entries = {}
+        self.__lock = threading.Lock()
+
+    def get(self, path, loader):
+        """ Retrieves the parsed content of a file, parsing it only if it was changed.
+
+        The returned value is shared between all callers, so callers should not modify it.
+
+        :param str path:        The full path of the file.
+        :param loader:          Callable that parses the file: loader(path) -> value.
+
+        :return: The parsed value for the file.
+
+        """
+
+        signature = FileCache.signature(path)
+        with self.__lock:
+            entry = self.__entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[1]
+
+        cache_file = self.__get_cache_file(path)
+        found, value = self.__read_cache_file(cache_file, path, signature)
+        with self.__lock:
+            if found:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+
+        if not found:
+            value = loader(path)
+            self.__write_cache_file(cache_file, path, signature, value)
+
+        with self.__lock:
+            self.__entries[path] = (signature, value)
+        return value
+
+    def info(self):
+        """ The hit/miss statistics for this cache.
+
+        :rtype: CacheInfo
+
+        """
+
+        with self.__lock:
+            return CacheInfo(hits=self.hits, disk_hits=self.disk_hits, misses=self.misses, size=len(self.__entries))
+
+    def clear(self):
+        """ Removes all in-memory entries and resets the statistics. """
+
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def signature(path):
+        """ The signature used to validate cached entries for a file.
+
+        :param str path:    The full path of the file.
+
+        :return: A (mtime, size) tuple or None if the file does not exist.
+        :rtype: tuple|None
+
+        """
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def __get_cache_file(self, path):
+        """ The on-disk cache file for a source file, or None if there is no on-disk cache. """
+
+        cache_dir = get_cache_dir()
+        if not self.persistent or cache_dir is None:
+            return None
+
+        name = "".join(c if c.isalnum() else "_" for c in self.name)
+        key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(cache_dir, "{}-{}.v{}.pickle".format(name, key, CACHE_VERSION))
+
+    @staticmethod
+    def __read_cache_file(cache_file, path, signature):
+        """ Reads a value from the on-disk cache if it is still valid.
+
+        :return: A (found, value) tuple.
+        :rtype: tuple[bool, any]
+
+        """
+
+        if cache_file is None or signature is None:
+            return False, None
+
+        try:
+            with io.open(cache_file, "rb") as fp:
+                cached_path, cached_signature, value = pickle.load(fp)
+        except (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError, pickle.UnpicklingError):
+            return False, None
+
+        if cached_path != os.path.abspath(path) or tuple(cached_signature) != signature:
+            return False, None
+        return True, value
+
+    @staticmethod
+    def __write_cache_file(cache_file, path, signature, value):
+        if cache_file is None or signature is None:
+            return
+
+        try:
+            data = pickle.dumps((os.path.abspath(path), signature, value), protocol=pickle.HIGHEST_PROTOCOL)
+            write_atomic(cache_file, data)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # The on-disk cache is just an optimisation
+            pass
+
+    def __repr__(self):
+        return "FileCache({}, {})".format(self.name, self.info())
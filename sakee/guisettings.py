@@ -0,0 +1,213 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import io
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, namedtuple
+
+from sakee.filecache import FileCache
+from sakee.persistence import BatchedWriter
+
+# A Kodi (GUI) setting
+GuiSetting = namedtuple('GuiSetting', [
+    'id',  # the id of the setting (network.usehttpproxy, ...)
+    'type',  # the JSON RPC type of the value: boolean, integer, number or string
+    'value',  # the typed value
+    'default'  # is this the default value?
+])
+
+guisettings_cache = FileCache("guisettings.xml")
+
+__integer_regex = re.compile(r'^-?\d+$')
+__number_regex = re.compile(r'^-?\d+\.\d+$')
+
+
+class GuiSettings(object):
+    __stores = {}
+    __stores_lock = threading.Lock()
+
+    def __init__(self, path):
+        """ The Kodi settings from a guisettings.xml.
+
+        The file is only parsed again when it changed on disk. Changed values are kept in memory
+        and written back in batches.
+
+        :param str path:    The full path to the guisettings.xml.
+
+        """
+
+        self.path = path
+
+        # The values that were set, by id. They take precedence over the values in the file.
+        self.__changes = OrderedDict()
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get(path):
+        """ Returns the shared settings store for a guisettings.xml.
+
+        :param str path:    The full path to the guisettings.xml.
+
+        :rtype: GuiSettings
+
+        """
+
+        with GuiSettings.__stores_lock:
+            store = GuiSettings.__stores.get(path)
+            if store is None:
+                store = GuiSettings(path)
+                GuiSettings.__stores[path] = store
+            return store
+
+    def get_setting(self, setting_id):
+        """ Retrieves a setting.
+
+        :param str setting_id:  The id of the setting.
+
+        :return: The setting or None if it does not exist.
+        :rtype: GuiSetting|None
+
+        """
+
+        with self.__lock:
+            setting = self.__changes.get(setting_id)
+        if setting is not None:
+            return setting
+        return self.__get_file_settings().get(setting_id)
+
+    def get_settings(self):
+        """ Retrieves all settings.
+
+        :rtype: list[GuiSetting]
+
+        """
+
+        settings = OrderedDict(self.__get_file_settings())
+        with self.__lock:
+            settings.update(self.__changes)
+        return list(settings.values())
+
+    def set_value(self, setting_id, value):
+        """ Changes the value of a setting. The guisettings.xml is written in a batch.
+
+        :param str setting_id:  The id of the setting.
+        :param value:           The new (typed) value.
+
+        """
+
+        with self.__lock:
+            self.__changes[setting_id] = GuiSetting(
+                id=setting_id, type=get_value_type(value), value=value, default=False)
+        BatchedWriter.instance().schedule(self.path, self.__render)
+
+    def flush(self):
+        """ Writes pending changes to the guisettings.xml. """
+
+        BatchedWriter.instance().flush(self.path)
+
+    def __get_file_settings(self):
+        return guisettings_cache.get(self.path, read_guisettings_xml) or {}
+
+    def __render(self):
+        root = ET.Element('settings', version="2")
+        root.text = "\n    "
+        element = None
+        for setting in self.get_settings():
+            element = ET.SubElement(root, 'setting', id=setting.id)
+            if setting.default:
+                element.set('default', 'true')
+            element.text = encode_value(setting.value)
+            element.tail = "\n    "
+        if element is not None:
+            element.tail = "\n"
+        return ET.tostring(root, encoding='unicode')
+
+
+def read_guisettings_xml(path):
+    """ Parses a guisettings.xml.
+
+    Both the current (<setting id="section.name">) and the pre-Kodi 18 (<section><name>) formats
+    are supported.
+
+    :param str path:    The full path to the guisettings.xml.
+
+    :return: The settings by id or None if the file does not exist.
+    :rtype: OrderedDict[str, GuiSetting]|None
+
+    """
+
+    try:
+        with io.open(path, "rb") as fp:
+            root = ET.parse(fp).getroot()
+    except (IOError, OSError):
+        return None
+
+    settings = OrderedDict()
+    if root.get('version'):
+        elements = ((element.get('id'), element) for element in root.iter('setting') if element.get('id'))
+    else:
+        elements = (("{}.{}".format(section.tag, element.tag), element) for section in root for element in section)
+
+    for setting_id, element in elements:
+        value = decode_value(element.text or '')
+        settings[setting_id] = GuiSetting(
+            id=setting_id, type=get_value_type(value), value=value,
+            default=element.get('default', 'false') == 'true')
+    return settings
+
+
+def decode_value(text):
+    """ Converts the text of a setting into a typed value.
+
+    :param str text:    The value as stored in the guisettings.xml.
+
+    :rtype: bool|int|float|str
+
+    """
+
+    if text == 'true':
+        return True
+    if text == 'false':
+        return False
+    if __integer_regex.match(text):
+        return int(text)
+    if __number_regex.match(text):
+        return float(text)
+    return text
+
+
+def encode_value(value):
+    """ Converts a typed value into the text to store in the guisettings.xml.
+
+    :param value:   The typed value.
+
+    :rtype: str
+
+    """
+
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, tuple)):
+        return '|'.join(encode_value(v) for v in value)
+    return str(value)
+
+
+def get_value_type(value):
+    """ The JSON RPC type for a setting value.
+
+    :param value:   The typed value.
+
+    :rtype: str
+
+    """
+
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    if isinstance(value, (list, tuple)):
+        return 'list'
+    return 'string'
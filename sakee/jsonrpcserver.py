@@ -0,0 +1,202 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import json
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sakee.colors import Colors
+from sakee.context import EmulatorContext
+from sakee.sakejsonrpc import execute_jsonrpc_obj
+from sakee.stub import KodiStub
+
+# Statistics for a JSON RPC method
+MethodStats = namedtuple('MethodStats', [
+    'count',  # the number of requests
+    'errors',  # the number of failed requests
+    'requests_per_second',  # the average number of requests per second since the server started
+    'average',  # the average duration in milliseconds
+    'minimum',  # the shortest duration in milliseconds
+    'maximum'  # the longest duration in milliseconds
+])
+
+
+class JsonRpcServer(object):
+    def __init__(self, host="127.0.0.1", port=8080, context=None):
+        """ A local HTTP server that answers JSON RPC requests on /jsonrpc, just like Kodi does.
+
+        The requests are handled by the same implementation as xbmc.executeJSONRPC. Each
+        connection is handled in its own thread and HTTP/1.1 keep-alive is supported.
+
+        :param str host:                        The interface to listen on. Defaults to localhost.
+        :param int port:                        The port to listen on. Use 0 for a free port.
+        :param EmulatorContext|None context:    The context to handle requests in. Defaults to the
+                                                context that is active when the server is started.
+
+        """
+
+        self.host = host
+        self.port = port
+        self.context = context
+
+        self.__server = None
+        self.__thread = None
+        self.__started = None
+        self.__stats = {}
+        self.__stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        """ The url of the JSON RPC endpoint.
+
+        :rtype: str
+
+        """
+
+        return "http://{}:{}/jsonrpc".format(self.host, self.port)
+
+    def start(self):
+        """ Starts the server in a background thread. """
+
+        if self.context is None:
+            self.context = EmulatorContext.current()
+
+        self.__server = ThreadingHTTPServer((self.host, self.port), self.__create_handler())
+        self.__server.daemon_threads = True
+        self.port = self.__server.server_address[1]
+        self.__started = time.monotonic()
+
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name="JsonRpcServer", daemon=True)
+        self.__thread.start()
+        KodiStub.print_line("JSON RPC server listening on {}".format(self.url), color=Colors.Blue)
+
+    def stop(self):
+        """ Stops the server. """
+
+        if self.__server is None:
+            return
+
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__server = None
+
+    def stats(self):
+        """ The statistics per JSON RPC method.
+
+        :rtype: dict[str, MethodStats]
+
+        """
+
+        elapsed = max(time.monotonic() - (self.__started or time.monotonic()), 1e-9)
+        with self.__stats_lock:
+            return dict(
+                (method, MethodStats(
+                    count=count,
+                    errors=errors,
+                    requests_per_second=count / elapsed,
+                    average=total * 1000.0 / count,
+                    minimum=minimum * 1000.0,
+                    maximum=maximum * 1000.0
+                ))
+                for method, (count, errors, total, minimum, maximum) in self.__stats.items()
+            )
+
+    def execute(self, json_data):
+        """ Executes a decoded JSON RPC request (or batch) and records the statistics.
+
+        :param dict|list json_data:     The JSON RPC request or a list of requests for a batch.
+
+        :return: The JSON RPC response(s) or None if there is nothing to answer.
+        :rtype: dict|list[dict]|None
+
+        """
+
+        if self.context is not None:
+            return self.context.run(execute_jsonrpc_obj, json_data, self.__record)
+        return execute_jsonrpc_obj(json_data, self.__record)
+
+    def __record(self, method, duration, failed):
+        method = str(method).lower()
+        with self.__stats_lock:
+            count, errors, total, minimum, maximum = self.__stats.get(method, (0, 0, 0.0, duration, duration))
+            self.__stats[method] = (
+                count + 1,
+                errors + (1 if failed else 0),
+                total + duration,
+                min(minimum, duration),
+                max(maximum, duration)
+            )
+
+    def __create_handler(self):
+        server = self
+
+        class JsonRpcRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            # noinspection PyPep8Naming
+            def do_POST(self):  # NOSONAR
+                if self.path.split("?", 1)[0] != "/jsonrpc":
+                    self.__send(404, None)
+                    return
+
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                try:
+                    json_data = json.loads(body.decode("utf-8"))
+                except ValueError:
+                    self.__send(200, dict(id=None, jsonrpc="2.0", error=dict(code=-32700, message="Parse error")))
+                    return
+
+                try:
+                    response = server.execute(json_data)
+                except Exception as ex:
+                    KodiStub.print_line("Error handling JSON RPC request: {}".format(ex), color=Colors.Red)
+                    request_id = json_data.get("id") if isinstance(json_data, dict) else None
+                    response = dict(id=request_id, jsonrpc="2.0", error=dict(code=-32603, message=str(ex)))
+                self.__send(200, response)
+
+            # noinspection PyPep8Naming
+            def do_GET(self):  # NOSONAR
+                if self.path.split("?", 1)[0] != "/jsonrpc/stats":
+                    self.__send(404, None)
+                    return
+
+                self.__send(200, dict((method, stats._asdict()) for method, stats in server.stats().items()))
+
+            def __send(self, status, content):
+                body = json.dumps(content).encode("utf-8") if content is not None else b""
+                self.send_response(status if body or status != 200 else 204)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                KodiStub.print_line("JSON RPC server: {}".format(format % args), verbose=True)
+
+        return JsonRpcRequestHandler
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serves the emulated JSON RPC API over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="The interface to listen on.")
+    parser.add_argument("--port", type=int, default=8080, help="The port to listen on.")
+    arguments = parser.parse_args()
+
+    json_rpc_server = JsonRpcServer(arguments.host, arguments.port)
+    json_rpc_server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        json_rpc_server.stop()
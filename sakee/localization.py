@@ -0,0 +1,80 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import io
+import re
+
+from sakee.filecache import FileCache
+
+strings_cache = FileCache("strings.po")
+
+__string_id_regex = re.compile(r'^#(\d+)$')
+__escapes = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+__escape_regex = re.compile(r'\\(.)')
+
+
+def get_strings(path):
+    """ Returns the strings of a strings.po file, parsing the file only once per change.
+
+    :param str path:    The full path to the strings.po file.
+
+    :return: A dictionary with string IDs and their translation.
+    :rtype: dict[int, str]
+
+    """
+
+    return strings_cache.get(path, read_strings_po)
+
+
+def read_strings_po(path):
+    """ Parses a Kodi strings.po file line by line.
+
+    Entries with a numeric context (msgctxt "#30000") are returned. The msgstr is used if it was
+    translated, otherwise the msgid is used. Multi-line msgid and msgstr values are joined.
+
+    :param str path:    The full path to the strings.po file.
+
+    :return: A dictionary with string IDs and their translation.
+    :rtype: dict[int, str]
+
+    """
+
+    translations = {}
+    entry = {}
+    keyword = None
+
+    with io.open(path, "r", encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith('"'):
+                # Continuation of the previous keyword
+                if keyword is not None:
+                    entry[keyword] += __unquote(line)
+                continue
+
+            keyword, _, value = line.partition(" ")
+            if keyword == "msgctxt" and entry:
+                __add_translation(translations, entry)
+                entry = {}
+            entry[keyword] = __unquote(value.strip())
+
+    if entry:
+        __add_translation(translations, entry)
+    return translations
+
+
+def __add_translation(translations, entry):
+    string_id = __string_id_regex.match(entry.get("msgctxt", ""))
+    if not string_id:
+        return
+
+    translation = entry.get("msgstr") or entry.get("msgid", "")
+    translations[int(string_id.group(1))] = translation.replace("[CR]", "\n")
+
+
+def __unquote(value):
+    if len(value) < 2 or value[0] != '"' or value[-1] != '"':
+        return ""
+    return __escape_regex.sub(lambda m: __escapes.get(m.group(1), m.group(0)), value[1:-1])
@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import threading
+import time
+from collections import OrderedDict
+
+from sakee.filecache import CacheInfo
+
+
+class LruCache(object):
+    def __init__(self, max_size=128, ttl=60.0):
+        """ A thread-safe, in-memory, least recently used cache with expiring entries.
+
+        :param int max_size:    The maximum number of entries to keep.
+        :param float ttl:       The number of seconds an entry stays valid. 0 disables the cache.
+
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key, loader):
+        """ Retrieves the value for a key, loading it if it is not cached or if it expired.
+
+        :param key:         The (hashable) key.
+        :param loader:      Callable that creates the value: loader() -> value.
+
+        :return: The (cached) value.
+
+        """
+
+        now = time.monotonic()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+        if self.ttl <= 0:
+            return value
+
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+        return value
+
+    def info(self):
+        """ The hit/miss statistics for this cache.
+
+        :rtype: CacheInfo
+
+        """
+
+        with self.__lock:
+            return CacheInfo(hits=self.hits, disk_hits=0, misses=self.misses, size=len(self.__entries))
+
+    def clear(self):
+        """ Removes all entries and resets the statistics. """
+
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,146 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import atexit
+import io
+import os
+import tempfile
+import threading
+
+from sakee.colors import Colors
+from sakee.stub import KodiStub
+
+
+def write_atomic(path, content):
+    """ Writes to a file by writing a temporary file and renaming it over the target.
+
+    Readers will either see the old or the new content, but never a partially written file.
+
+    :param str path:                The full path of the file to write.
+    :param str|bytes content:       The (unicode) text or bytes to write.
+
+    """
+
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=".{}.".format(os.path.basename(path)), suffix=".tmp", dir=folder or None)
+    try:
+        if isinstance(content, bytes):
+            with io.open(fd, "wb") as fp:
+                fp.write(content)
+        else:
+            with io.open(fd, "w", encoding="utf-8") as fp:
+                fp.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class BatchedWriter(object):
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, delay=None):
+        """ Collects pending file writes and flushes them in batches.
+
+        Writes are debounced: each new write request postpones the flush by `delay` seconds. Pending
+        writes are also flushed on an explicit flush() and when the interpreter exits.
+
+        :param float|None delay:    Debounce delay in seconds. Defaults to KODI_STUB_FLUSH_DELAY or 1s.
+
+        """
+
+        if delay is None:
+            delay = float(os.environ.get("KODI_STUB_FLUSH_DELAY", "1.0"))
+
+        self.delay = delay
+        self.writes = 0
+
+        self.__pending = {}
+        # The files that are being written by a flush
+        self.__writing = set()
+        self.__timer = None
+        self.__lock = threading.RLock()
+        # Serializes the writes, so an older render never overwrites a newer one.
+        self.__write_lock = threading.Lock()
+
+    @staticmethod
+    def instance():
+        """ The process wide writer that is flushed at exit.
+
+        :rtype: BatchedWriter
+
+        """
+
+        with BatchedWriter.__instance_lock:
+            if BatchedWriter.__instance is None:
+                BatchedWriter.__instance = BatchedWriter()
+                atexit.register(BatchedWriter.__instance.flush)
+            return BatchedWriter.__instance
+
+    def schedule(self, path, render):
+        """ Schedules a (re)write of a file.
+
+        :param str path:    The full path of the file to write.
+        :param render:      Callable that returns the content to write. It is only called at flush
+                            time, so multiple updates to the same file result in a single write.
+
+        """
+
+        with self.__lock:
+            self.__pending[path] = render
+
+            if self.__timer is not None:
+                self.__timer.cancel()
+            self.__timer = threading.Timer(self.delay, self.flush)
+            self.__timer.daemon = True
+            self.__timer.start()
+
+    def is_pending(self, path):
+        """ Is there a pending write for the file?
+
+        :param str path:    The full path of the file.
+
+        :rtype: bool
+
+        """
+
+        with self.__lock:
+            return path in self.__pending or path in self.__writing
+
+    def flush(self, path=None):
+        """ Writes the pending files.
+
+        The renders are called without holding the lock of the writer, as they usually take the
+        lock of the data they render, while that lock is held when writes are scheduled.
+
+        :param str|None path:   Only flush this file, or all pending files if None.
+
+        """
+
+        with self.__write_lock:
+            with self.__lock:
+                if path is None:
+                    pending = list(self.__pending.items())
+                    self.__pending.clear()
+                    if self.__timer is not None:
+                        self.__timer.cancel()
+                        self.__timer = None
+                elif path in self.__pending:
+                    pending = [(path, self.__pending.pop(path))]
+                else:
+                    pending = []
+                self.__writing.update(file_path for file_path, _ in pending)
+
+            for file_path, render in pending:
+                try:
+                    write_atomic(file_path, render())
+                    self.writes += 1
+                except Exception as ex:
+                    KodiStub.print_line("Error writing '{}': {}".format(file_path, ex), color=Colors.Red)
+                finally:
+                    with self.__lock:
+                        self.__writing.discard(file_path)
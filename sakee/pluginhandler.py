@@ -59,6 +59,8 @@ class HandleInfo(object):
         self.succeeded = False
         self.content = "not-set"
         self.sort_methods = set()
+        self.resolved_url = None
+        self.play_resolved = True
 
         self.__items = []
 
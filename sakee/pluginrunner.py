@@ -0,0 +1,632 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import contextlib
+import contextvars
+import importlib.abc
+import importlib.machinery
+import io
+import itertools
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import namedtuple
+from collections.abc import MutableSequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from sakee import addoninfo
+from sakee.addonregistry import AddonRegistry
+from sakee.colors import Colors
+from sakee.context import EmulatorContext
+from sakee.filecache import FileCache
+from sakee.lrucache import LruCache
+from sakee.stub import KodiStub
+
+# A parsed plugin:// uri
+PluginUri = namedtuple('PluginUri', [
+    'add_on_id',  # the id of the add-on
+    'add_on_path',  # the full path of the add-on
+    'route',  # the plugin://<add-on id>/<path> part (sys.argv[0])
+    'params',  # the query string, including the ? (sys.argv[2])
+    'entrypoint'  # the full path of the Python file that implements the plugin
+])
+
+# The outcome of a plugin invocation
+PluginResult = namedtuple('PluginResult', [
+    'plugin_uri',  # the plugin:// uri (or the script) that was run
+    'exit_code',  # the exit code: 0 on success, or the code passed to exit()
+    'exception',  # the exception that the plugin raised, or None
+    'listing',  # the (list item, url, is folder) tuples the plugin added to its handle
+    'resolved_url',  # the url the plugin resolved with setResolvedUrl(), or None
+    'duration',  # the wall time in seconds
+    'output'  # the output of the plugin when it ran in a worker process, otherwise None
+])
+
+# A picklable copy of a ListItem
+ListingItem = namedtuple('ListingItem', [
+    'label',  # the label
+    'label2',  # the second label
+    'path',  # the path
+    'art',  # the art as a dictionary
+    'info_labels',  # the info labels as a dictionary
+    'properties'  # the properties as a dictionary
+])
+
+# The listings of plugin:// uris, configured with KODI_STUB_LISTING_CACHE_TTL (in seconds, 0 disables it).
+listing_cache = LruCache(max_size=256, ttl=float(os.environ.get("KODI_STUB_LISTING_CACHE_TTL", "60")))
+
+# The compiled code of the plugin entry points. Code objects cannot be pickled, so they are only cached in memory.
+code_cache = FileCache("plugin.py", persistent=False)
+
+# The sys.argv of the plugin invocation that is running in the current thread (see ArgvProxy)
+_invocation_argv = contextvars.ContextVar("sakee_plugin_argv", default=None)
+_argv_lock = threading.Lock()
+# The add-on folder of the plugin invocation that is running in the current thread (see AddonModuleFinder)
+_invocation_add_on_path = contextvars.ContextVar("sakee_plugin_add_on_path", default=None)
+_finder_lock = threading.Lock()
+# The modules that each add-on imported from its own folder, by add-on folder
+__add_on_modules = {}
+__add_on_modules_lock = threading.Lock()
+
+__sys_path_lock = threading.Lock()
+__plugin_uri_regex = re.compile(r'^plugin://([^?\s/]*)([^?\s]*)(\?.*)?')
+# Handles for plugin invocations; Kodi uses positive numbers.
+__handles = itertools.count(1)
+__handles_lock = threading.Lock()
+
+
+def parse_plugin_uri(plugin_uri):
+    """ Determines the add-on and entry point for a plugin:// uri.
+
+    :param str plugin_uri:  The plugin:// uri.
+
+    :rtype: PluginUri
+
+    """
+
+    match = __plugin_uri_regex.search(plugin_uri)
+    if not match:
+        raise ValueError('Invalid plugin uri: %s' % plugin_uri)
+
+    add_on_id, path, params = match.groups()
+    kodi_home_path = addoninfo.get_add_on_info_from_calling_script().kodi_home_path
+    metadata = AddonRegistry.get(kodi_home_path).get_addon(add_on_id)
+    if metadata is None:
+        raise ValueError('Addon %s not found' % add_on_id)
+
+    library = metadata.get_extension_attribute('xbmc.python.pluginsource', 'library')
+    if library is None:
+        raise ValueError('Addon %s is not a plugin' % add_on_id)
+
+    return PluginUri(
+        add_on_id=add_on_id,
+        add_on_path=metadata.path,
+        route='plugin://' + add_on_id + path,
+        params=params or '',
+        entrypoint=os.path.join(metadata.path, library)
+    )
+
+
+def parse_script(script):
+    """ Determines the add-on folder and entry point of a script for RunScript().
+
+    :param str script:  The id of a script add-on or the path of a Python file.
+
+    :return: The full path of the add-on folder and the full path of the Python file.
+    :rtype: tuple[str, str]
+
+    """
+
+    if os.path.isfile(script):
+        entrypoint = os.path.abspath(script)
+        return os.path.dirname(entrypoint), entrypoint
+
+    kodi_home_path = addoninfo.get_add_on_info_from_calling_script().kodi_home_path
+    metadata = AddonRegistry.get(kodi_home_path).get_addon(script)
+    if metadata is None:
+        raise ValueError('Addon %s not found' % script)
+
+    library = metadata.get_extension_attribute('xbmc.python.script', 'library')
+    if library is None:
+        raise ValueError('Addon %s is not a script' % script)
+
+    return metadata.path, os.path.join(metadata.path, library)
+
+
+def new_handle():
+    """ A new, unique, handle for a plugin invocation.
+
+    :rtype: int
+
+    """
+
+    with __handles_lock:
+        return next(__handles)
+
+
+def compile_entrypoint(path):
+    """ Compiles the Python file that implements a plugin.
+
+    :param str path:    The full path of the Python file.
+
+    :rtype: types.CodeType
+
+    """
+
+    with open(path, 'rb') as fdesc:
+        return compile(fdesc.read(), path, 'exec')
+
+
+def add_to_sys_path(path):
+    """ Adds the folder of an add-on to the module search path, just like Kodi does.
+
+    Within an invocation, the AddonModuleFinder makes sure that top-level modules are imported from
+    the folder of the add-on that runs, even if other add-ons have modules with the same name.
+
+    :param str path:    The full path of the add-on folder.
+
+    """
+
+    AddonModuleFinder.install()
+    with __sys_path_lock:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+class AddonModuleFinder(importlib.abc.MetaPathFinder):
+    """ Imports top-level modules from the folder of the add-on that is running in the current thread.
+
+    Almost all add-ons have a resources package, so with a shared sys.path, an add-on would import
+    the resources package of the first add-on in the path.
+
+    """
+
+    @staticmethod
+    def install():
+        """ Adds the finder to the front of sys.meta_path, if that was not done before. """
+
+        with _finder_lock:
+            if not any(isinstance(finder, AddonModuleFinder) for finder in sys.meta_path):
+                sys.meta_path.insert(0, AddonModuleFinder())
+
+    def find_spec(self, fullname, path, target=None):
+        add_on_path = _invocation_add_on_path.get()
+        if add_on_path is None or path is not None:
+            # Submodules are found through the __path__ of their (add-on) package.
+            return None
+        return importlib.machinery.PathFinder.find_spec(fullname, [add_on_path], target)
+
+
+class ArgvProxy(MutableSequence):
+    def __init__(self, default):
+        """ A replacement for sys.argv that has a separate value for each plugin invocation.
+
+        Within a plugin invocation (see run_plugin()) it contains the arguments of that invocation,
+        elsewhere it contains the original arguments of the process.
+
+        :param list[str] default:   The original sys.argv.
+
+        """
+
+        self.default = default
+
+    @staticmethod
+    def install():
+        """ Replaces sys.argv with an ArgvProxy, if that was not done before. """
+
+        with _argv_lock:
+            if not isinstance(sys.argv, ArgvProxy):
+                sys.argv = ArgvProxy(sys.argv)
+
+    def __get_argv(self):
+        argv = _invocation_argv.get()
+        return self.default if argv is None else argv
+
+    def __getitem__(self, index):
+        return self.__get_argv()[index]
+
+    def __setitem__(self, index, value):
+        self.__get_argv()[index] = value
+
+    def __delitem__(self, index):
+        del self.__get_argv()[index]
+
+    def __len__(self):
+        return len(self.__get_argv())
+
+    def insert(self, index, value):
+        self.__get_argv().insert(index, value)
+
+    def __eq__(self, other):
+        return list(self.__get_argv()) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __add__(self, other):
+        return list(self.__get_argv()) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self.__get_argv())
+
+    def __repr__(self):
+        return repr(self.__get_argv())
+
+
+class PluginExecutor(object):
+    MODE_THREAD = "thread"
+    MODE_PROCESS = "process"
+
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, max_workers=None, mode=None):
+        """ Runs plugins in the background using a bounded pool of workers.
+
+        By default, the workers are threads. For CPU bound add-ons, the workers can also be
+        (pre-warmed) processes, so the plugins are not limited by the GIL. Process workers return
+        a picklable PluginResult, with ListingItem records instead of ListItems and the output
+        the plugin printed.
+
+        :param int|None max_workers:    The maximum number of plugins that run at the same time. Defaults
+                                        to KODI_STUB_PLUGIN_WORKERS or 4. Other plugins wait in a queue.
+        :param str|None mode:           The type of workers: "thread" or "process". Defaults to
+                                        KODI_STUB_PLUGIN_EXECUTOR or "thread".
+
+        """
+
+        if max_workers is None:
+            max_workers = int(os.environ.get("KODI_STUB_PLUGIN_WORKERS", "4"))
+        if mode is None:
+            mode = os.environ.get("KODI_STUB_PLUGIN_EXECUTOR", PluginExecutor.MODE_THREAD)
+        if mode not in (PluginExecutor.MODE_THREAD, PluginExecutor.MODE_PROCESS):
+            raise ValueError("Invalid plugin executor mode: {}".format(mode))
+
+        self.max_workers = max_workers
+        self.mode = mode
+
+        if mode == PluginExecutor.MODE_PROCESS:
+            # Spawn the workers, as forking a process with running threads is not safe.
+            self.__executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                initializer=initialize_worker)
+            # Start all workers right away, so they are warm when the first plugin is submitted.
+            for _ in range(max_workers):
+                self.__executor.submit(time.sleep, 0)
+        else:
+            self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="PluginRunner")
+
+    @staticmethod
+    def instance():
+        """ The process wide plugin executor.
+
+        :rtype: PluginExecutor
+
+        """
+
+        with PluginExecutor.__instance_lock:
+            if PluginExecutor.__instance is None:
+                PluginExecutor.__instance = PluginExecutor()
+            return PluginExecutor.__instance
+
+    def submit(self, plugin_uri):
+        """ Schedules a plugin:// uri to run within the emulator context of the caller.
+
+        :param str plugin_uri:  The plugin:// uri.
+
+        :return: A future with the PluginResult.
+        :rtype: concurrent.futures.Future
+
+        """
+
+        # Make sure the Add-on that belongs to this plugin://-uri exists before scheduling it.
+        parse_plugin_uri(plugin_uri)
+
+        if self.mode == PluginExecutor.MODE_PROCESS:
+            # Worker processes inherit the working directory and environment, but not the active context.
+            # The player of the worker has no listeners, so the caller plays the resolved url instead.
+            worker_future = self.__executor.submit(
+                run_in_worker, run_plugin, EmulatorContext.current(), plugin_uri, play_resolved=False)
+            future = Future()
+            worker_future.add_done_callback(lambda f: self.__play_resolved_url(f, future))
+            return future
+
+        context = contextvars.copy_context()
+        return self.__executor.submit(context.run, run_plugin, plugin_uri)
+
+    def submit_script(self, script, args=()):
+        """ Schedules a script to run within the emulator context of the caller.
+
+        :param str script:          The id of a script add-on or the path of a Python file.
+        :param list[str] args:      The arguments for the script (sys.argv[1:]).
+
+        :return: A future with the PluginResult.
+        :rtype: concurrent.futures.Future
+
+        """
+
+        # Make sure the script exists before scheduling it.
+        parse_script(script)
+
+        if self.mode == PluginExecutor.MODE_PROCESS:
+            return self.__executor.submit(run_in_worker, run_script, EmulatorContext.current(), script, tuple(args))
+
+        context = contextvars.copy_context()
+        return self.__executor.submit(context.run, run_script, script, tuple(args))
+
+    @staticmethod
+    def __play_resolved_url(worker_future, future):
+        """ Plays the url a plugin resolved in a worker process, before completing the future. """
+
+        from sakee.internalplayer import KodiInteralPlayer
+
+        try:
+            result = worker_future.result()
+        except BaseException as ex:
+            future.set_exception(ex)
+            return
+
+        if result.resolved_url:
+            KodiInteralPlayer.instance().play_resolved_item(result.resolved_url, None)
+        future.set_result(result)
+
+    def shutdown(self, wait=True):
+        """ Stops the workers once the scheduled plugins finished.
+
+        :param bool wait:   Wait for the scheduled plugins to finish.
+
+        """
+
+        self.__executor.shutdown(wait=wait)
+
+
+def initialize_worker():
+    """ Imports the emulator modules in a new worker process, so plugins do not have to. """
+
+    # noinspection PyUnresolvedReferences
+    import xbmc, xbmcaddon, xbmcgui, xbmcplugin, xbmcvfs  # NOSONAR
+    # noinspection PyUnresolvedReferences
+    import sakee.sakebuiltin, sakee.sakejsonrpc  # NOSONAR
+
+
+def to_listing_item(list_item):
+    """ Creates a picklable copy of a ListItem.
+
+    :param xbmcgui.ListItem list_item:  The ListItem.
+
+    :rtype: ListingItem
+
+    """
+
+    return ListingItem(
+        label=list_item.getLabel(),
+        label2=list_item.getLabel2(),
+        path=list_item.getPath(),
+        art=list_item.get_art(),
+        info_labels=list_item.get_info_labels(),
+        properties=list_item.get_properties()
+    )
+
+
+def run_in_worker(function, context, *args, **kwargs):
+    """ Calls run_plugin() or run_script() in a worker process and returns a picklable result.
+
+    :param function:                        The function to call: run_plugin or run_script.
+    :param EmulatorContext|None context:    The context of the caller that submitted the plugin.
+
+    :rtype: PluginResult
+
+    """
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        if context is not None:
+            result = context.run(function, *args, **kwargs)
+        else:
+            result = function(*args, **kwargs)
+
+    exception = result.exception
+    if exception is not None:
+        try:
+            pickle.dumps(exception)
+        except Exception:
+            exception = RuntimeError("{}: {}".format(type(exception).__name__, exception))
+
+    return result._replace(
+        exception=exception,
+        listing=[(to_listing_item(list_item), url, is_folder) for list_item, url, is_folder in result.listing],
+        output=output.getvalue()
+    )
+
+
+def run_script_in_background(script, args=()):
+    """ Executes a script in the background, within the emulator context of the caller.
+
+    :param str script:          The id of a script add-on or the path of a Python file.
+    :param list[str] args:      The arguments for the script (sys.argv[1:]).
+
+    :return: A future with the PluginResult.
+    :rtype: concurrent.futures.Future
+
+    """
+
+    return PluginExecutor.instance().submit_script(script, args)
+
+
+def run_plugin_in_background(plugin_uri):
+    """ Executes a plugin:// uri in the background, within the emulator context of the caller.
+
+    :param str plugin_uri:  The plugin:// uri.
+
+    :return: A future with the PluginResult.
+    :rtype: concurrent.futures.Future
+
+    """
+
+    return PluginExecutor.instance().submit(plugin_uri)
+
+
+def run_plugin(plugin_uri, handle=None, play_resolved=True):
+    """ Executes a plugin:// uri in the current thread, just like Kodi would run it.
+
+    The plugin gets its own sys.argv (see ArgvProxy), so plugins can run concurrently. Exceptions
+    raised by the plugin are not raised, but returned in the result.
+
+    :param str plugin_uri:      The plugin:// uri.
+    :param int|None handle:     The handle to pass to the plugin (sys.argv[1]). Defaults to a new handle.
+    :param bool play_resolved:  Play the url the plugin resolves with setResolvedUrl(). When False, the
+                                url is only returned in the result.
+
+    :rtype: PluginResult
+
+    """
+
+    from sakee.pluginhandler import PluginHandler
+
+    plugin = parse_plugin_uri(plugin_uri)
+    code = code_cache.get(plugin.entrypoint, compile_entrypoint)
+    add_to_sys_path(plugin.add_on_path)
+    ArgvProxy.install()
+
+    if handle is None:
+        handle = new_handle()
+
+    # Keep a reference, as endOfDirectory() removes the handle from the handler.
+    handle_info = PluginHandler.get_handle_info(handle)
+    handle_info.play_resolved = play_resolved
+
+    start = time.perf_counter()
+    try:
+        exit_code, exception = __execute(
+            plugin_uri, code, plugin.add_on_path, plugin.entrypoint,
+            [plugin.route, str(handle), plugin.params, 'resume:false'])
+    finally:
+        PluginHandler.close_handle(handle)
+
+    return PluginResult(
+        plugin_uri=plugin_uri,
+        exit_code=exit_code,
+        exception=exception,
+        listing=list(handle_info.items),
+        resolved_url=handle_info.resolved_url,
+        duration=time.perf_counter() - start,
+        output=None
+    )
+
+
+def run_script(script, args=()):
+    """ Executes a script in the current thread, just like RunScript() in Kodi.
+
+    :param str script:          The id of a script add-on or the path of a Python file.
+    :param list[str] args:      The arguments for the script (sys.argv[1:]).
+
+    :rtype: PluginResult
+
+    """
+
+    add_on_path, entrypoint = parse_script(script)
+    code = code_cache.get(entrypoint, compile_entrypoint)
+    add_to_sys_path(add_on_path)
+    ArgvProxy.install()
+
+    start = time.perf_counter()
+    exit_code, exception = __execute(script, code, add_on_path, entrypoint, [entrypoint] + list(args))
+    return PluginResult(
+        plugin_uri=script,
+        exit_code=exit_code,
+        exception=exception,
+        listing=[],
+        resolved_url=None,
+        duration=time.perf_counter() - start,
+        output=None
+    )
+
+
+def __execute(name, code, add_on_path, entrypoint, argv):
+    """ Runs the code of a plugin or script as __main__ with its own sys.argv and modules.
+
+    :return: The exit code and the exception the code raised, if any.
+    :rtype: tuple[int, Exception|None]
+
+    """
+
+    __activate_add_on_modules(add_on_path)
+    token = _invocation_argv.set(argv)
+    path_token = _invocation_add_on_path.set(add_on_path)
+    try:
+        exec(code, {
+            '__name__': '__main__',
+            '__file__': entrypoint,
+        })
+    except SystemExit as ex:
+        # Continue in case the Add-on does an exit()
+        return ex.code if isinstance(ex.code, int) else (0 if ex.code is None else 1), None
+    except Exception as ex:
+        KodiStub.print_line("Error running {}:\n{}".format(name, traceback.format_exc()), color=Colors.Red)
+        return 1, ex
+    finally:
+        _invocation_add_on_path.reset(path_token)
+        _invocation_argv.reset(token)
+        __collect_add_on_modules(add_on_path)
+    return 0, None
+
+
+def __activate_add_on_modules(add_on_path):
+    """ Puts the warm modules of an add-on in sys.modules, instead of the modules of other add-ons. """
+
+    with __add_on_modules_lock:
+        for other_path, modules in __add_on_modules.items():
+            if other_path == add_on_path:
+                continue
+            for name, module in modules.items():
+                if sys.modules.get(name) is module:
+                    del sys.modules[name]
+        sys.modules.update(__add_on_modules.get(add_on_path, {}))
+
+
+def __collect_add_on_modules(add_on_path):
+    """ Remembers the modules that an add-on imported from its own folder. """
+
+    prefix = os.path.join(add_on_path, "")
+    with __add_on_modules_lock:
+        __add_on_modules[add_on_path] = dict(
+            (name, module) for name, module in list(sys.modules.items())
+            if (getattr(module, "__file__", None) or "").startswith(prefix) or
+            # Namespace packages (without an __init__.py) only have a __path__
+            any(str(location).startswith(prefix) for location in getattr(module, "__path__", None) or [])
+        )
+
+
+def get_listing(plugin_uri):
+    """ Returns the items a plugin:// uri lists, running the plugin only if it is not cached.
+
+    :param str plugin_uri:  The plugin:// uri.
+
+    :return: The listed items as (list item, url, is folder) tuples. The items are shared with other callers
+             and should not be modified.
+    :rtype: list[tuple[xbmcgui.ListItem, str, bool]]
+
+    """
+
+    kodi_home_path = addoninfo.get_add_on_info_from_calling_script().kodi_home_path
+    return listing_cache.get((kodi_home_path, plugin_uri), lambda: list_plugin(plugin_uri))
+
+
+def list_plugin(plugin_uri):
+    """ Runs a plugin:// uri and collects the items it adds to the directory listing.
+
+    :param str plugin_uri:  The plugin:// uri.
+
+    :return: The listed items as (list item, url, is folder) tuples.
+    :rtype: list[tuple[xbmcgui.ListItem, str, bool]]
+
+    """
+
+    result = run_plugin(plugin_uri)
+    if result.exception is not None:
+        raise result.exception
+    return result.listing
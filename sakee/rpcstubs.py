@@ -0,0 +1,218 @@
+# SPDX-License-Identifier: GPL-3.0
+
+import io
+import json
+import os
+import threading
+import urllib.request
+from collections import namedtuple
+
+from sakee.colors import Colors
+from sakee.filecache import FileCache
+from sakee.persistence import BatchedWriter
+from sakee.stub import KodiStub
+
+# A parsed JSON RPC stub file
+StubFile = namedtuple('StubFile', [
+    'response',  # the complete response if the file contains a single response, otherwise None
+    'index'  # (lower case method, canonical params) -> response for files with request-response pairs
+])
+
+stubs_cache = FileCache("jsonrpc")
+
+
+def get_stub_file_path(folder, method):
+    """ The stub file for a JSON RPC method.
+
+    :param str folder:  The folder with the stub files (KODI_STUB_RPC_RESPONSES).
+    :param str method:  The JSON RPC method (Settings.GetSettingValue, ...).
+
+    :rtype: str
+
+    """
+
+    return "{}.json".format(os.path.join(folder, method.lower()))
+
+
+def find_response(folder, json_data):
+    """ Finds the stubbed response for a JSON RPC request.
+
+    The stub files are only parsed again when they changed on disk, and requests are looked
+    up by their method and canonical parameters, so a lookup does not depend on the number
+    of stubs in a file.
+
+    :param str folder:      The folder with the stub files (KODI_STUB_RPC_RESPONSES).
+    :param dict json_data:  The JSON RPC request.
+
+    :return: The stubbed response or None if no matching stub was found. The response is shared
+             with other callers and should not be modified.
+    :rtype: dict|None
+
+    """
+
+    method = json_data.get("method")
+    path = get_stub_file_path(folder, method)
+    if not os.path.isfile(path):
+        return None
+
+    stub_file = stubs_cache.get(path, read_stub_file)
+    if stub_file.response is not None:
+        return stub_file.response
+
+    # Request-response pairs only match requests with parameters
+    params = json_data.get("params")
+    if not params:
+        return None
+    return stub_file.index.get((method.lower(), canonical_params(params)))
+
+
+def read_stub_file(path):
+    """ Parses a JSON RPC stub file and indexes its request-response pairs.
+
+    :param str path:    The full path to the stub file.
+
+    :rtype: StubFile
+
+    """
+
+    with io.open(path, mode='r', encoding='utf-8') as fd:
+        stub_content = json.load(fd)
+
+    if isinstance(stub_content, dict):
+        return StubFile(response=stub_content, index={})
+
+    index = {}
+    for stub in stub_content:
+        request = stub.get('request', {})
+        key = ((request.get('method') or '').lower(), canonical_params(request.get('params')))
+        # Just like a linear search, the first matching stub wins.
+        index.setdefault(key, stub.get('response'))
+    return StubFile(response=None, index=index)
+
+
+def canonical_params(params):
+    """ A canonical representation of JSON RPC parameters, used as the lookup key.
+
+    The order of the keys does not matter and numbers are normalized, so {"a": 1.0, "b": 2}
+    and {"b": 2, "a": 1} have the same representation.
+
+    :param params:  The parameters of a JSON RPC request.
+
+    :rtype: str
+
+    """
+
+    return json.dumps(__normalize(params), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def __normalize(value):
+    if isinstance(value, dict):
+        return {str(k): __normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [__normalize(v) for v in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class StubRecorder(object):
+    __instance = None
+    __instance_lock = threading.Lock()
+
+    def __init__(self, url=None, writer=None):
+        """ Records unmatched JSON RPC requests as request-response pairs in the stub files.
+
+        The response is fetched from a (local) Kodi JSON RPC endpoint if a url was specified,
+        otherwise a placeholder response is recorded. Requests are deduplicated by their method
+        and canonical parameters and the stub files are written in batches.
+
+        :param str|None url:                The JSON RPC endpoint (http://localhost:8080/jsonrpc).
+        :param BatchedWriter|None writer:   The writer for the stub files.
+
+        """
+
+        self.url = url
+        self.__writer = writer or BatchedWriter.instance()
+        # path -> (lower case method, canonical params) -> recorded stub
+        self.__recorded = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def instance():
+        """ The process wide recorder, configured with the KODI_STUB_RPC_RECORD_URL environment variable.
+
+        :rtype: StubRecorder
+
+        """
+
+        with StubRecorder.__instance_lock:
+            if StubRecorder.__instance is None:
+                StubRecorder.__instance = StubRecorder(os.environ.get("KODI_STUB_RPC_RECORD_URL") or None)
+            return StubRecorder.__instance
+
+    def record(self, folder, json_data):
+        """ Records a request that did not match any stub and returns the response for it.
+
+        :param str folder:      The folder with the stub files (KODI_STUB_RPC_RESPONSES).
+        :param dict json_data:  The JSON RPC request.
+
+        :return: The recorded response.
+        :rtype: dict
+
+        """
+
+        method = json_data.get("method")
+        params = json_data.get("params")
+        path = get_stub_file_path(folder, method)
+        key = (method.lower(), canonical_params(params) if params else None)
+
+        with self.__lock:
+            recorded = self.__recorded.setdefault(path, {})
+            stub = recorded.get(key)
+            if stub is not None:
+                return stub["response"]
+
+        stub = dict(request=json_data, response=self.__get_response(json_data))
+        with self.__lock:
+            stub = recorded.setdefault(key, stub)
+
+        KodiStub.print_line("Recorded JSON RPC stub for {} in '{}'".format(method, path), color=Colors.Blue, verbose=True)
+        self.__writer.schedule(path, lambda: self.__render(path))
+        return stub["response"]
+
+    def flush(self):
+        """ Writes all recorded stubs to the stub files. """
+
+        self.__writer.flush()
+
+    def __get_response(self, json_data):
+        if self.url:
+            request = urllib.request.Request(
+                self.url, data=json.dumps(json_data).encode("utf-8"), headers={"Content-Type": "application/json"})
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    return json.loads(response.read().decode("utf-8"))
+            except (OSError, ValueError) as ex:
+                KodiStub.print_line("Error fetching JSON RPC response from '{}': {}".format(self.url, ex), color=Colors.Red)
+
+        return dict(id=json_data.get("id", 1), jsonrpc="2.0", result="OK")
+
+    def __render(self, path):
+        """ Merges the recorded stubs with the current content of a stub file. """
+
+        with self.__lock:
+            recorded = dict(self.__recorded.get(path, {}))
+
+        if os.path.isfile(path):
+            with io.open(path, mode='r', encoding='utf-8') as fd:
+                stubs = json.load(fd)
+        else:
+            # Requests without parameters can only be stubbed with a file with a single response.
+            stubs = next((stub["response"] for (_, params), stub in recorded.items() if params is None), [])
+
+        if isinstance(stubs, list):
+            known = set(((stub.get('request', {}).get('method') or '').lower(),
+                         canonical_params(stub.get('request', {}).get('params'))) for stub in stubs)
+            stubs.extend(stub for key, stub in recorded.items() if key[1] is not None and key not in known)
+
+        return json.dumps(stubs, indent=2, ensure_ascii=False)
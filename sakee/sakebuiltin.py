@@ -1,73 +1,181 @@
 # SPDX-License-Identifier: GPL-3.0
-import os
-import re
+import functools
+import json
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
 
-from sakee import addoninfo
+from sakee import pluginrunner
+from sakee.colors import Colors
+from sakee.stub import KodiStub
+
+# A parsed built-in function call
+BuiltinCall = namedtuple('BuiltinCall', [
+    'function',  # the name of the built-in function (Container.Update, ...)
+    'params'  # the parameters as a tuple of strings, without quotes
+])
+
+# The properties that were set with SetProperty(), by (window, key). Both are lowercase.
+window_properties = {}
+_window_properties_lock = threading.Lock()
 
 
 class BuiltinApi(object):
-    __ADDON_INFO = None
+    # The built-in functions by their lowercase Kodi name (see create_dispatch_table())
+    dispatch_table = {}
+
+    # The path of the container that was last updated with Container.Update()
+    __container_path = None
 
     def __init__(self):
         """ Initialise the Built-in API Implementation. """
-        if BuiltinApi.__ADDON_INFO is None:
-            BuiltinApi.__ADDON_INFO = addoninfo.get_add_on_info_from_calling_script()
 
-    def handle(self, function):
+    def handle(self, function, wait=False):
         """ Handle the Built-in function.
 
         :param obj function:            The built-in function call.
+        :param bool wait:               Wait for a function that runs in the background to finish.
 
         """
-        method, params = re.search(r'^([^\(\s]*)(?:\((.*?)\))?', function).groups()
-        if not method:
-            raise ValueError('Invalid function: %s' % function)
 
-        try:
-            # Replace . with _ since we have function-names with dots in it.
-            method_reference = getattr(self, method.replace('.', '_'))
-        except AttributeError:
+        call = parse_builtin(function)
+        method_reference = BuiltinApi.dispatch_table.get(call.function.lower())
+        if method_reference is None:
             raise NotImplementedError
 
-        if params:
-            method_reference(*params.split(','))
-        else:
-            method_reference()
+        result = method_reference(*call.params)
+        if wait and isinstance(result, Future):
+            result.result()
 
     @staticmethod
     def _run_plugin_uri(plugin_uri):
-        """ Execute a plugin:// uri in the background. """
-
-        def run_background(entrypoint, *args):
-            import sys
-            orig_sys_argv = sys.argv
-            sys.argv = args
-            with open(entrypoint, 'rb') as fdesc:
-                try:
-                    exec(compile(fdesc.read(), entrypoint, 'exec'), {
-                        '__name__': '__main__',
-                        '__file__': entrypoint,
-                    })
-                except SystemExit:
-                    # Continue in case the Add-on does an exit()
-                    pass
-            sys.argv = orig_sys_argv
-
-        # Find the Add-on that belongs to this plugin://-uri.
-        addon, path, params = re.search(r'^plugin://([^?\s/]*)([^?\s]*)(\?.*)?', plugin_uri).groups()
+        """ Execute a plugin:// uri in the background.
+
+        :return: A future with the PluginResult.
+        :rtype: concurrent.futures.Future
+
+        """
+
+        return pluginrunner.run_plugin_in_background(plugin_uri)
+
+    @staticmethod
+    def Container_Update(url, replace=None):
+        """ Updates the current listing with the given path. If replace is set, the history is not updated.
+
+        :param str url:                 The path to show.
+        :param str|None replace:        Replace the current path in the history.
+
+        :return: A future with the PluginResult for a plugin:// path.
+        :rtype: concurrent.futures.Future|None
+
+        """
+
+        BuiltinApi.__container_path = url
+        KodiStub.print_line("Container.Update: {}".format(url), color=Colors.Blue)
+        if url.startswith('plugin://'):
+            return BuiltinApi._run_plugin_uri(url)
+        return None
+
+    @staticmethod
+    def Container_Refresh(url=None):
+        """ Refreshes the current listing, or the given path.
+
+        :param str|None url:            The path to refresh. Defaults to the current listing.
+
+        :return: A future with the PluginResult for a plugin:// path.
+        :rtype: concurrent.futures.Future|None
+
+        """
+
+        import sys
+
+        if not url:
+            url = BuiltinApi.__container_path
+
+        if not url and len(sys.argv) > 2 and sys.argv[0].startswith('plugin://'):
+            # Called from a plugin, so the current listing is the one of the plugin.
+            url = sys.argv[0] + sys.argv[2]
+
+        if not url:
+            KodiStub.print_line("Container.Refresh: there is no listing to refresh", color=Colors.Yellow)
+            return None
+
+        KodiStub.print_line("Container.Refresh: {}".format(url), color=Colors.Blue)
+        if url.startswith('plugin://'):
+            return BuiltinApi._run_plugin_uri(url)
+        return None
+
+    @staticmethod
+    def RunScript(script, *args):
+        """ Runs the python script. You must specify the full path to the script. If the script is an add-on,
+        you can also execute it using its add-on id. The parameters are passed to the script in sys.argv.
+
+        :param str script:              The add-on id or the path of the script.
+        :param str args:                The arguments for the script.
+
+        :return: A future with the PluginResult.
+        :rtype: concurrent.futures.Future
+
+        """
+
+        return pluginrunner.run_script_in_background(script, args)
+
+    @staticmethod
+    def RunAddon(add_on_id, params=None):
+        """ Runs the specified plugin or script.
+
+        :param str add_on_id:           The id of the add-on.
+        :param str|None params:         The parameters: a path and/or query string for plugins, the first
+                                        argument for scripts.
+
+        :return: A future with the PluginResult.
+        :rtype: concurrent.futures.Future
+
+        """
 
         try:
-            addon_info = addoninfo.read_addon_xml(os.path.join(BuiltinApi.__ADDON_INFO.kodi_home_path, 'addons', addon, 'addon.xml'))
-        except FileNotFoundError:
-            raise ValueError('Addon %s not found' % addon)
+            pluginrunner.parse_script(add_on_id)
+        except ValueError:
+            # Not a script, so run it as a plugin.
+            plugin_uri = 'plugin://{}/'.format(add_on_id)
+            if params:
+                # Either a path and query string, or just the query string.
+                plugin_uri += params.lstrip('/') if params[0] in '/?' else '?' + params
+            return BuiltinApi._run_plugin_uri(plugin_uri)
+
+        return pluginrunner.run_script_in_background(add_on_id, [params] if params else [])
+
+    @staticmethod
+    def SetProperty(key, value, window=None):
+        """ Sets a window property for the current window (key,value), or the specified window (key,value,id).
+
+        :param str key:                 The name of the property.
+        :param str value:               The value of the property.
+        :param str|None window:         The window. Defaults to the home window.
+
+        """
 
-        addon_entry = os.path.join(BuiltinApi.__ADDON_INFO.kodi_home_path, 'addons', addon, addon_info.get('pluginsource'))
-        addon_route = 'plugin://' + addon + path
-        addon_params = params or ''
+        with _window_properties_lock:
+            window_properties[(_get_window_name(window), key.lower())] = value
 
-        import threading
-        background = threading.Thread(target=run_background, args=(addon_entry, addon_route, '-1', addon_params, 'resume:false'))
-        background.start()
+    @staticmethod
+    def NotifyAll(sender, data, json_data=None):
+        """ Notify all connected clients. The monitors receive it with method Other.<data>.
+
+        :param str sender:              The sender of the notification.
+        :param str data:                The name of the notification.
+        :param str|None json_data:      The JSON-encoded data of the notification.
+
+        """
+
+        import xbmc
+
+        if json_data:
+            # Validate the data, just like Kodi does.
+            json_data = json.dumps(json.loads(json_data))
+        else:
+            json_data = 'null'
+        xbmc.Monitor.notify_all(sender, 'Other.{}'.format(data), json_data)
 
     @staticmethod
     def RunPlugin(plugin):
@@ -75,11 +183,14 @@ class BuiltinApi(object):
 
         :param str plugin:              plugin:// URL to script.
 
+        :return: A future with the PluginResult.
+        :rtype: concurrent.futures.Future
+
         """
-        BuiltinApi._run_plugin_uri(plugin)
+        return BuiltinApi._run_plugin_uri(plugin)
 
     @staticmethod
-    def PlayMedia(media):
+    def PlayMedia(media, *options):
         """ Plays the media. This can be a playlist, music, or video file, directory, plugin or a url.
         The optional parameter ",isdir" can be used for playing a directory. ",1" will start the media without switching to fullscreen.
         If media is a playlist, you can use playoffset=xx where xx is the position to start playback from.
@@ -87,13 +198,14 @@ class BuiltinApi(object):
         Set "noresume" to force not resuming.
 
         :param str media:               Media to play, this can be a playlist, music, or video file, directory, plugin or a url.
+        :param str options:             The options (isdir, 1, playoffset=xx, resume or noresume). They are ignored.
 
         """
         import xbmc
 
         if media.startswith('plugin://'):
             # Play plugin://-url
-            BuiltinApi._run_plugin_uri(media)
+            return BuiltinApi._run_plugin_uri(media)
 
         else:
             # Play normal file or url
@@ -165,3 +277,131 @@ class BuiltinApi(object):
             pass  # Not implemented
         else:
             raise ValueError('Unknown command %s', command)
+
+
+def parse_builtin(function):
+    """ Parses a built-in function call, like Kodi does. Repeated calls are answered from a cache.
+
+    The parameters are separated by commas outside of double quotes and parentheses. Double quotes
+    are removed and \\" or \\\\ can be used within them.
+
+    :param str function:    The built-in function call: Function(param1, "param,2", ...).
+
+    :rtype: BuiltinCall
+
+    """
+
+    return __parse_builtin(function)
+
+
+@functools.lru_cache(maxsize=256)
+def __parse_builtin(function):
+    function = function.strip()
+    open_index = function.find('(')
+    if open_index < 0:
+        name, params = function, ()
+    else:
+        close_index = function.rfind(')')
+        if close_index < open_index:
+            raise ValueError('Invalid function: %s' % function)
+        name, params = function[:open_index].strip(), tuple(split_params(function[open_index + 1:close_index]))
+
+    if not name or any(character.isspace() for character in name):
+        raise ValueError('Invalid function: %s' % function)
+    return BuiltinCall(function=name, params=params)
+
+
+def split_params(params):
+    """ Splits the parameters of a built-in function call.
+
+    :param str params:  The parameters, without the surrounding parentheses.
+
+    :rtype: list[str]
+
+    """
+
+    result = []
+    current = []
+    # The length of the current parameter up to the last quoted character, so only unquoted whitespace is trimmed.
+    quoted_length = 0
+    quoted = False
+    depth = 0
+    index = 0
+    while index < len(params):
+        character = params[index]
+        index += 1
+        if quoted:
+            if character == '\\' and index < len(params) and params[index] in '"\\':
+                character = params[index]
+                index += 1
+            elif character == '"':
+                quoted = False
+                continue
+            current.append(character)
+            quoted_length = len(current)
+        elif character == '"':
+            quoted = True
+            if not "".join(current).strip():
+                current = []
+            quoted_length = len(current)
+        elif character == ',' and depth == 0:
+            result.append(__trim_param(current, quoted_length))
+            current = []
+            quoted_length = 0
+        else:
+            if character == '(':
+                depth += 1
+            elif character == ')' and depth > 0:
+                depth -= 1
+            if current or not character.isspace():
+                current.append(character)
+
+    if current or result:
+        result.append(__trim_param(current, quoted_length))
+    return result
+
+
+def get_window_property(key, window=None):
+    """ Retrieves a window property that was set with SetProperty().
+
+    :param str key:                 The name of the property.
+    :param str|None window:         The window. Defaults to the home window.
+
+    :return: The value or an empty string if the property was not set.
+    :rtype: str
+
+    """
+
+    with _window_properties_lock:
+        return window_properties.get((_get_window_name(window), key.lower()), '')
+
+
+def create_dispatch_table(cls):
+    """ Maps the lowercase Kodi names of the built-in functions to their implementation.
+
+    The methods implement the built-in functions with a _ instead of a . in their name.
+
+    :param type cls:    The class with the built-in functions as static methods.
+
+    :rtype: dict[str, function]
+
+    """
+
+    return dict(
+        (name.replace('_', '.').lower(), value.__func__)
+        for name, value in vars(cls).items()
+        if isinstance(value, staticmethod) and name[0].isupper()
+    )
+
+
+def __trim_param(characters, quoted_length):
+    return "".join(characters[:quoted_length]) + "".join(characters[quoted_length:]).rstrip()
+
+
+def _get_window_name(window):
+    window = (window or 'home').strip().lower()
+    # Kodi uses the name and the id of a window interchangeably.
+    return 'home' if window in ('10000', 'homescreen') else window
+
+
+BuiltinApi.dispatch_table = create_dispatch_table(BuiltinApi)
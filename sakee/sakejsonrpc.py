@@ -1,19 +1,169 @@
 # SPDX-License-Identifier: GPL-3.0
 
-import io
+import inspect
 import os
-import re
+import threading
+import time
+import traceback
+from urllib.parse import urlencode
 
-from sakee import addoninfo
+from sakee import addoninfo, favourites, guisettings, pluginrunner, rpcstubs
+from sakee.addonregistry import AddonRegistry
+from sakee.colors import Colors
+from sakee.internalplayer import KodiInteralPlayer
+from sakee.stub import KodiStub
+
+
+class JsonRpcError(Exception):
+    def __init__(self, code, message):
+        """ An error that is returned as the JSON RPC error response.
+
+        :param int code:        The JSON RPC error code (-32602 for invalid parameters, ...).
+        :param str message:     The error message.
+
+        """
+
+        super(JsonRpcError, self).__init__(message)
+        self.code = code
+        self.message = message
 
 
 class JsonRpcApi(object):
-    __ADDON_INFO = None
+    # The dispatch table: lower case method name -> (namespace class, function)
+    __methods = {}
+    # The shared API instances by add-on info
+    __instances = {}
+    __instances_lock = threading.Lock()
+
+    def __init__(self, addon_info=None):
+        """ Initialise the JSON RPC API Implementation.
+
+        :param addoninfo.AddonData|None addon_info:     The add-on to handle requests for. Defaults to
+                                                        the calling add-on.
+
+        """
+
+        self.__addon_info = addon_info or addoninfo.get_add_on_info_from_calling_script()
+        self.__namespaces = {}
+        # The bound methods, ready to call: lower case method name -> (method, signature)
+        self.__callables = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def get(addon_info=None):
+        """ Returns the shared API instance for an add-on, so its namespaces are only created once.
+
+        :param addoninfo.AddonData|None addon_info:     The add-on to handle requests for. Defaults to
+                                                        the calling add-on.
+
+        :rtype: JsonRpcApi
+
+        """
+
+        addon_info = addon_info or addoninfo.get_add_on_info_from_calling_script()
+        with JsonRpcApi.__instances_lock:
+            api = JsonRpcApi.__instances.get(addon_info)
+            if api is None:
+                api = JsonRpcApi(addon_info)
+                JsonRpcApi.__instances[addon_info] = api
+            return api
+
+    @staticmethod
+    def register_namespace(namespace_class, name=None):
+        """ Registers the public methods of a namespace class in the dispatch table.
+
+        The namespace class is instantiated (once per JsonRpcApi) with the add-on info as
+        its only argument. Registering a namespace again replaces its methods.
+
+        :param type namespace_class:    The class that implements the namespace.
+        :param str|None name:           The name of the namespace. Defaults to the class name.
+
+        """
+
+        name = name or namespace_class.__name__
+        for method_name in dir(namespace_class):
+            function = getattr(namespace_class, method_name)
+            if method_name.startswith("_") or not callable(function):
+                continue
+
+            method = "{}.{}".format(name, method_name).lower()
+            JsonRpcApi.__methods[method] = (namespace_class, function)
+
+        # The shared instances might have bound the methods that were replaced.
+        with JsonRpcApi.__instances_lock:
+            JsonRpcApi.__instances.clear()
+
+    @staticmethod
+    def unregister_namespace(name):
+        """ Removes the methods of a namespace from the dispatch table.
 
-    def __init__(self):
-        """ Initialise the JSON RPC API Implementation. """
-        if JsonRpcApi.__ADDON_INFO is None:
-            JsonRpcApi.__ADDON_INFO = addoninfo.get_add_on_info_from_calling_script()
+        :param str name:    The name of the namespace.
+
+        """
+
+        prefix = "{}.".format(name).lower()
+        for method in [method for method in JsonRpcApi.__methods if method.startswith(prefix)]:
+            del JsonRpcApi.__methods[method]
+
+        with JsonRpcApi.__instances_lock:
+            JsonRpcApi.__instances.clear()
+
+    @staticmethod
+    def has_method(method):
+        """ Is a JSON RPC method implemented (rather than stubbed)?
+
+        :param str method:  The JSON RPC method (case-insensitive).
+
+        :rtype: bool
+
+        """
+
+        return method.lower() in JsonRpcApi.__methods
+
+    @staticmethod
+    def get_limits(limits, total):
+        """ Determines the window of items to return for the JSON RPC limits parameter.
+
+        :param dict|None limits:    The limits ({"start": 0, "end": 10}), where end -1 means all.
+        :param int total:           The total number of items.
+
+        :return: The start and end index.
+        :rtype: tuple[int, int]
+
+        """
+
+        limits = limits or {}
+        start = min(max(int(limits.get("start", 0)), 0), total)
+        end = int(limits.get("end", -1))
+        if end < 0 or end > total:
+            end = total
+        return start, max(start, end)
+
+    @staticmethod
+    def get_list_item_properties(list_item, properties):
+        """ The requested JSON RPC (list field) properties of a ListItem.
+
+        :param xbmcgui.ListItem list_item:  The ListItem.
+        :param list|None properties:        The properties to return (title, thumbnail, art, plot, ...).
+
+        :rtype: dict
+
+        """
+
+        result = {}
+        info_labels = list_item.get_info_labels()
+        for name in properties or []:
+            if name == "art":
+                result["art"] = list_item.get_art()
+            elif name in ("thumbnail", "fanart"):
+                result[name] = list_item.getArt("thumb" if name == "thumbnail" else name)
+            elif name == "title":
+                result["title"] = info_labels.get("title", list_item.getLabel())
+            elif name == "file":
+                result["file"] = list_item.getPath()
+            else:
+                result[name] = info_labels.get(name, "")
+        return result
 
     def handle(self, json_data):
         """ Handle the JSON RPC Request
@@ -23,33 +173,57 @@ class JsonRpcApi(object):
         :return: The JSON RPC reply.
         :rtype: dict
         """
-        (class_name, method_name) = json_data["method"].split('.')
 
-        # Find class
-        try:
-            class_reference = getattr(JsonRpcApi, class_name)
-        except AttributeError:
-            raise NotImplementedError
+        method = str(json_data.get("method")).lower()
+        callable_method = self.__callables.get(method)
+        if callable_method is None:
+            callable_method = self.__bind(method)
+        function, signature = callable_method
 
-        # Find method
-        class_instance = class_reference(JsonRpcApi.__ADDON_INFO)
+        # The parameters are either named (an object) or positional (an array).
+        params = json_data.get("params")
+        if params is None:
+            params = {}
         try:
-            method_reference = getattr(class_instance, method_name)
-        except AttributeError:
-            raise NotImplementedError
+            if isinstance(params, dict):
+                arguments = signature.bind(**params)
+            elif isinstance(params, list):
+                arguments = signature.bind(*params)
+            else:
+                raise TypeError("params must be an object or an array")
+        except TypeError as ex:
+            raise JsonRpcError(-32602, "Invalid params: {}".format(ex))
 
         # Invoke method
-        result = method_reference(**json_data["params"])
+        result = function(*arguments.args, **arguments.kwargs)
 
         return dict(
-            id=0,
+            id=json_data.get("id"),
             jsonrpc='2.0',
             result=result,
         )
 
+    def __bind(self, method):
+        """ Binds a method to the (shared) instance of its namespace. """
+
+        try:
+            namespace_class, function = JsonRpcApi.__methods[method]
+        except KeyError:
+            raise NotImplementedError
+
+        with self.__lock:
+            namespace = self.__namespaces.get(namespace_class)
+            if namespace is None:
+                namespace = namespace_class(self.__addon_info)
+                self.__namespaces[namespace_class] = namespace
+
+            bound_method = function.__get__(namespace, namespace_class)
+            callable_method = (bound_method, inspect.signature(bound_method))
+            self.__callables[method] = callable_method
+        return callable_method
+
     class Addons(object):
         """ List, enable and execute addons. """
-        __ADDONS = []
 
         def __init__(self, addon_info):
             """ Initialise the JSON RPC API Addons Namespace.
@@ -57,76 +231,387 @@ class JsonRpcApi(object):
             :param obj addon_info:   Information about the current Add-on paths.
             """
             self._ADDON_INFO = addon_info
+            self.__registry = AddonRegistry.get(self._ADDON_INFO.kodi_home_path)
 
         # noinspection PyPep8Naming
         def GetAddons(self, type=None, content=None, enabled=None, properties=None, limits=None, installed=True):  # NOSONAR
-            """ Gets all available addons. """
-            addons = []
-            for addon in os.listdir(os.path.join(self._ADDON_INFO.kodi_home_path, 'addons')):
-                addon_xml = os.path.join(self._ADDON_INFO.kodi_home_path, 'addons', addon, 'addon.xml')
-                if not os.path.exists(addon_xml):
+            """ Gets all available addons.
+
+            :param str|None type:               Only return add-ons with this extension point.
+            :param str|None content:            Only return add-ons that provide this content (video, audio, ...).
+            :param bool|str|None enabled:       Only return enabled (True) or disabled (False) add-ons.
+            :param list|None properties:        The optional properties to return (name, version, ...).
+            :param dict|None limits:            The window ({"start": 0, "end": 10}) of add-ons to return.
+            :param bool|str installed:          Only return installed add-ons (ignored).
+
+            :return: The add-ons and the limits.
+            :rtype: dict
+            """
+            items = []
+            for metadata in self.__registry.addons():
+                if type not in (None, "unknown") and not any(e.point == type for e in metadata.extensions):
+                    continue
+                if content not in (None, "unknown") and not any(content in e.provides for e in metadata.extensions):
                     continue
+                if enabled is False:
+                    # All installed add-ons are enabled
+                    continue
+                items.append(metadata)
 
-                addon_info = addoninfo.read_addon_xml(addon_xml)
-                addons.append(dict(
-                    type=addon_info.get('type'),
-                    addonid=addon_info.get('id')))
+            start, end = JsonRpcApi.get_limits(limits, len(items))
+            addons = [JsonRpcApi.Addons.__get_details(metadata, properties) for metadata in items[start:end]]
 
             return dict(
                 addons=addons,
                 limits=dict(
-                    start=0,
-                    end=len(addons),
-                    total=len(addons)
+                    start=start,
+                    end=start + len(addons),
+                    total=len(items)
                 )
             )
 
+        # noinspection PyPep8Naming
+        def GetAddonDetails(self, addonid, properties=None):  # NOSONAR
+            """ Gets the details of a specific addon.
+
+            :param str addonid:             The ID of the add-on.
+            :param list|None properties:    The optional properties to return (name, version, ...).
+
+            :return: The add-on details.
+            :rtype: dict
+            """
+            metadata = self.__registry.get_addon(addonid)
+            if metadata is None:
+                raise JsonRpcError(-32602, "Invalid params: add-on '{}' is not installed".format(addonid))
+
+            return dict(
+                addon=JsonRpcApi.Addons.__get_details(metadata, properties)
+            )
+
+        # noinspection PyPep8Naming
+        def ExecuteAddon(self, addonid, params=None, wait=False):  # NOSONAR
+            """ Executes the given addon with the given parameters (if possible).
+
+            :param str addonid:             The ID of the add-on.
+            :param dict|list|str params:    The parameters for the add-on: a dictionary for the query string,
+                                            or a string with the query string.
+            :param bool wait:               Wait for the add-on to finish.
+
+            :return: OK
+            :rtype: str
+            """
+            if isinstance(params, dict):
+                query = "?" + urlencode(params) if params else ""
+            elif isinstance(params, list):
+                query = "?" + "&".join(str(p) for p in params) if params else ""
+            else:
+                query = params or ""
+                if query and not query.startswith("?"):
+                    query = "?" + query
+
+            try:
+                future = pluginrunner.run_plugin_in_background("plugin://{}/{}".format(addonid, query))
+            except ValueError as ex:
+                raise JsonRpcError(-32602, "Invalid params: {}".format(ex))
+
+            if wait:
+                future.result()
+            return "OK"
+
+        @staticmethod
+        def __get_details(metadata, properties):
+            """ The JSON RPC details for an add-on.
+
+            :param addoninfo.AddonMetadata metadata:    The add-on metadata.
+            :param list|None properties:                The optional properties to return.
+
+            :rtype: dict
+            """
+            details = dict(addonid=metadata.id, type=metadata.type)
+            for name in properties or []:
+                if name in ("name", "version", "summary", "description", "disclaimer", "author", "path"):
+                    details[name] = getattr(metadata, name) or ""
+                elif name == "thumbnail":
+                    details[name] = metadata.icon or ""
+                elif name == "fanart":
+                    details[name] = metadata.fanart or ""
+                elif name == "dependencies":
+                    details[name] = [dict(addonid=r.addon, version=r.version or "", optional=r.optional)
+                                     for r in metadata.requires]
+                elif name in ("enabled", "installed"):
+                    details[name] = True
+                elif name in ("broken", "deprecated"):
+                    details[name] = False
+                elif name == "rating":
+                    details[name] = -1
+                elif name == "extrainfo":
+                    details[name] = []
+            return details
+
     # noinspection PyPep8Naming
-    class Favourites:
+    class Favourites(object):
+        """ Manages the favourites. """
+
         def __init__(self, addon_info):
-            """ Initialise the JSON RPC API Addons Namespace.
+            """ Initialise the JSON RPC API Favourites Namespace.
 
             :param obj addon_info:   Information about the current Add-on paths.
             """
             self._ADDON_INFO = addon_info
+            self.__favourites_xml = os.path.join(self._ADDON_INFO.kodi_profile_path, "favourites.xml")
 
-        def GetFavourites(self, **params):
-            favourites = os.path.join(self._ADDON_INFO.kodi_profile_path, "favourites.xml")
-            content = io.open(favourites, "r").read()
-            matches = re.findall(r'name="([^"]+)".*?>([^(]+)\((?:(\d+),)?&quot;([^<]+)&quot;', content)
-
-            result = {
-                "favourites": [],
-                "limits": {
-                    "end": 0,
-                    "start": 0,
-                    "total": 0
-                }
-            }
-            favs = result["favourites"]
-
-            for name, action, window_id, param in matches:
-                if action == "PlayMedia":
-                    action_type = "media"
-                elif action == "ActivateWindow":
-                    action_type = "window"
-                else:
-                    action_type = None
+        def GetFavourites(self, type=None, properties=None, limits=None):  # NOSONAR
+            """ Retrieves the favourites.
+
+            :param str|None type:           Only return favourites of this type (media, window, ...).
+            :param list|None properties:    The optional properties to return (window, windowparameter,
+                                            thumbnail, path).
+            :param dict|None limits:        The window ({"start": 0, "end": 10}) of favourites to return.
+
+            :return: The favourites and the limits.
+            :rtype: dict
+            """
+
+            items = [f for f in favourites.get_favourites(self.__favourites_xml) if type in (None, "all", f.type)]
+            total = len(items)
+            start, end = JsonRpcApi.get_limits(limits, total)
+
+            result = []
+            for favourite in items[start:end]:
+                fav = dict(title=favourite.title, type=favourite.type)
+                if properties is None:
+                    # Without properties, the window parameter (or path) is returned.
+                    fav["windowparameter"] = favourite.windowparameter or favourite.path
+                    result.append(fav)
+                    continue
+
+                for name in properties:
+                    if name == "path" and favourite.type in ("media", "script", "androidapp"):
+                        fav["path"] = favourite.path
+                    elif name in ("window", "windowparameter") and favourite.type == "window":
+                        fav[name] = getattr(favourite, name)
+                    elif name == "thumbnail":
+                        fav["thumbnail"] = favourite.thumbnail
+                result.append(fav)
+
+            return dict(
+                favourites=result,
+                limits=dict(
+                    start=start,
+                    end=start + len(result),
+                    total=total
+                )
+            )
+
+        def AddFavourite(self, title, type, path=None, window=None, windowparameter=None, thumbnail=None):  # NOSONAR
+            """ Adds a favourite.
+
+            :param str title:                   The name of the favourite.
+            :param str type:                    The type: media, window or script.
+            :param str|None path:               The path for media and script favourites.
+            :param str|None window:             The window for window favourites.
+            :param str|None windowparameter:    The window parameter for window favourites.
+            :param str|None thumbnail:          The thumbnail.
+
+            :return: OK
+            :rtype: str
+            """
+
+            try:
+                favourites.add_favourite(self.__favourites_xml, title, type,
+                                         window if type == "window" else path, windowparameter, thumbnail)
+            except ValueError as ex:
+                raise JsonRpcError(-32602, "Invalid params: {}".format(ex))
+            return "OK"
+
+    class Files(object):
+        """ Shares, sources, directories and files. """
+
+        def __init__(self, addon_info):
+            """ Initialise the JSON RPC API Files Namespace.
+
+            :param obj addon_info:   Information about the current Add-on paths.
+            """
+            self._ADDON_INFO = addon_info
+
+        # noinspection PyPep8Naming
+        def GetDirectory(self, directory, media="files", properties=None, sort=None, limits=None):  # NOSONAR
+            """ Get the directories and files in the given directory.
+
+            Only plugin:// directories are implemented: the plugin is run in-process and the items
+            it lists are returned. Listings are cached for KODI_STUB_LISTING_CACHE_TTL seconds.
+
+            :param str directory:           The plugin:// url of the directory.
+            :param str media:               The media type (ignored).
+            :param list|None properties:    The optional properties to return (title, thumbnail, art, plot, ...).
+            :param dict|None sort:          The sort order (ignored, the order of the plugin is used).
+            :param dict|None limits:        The window ({"start": 0, "end": 10}) of items to return.
+
+            :return: The files and the limits.
+            :rtype: dict
+            """
+            if not directory.startswith("plugin://"):
+                raise NotImplementedError
+
+            try:
+                pluginrunner.parse_plugin_uri(directory)
+            except ValueError as ex:
+                raise JsonRpcError(-32602, "Invalid params: {}".format(ex))
+
+            try:
+                items = pluginrunner.get_listing(directory)
+            except Exception as ex:
+                raise JsonRpcError(-32603, "Error listing {}: {}".format(directory, ex))
+            start, end = JsonRpcApi.get_limits(limits, len(items))
+
+            files = []
+            for list_item, url, is_folder in items[start:end]:
+                file_info = JsonRpcApi.get_list_item_properties(list_item, properties)
+                file_info.update(
+                    file=url,
+                    filetype="directory" if is_folder else "file",
+                    label=list_item.getLabel(),
+                    type="unknown"
+                )
+                files.append(file_info)
+
+            return dict(
+                files=files,
+                limits=dict(
+                    start=start,
+                    end=start + len(files),
+                    total=len(items)
+                )
+            )
+
+    class Player(object):
+        """ Manager for players. """
+        # SAKÉ has a single (video) player
+        PLAYER_ID = 1
+
+        def __init__(self, addon_info):
+            """ Initialise the JSON RPC API Player Namespace.
+
+            :param obj addon_info:   Information about the current Add-on paths.
+            """
+            self._ADDON_INFO = addon_info
+
+        # noinspection PyPep8Naming
+        def GetActivePlayers(self):  # NOSONAR
+            """ Returns all active players.
+
+            :return: The active players.
+            :rtype: list[dict]
+            """
+            player = KodiInteralPlayer.instance()
+            if player.status == KodiInteralPlayer.STATUS_STOPPED:
+                return []
+            return [dict(playerid=JsonRpcApi.Player.PLAYER_ID, playertype="internal", type="video")]
+
+        # noinspection PyPep8Naming
+        def GetProperties(self, playerid, properties):  # NOSONAR
+            """ Retrieves the values of the given properties.
 
-                fav = {
-                    "title": name,
-                    "type": action_type,
-                    "windowparameter": param
-                }
-                favs.append(fav)
+            :param int playerid:        The id of the player.
+            :param list properties:     The properties to retrieve (time, totaltime, percentage, speed, ...).
 
-            result["limits"]["end"] = len(favs)
-            result["limits"]["total"] = len(favs)
-            return result
+            :return: The values of the properties.
+            :rtype: dict
+            """
+            import xbmc
+
+            player = KodiInteralPlayer.instance()
+            if playerid != JsonRpcApi.Player.PLAYER_ID or player.status == KodiInteralPlayer.STATUS_STOPPED:
+                raise JsonRpcError(-32100, "Failed to execute method.")
+
+            values = dict(
+                type="video",
+                time=JsonRpcApi.Player.__get_time(player.current_time),
+                totaltime=JsonRpcApi.Player.__get_time(player.total_time),
+                percentage=100.0 * player.current_time / player.total_time if player.total_time else 0.0,
+                speed=1 if player.status == KodiInteralPlayer.STATUS_PLAYING else 0,
+                playlistid=xbmc.PLAYLIST_VIDEO,
+                position=-1,
+                live=False,
+                canseek=True,
+                canchangespeed=False,
+                canrepeat=False,
+                canshuffle=False,
+                partymode=False,
+                repeat="off",
+                shuffled=False
+            )
+            return dict((name, values[name]) for name in properties if name in values)
+
+        @staticmethod
+        def __get_time(seconds):
+            seconds = int(seconds)
+            return dict(hours=seconds // 3600, minutes=seconds // 60 % 60, seconds=seconds % 60, milliseconds=0)
+
+    class Playlist(object):
+        """ Playlist Modification, Retrieval and Playback. """
+
+        def __init__(self, addon_info):
+            """ Initialise the JSON RPC API Playlist Namespace.
+
+            :param obj addon_info:   Information about the current Add-on paths.
+            """
+            self._ADDON_INFO = addon_info
+
+        # noinspection PyPep8Naming
+        def GetPlaylists(self):  # NOSONAR
+            """ Returns all existing playlists.
+
+            :return: The playlists.
+            :rtype: list[dict]
+            """
+            import xbmc
+
+            return [dict(playlistid=xbmc.PLAYLIST_MUSIC, type="audio"),
+                    dict(playlistid=xbmc.PLAYLIST_VIDEO, type="video")]
+
+        # noinspection PyPep8Naming
+        def GetItems(self, playlistid, properties=None, limits=None, sort=None):  # NOSONAR
+            """ Get all items from playlist.
+
+            :param int playlistid:          The id of the playlist.
+            :param list|None properties:    The optional properties to return (title, file, thumbnail, ...).
+            :param dict|None limits:        The window ({"start": 0, "end": 10}) of items to return.
+            :param dict|None sort:          The sort order (ignored).
+
+            :return: The items and the limits.
+            :rtype: dict
+            """
+            import xbmc
+
+            play_list = xbmc.PlayList(playlistid)
+            count = len(play_list)
+            start, end = JsonRpcApi.get_limits(limits, count)
+
+            items = []
+            for index in range(start, end):
+                url, list_item = play_list[index]
+                if list_item is None:
+                    item = dict(file=url) if properties and "file" in properties else {}
+                    item.update(label=url, type="unknown")
+                else:
+                    item = JsonRpcApi.get_list_item_properties(list_item, properties)
+                    if "file" in item:
+                        item["file"] = url
+                    item.update(label=list_item.getLabel() or url, type="unknown")
+                items.append(item)
+
+            return dict(
+                items=items,
+                limits=dict(
+                    start=start,
+                    end=start + len(items),
+                    total=count
+                )
+            )
 
     class Settings(object):
         """ Allows manipulation of Kodi settings. """
-        __SETTINGS = None
 
         def __init__(self, addon_info):
             """ Initialise the JSON RPC API Settings Namespace.
@@ -134,15 +619,8 @@ class JsonRpcApi(object):
             :param obj addon_info:   Information about the current Add-on paths.
             """
             self._ADDON_INFO = addon_info
-
-            # Load the guisettings.xml file
-            if JsonRpcApi.Settings.__SETTINGS is None:
-                settings_xml_file = os.path.join(self._ADDON_INFO.kodi_profile_path, "guisettings.xml")
-                if os.path.isfile(settings_xml_file):
-                    with io.open(settings_xml_file, encoding='utf-8') as fp:
-                        settings_xml = fp.read()
-                    results = re.findall(r'id="([^"]+)"[^>]*>([^<]+)<', settings_xml)
-                    JsonRpcApi.Settings.__SETTINGS = dict(results)
+            self.__settings = guisettings.GuiSettings.get(
+                os.path.join(self._ADDON_INFO.kodi_profile_path, "guisettings.xml"))
 
         # noinspection PyPep8Naming
         def GetSettingValue(self, setting):  # NOSONAR
@@ -151,14 +629,174 @@ class JsonRpcApi(object):
             :param str setting:  The name of the settings for which the value is retrieved.
 
             :return: The value for the given setting.
-            :rtype: str
+            :rtype: dict
+            """
+            gui_setting = self.__settings.get_setting(setting)
+            return dict(
+                value=gui_setting.value if gui_setting is not None else ''
+            )
+
+        # noinspection PyPep8Naming
+        def SetSettingValue(self, setting, value):  # NOSONAR
+            """ Changes the value of a setting.
+
+            :param str setting:  The name of the settings for which the value is set.
+            :param value:        The new value.
+
+            :return: True
+            :rtype: bool
+            """
+            self.__settings.set_value(setting, value)
+            return True
+
+        # noinspection PyPep8Naming
+        def GetSettings(self, level=None, filter=None):  # NOSONAR
+            """ Retrieves all settings.
+
+            The guisettings.xml does not contain the section and category of the settings, so a
+            section or category filter matches the first part of the setting id (locale, network, ...).
+
+            :param str|None level:      The setting level (ignored).
+            :param dict|None filter:    The section and/or category of the settings to return.
+
+            :return: The settings.
+            :rtype: dict
             """
-            value = JsonRpcApi.Settings.__SETTINGS.get(setting, '')
-            if value == 'true':
-                value = True
-            elif value == 'false':
-                value = False
+            filter = filter or {}
+            prefix = filter.get("category") or filter.get("section")
+
+            settings = []
+            for gui_setting in self.__settings.get_settings():
+                if prefix and gui_setting.id.split(".", 1)[0] != prefix:
+                    continue
+                settings.append(dict(
+                    id=gui_setting.id,
+                    label=gui_setting.id,
+                    type=gui_setting.type,
+                    value=gui_setting.value
+                ))
 
             return dict(
-                value=value
+                settings=settings
             )
+
+
+JsonRpcApi.register_namespace(JsonRpcApi.Addons)
+JsonRpcApi.register_namespace(JsonRpcApi.Favourites)
+JsonRpcApi.register_namespace(JsonRpcApi.Files)
+JsonRpcApi.register_namespace(JsonRpcApi.Player)
+JsonRpcApi.register_namespace(JsonRpcApi.Playlist)
+JsonRpcApi.register_namespace(JsonRpcApi.Settings)
+
+
+def execute_jsonrpc_obj(json_data, listener=None):
+    """ Executes a JSON RPC request (or a batch of requests) that was already decoded.
+
+    This is what xbmc.executeJSONRPC does, without encoding and decoding the JSON.
+
+    :param dict|list json_data:     The JSON RPC request or a list of requests for a batch.
+    :param listener:                Optional callable that is called after each request with the method,
+                                    the duration in seconds and whether it failed: listener(method, duration, failed).
+
+    :return: The JSON RPC response, a list of responses for a batch or None if a batch only
+             contained notifications.
+    :rtype: dict|list[dict]|None
+
+    """
+
+    api = JsonRpcApi.get()
+    if not isinstance(json_data, list):
+        return __execute_request(api, json_data, listener)
+
+    # A batch: an array of requests results in an array of responses
+    if not json_data:
+        return __get_error(None, -32600, "Invalid Request")
+
+    responses = []
+    for request in json_data:
+        if not isinstance(request, dict) or "method" not in request:
+            responses.append(__get_error(None, -32600, "Invalid Request"))
+            continue
+
+        response = __execute_request(api, request, listener)
+        if "id" not in request:
+            # Notifications are not answered
+            continue
+
+        # The responses are matched to the requests by their id
+        response = dict(response)
+        response["id"] = request["id"]
+        responses.append(response)
+
+    return responses or None
+
+
+def __execute_request(api, json_data, listener=None):
+    """ Executes a single JSON RPC request and reports its duration to the listener.
+
+    :param JsonRpcApi api:      The JSON RPC API implementation.
+    :param dict json_data:      The JSON RPC request.
+    :param listener:            Optional callable: listener(method, duration, failed).
+
+    :return: The JSON RPC response.
+    :rtype: dict
+
+    """
+
+    if listener is None:
+        return __dispatch_request(api, json_data)
+
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = __dispatch_request(api, json_data)
+        failed = "error" in response
+        return response
+    finally:
+        listener(json_data.get("method"), time.perf_counter() - start, failed)
+
+
+def __dispatch_request(api, json_data):
+    """ Executes a single JSON RPC request using the implemented methods or the stubs.
+
+    :param JsonRpcApi api:      The JSON RPC API implementation.
+    :param dict json_data:      The JSON RPC request.
+
+    :return: The JSON RPC response.
+    :rtype: dict
+
+    """
+
+    try:
+        # Implement some methods for real
+        return api.handle(json_data)
+
+    except NotImplementedError:
+        # Fallback to stubs
+        pass
+
+    except JsonRpcError as ex:
+        return __get_error(json_data.get("id"), ex.code, ex.message)
+
+    except Exception as ex:
+        # Just like Kodi, a failing method results in an error response and not in an exception.
+        KodiStub.print_line("Error handling {}:\n{}".format(json_data.get("method"), traceback.format_exc()),
+                            color=Colors.Red)
+        return __get_error(json_data.get("id"), -32603, "Internal error: {}".format(ex))
+
+    json_responses = os.environ.get("KODI_STUB_RPC_RESPONSES")
+    if json_responses:
+        response = rpcstubs.find_response(json_responses, json_data)
+        if response is not None:
+            return response
+
+        if os.environ.get("KODI_STUB_RPC_RECORD") == "1":
+            return rpcstubs.StubRecorder.instance().record(json_responses, json_data)
+    else:
+        KodiStub.print_line("Warning: Could not find JSON Response folder. Use the environment variable KODI_STUB_RPC_RESPONSES to set one.", color=Colors.Red)
+
+    return dict(id=1, jsonrpc="2.0", result="OK")
+
+
+def __get_error(request_id, code, message):
+    return dict(id=request_id, jsonrpc="2.0", error=dict(code=code, message=message))
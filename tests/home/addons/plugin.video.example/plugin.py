@@ -38,9 +38,32 @@ if __name__ == "__main__":
 
     if route == '/play':
         listitem = xbmc.ListItem(label='Something', path=query.get('filename'))
-        xbmcplugin.setResolvedUrl(-1, True, listitem)
+        xbmcplugin.setResolvedUrl(int(sys.argv[1]), True, listitem)
         exit()
 
+    if route == '/list':
+        handle = int(sys.argv[1])
+        folder = xbmc.ListItem(label='Folder')
+        folder.setArt({'thumb': 'folder.png'})
+        xbmcplugin.addDirectoryItem(handle, 'plugin://plugin.video.example/list?page=2', folder, isFolder=True)
+        video = xbmc.ListItem(label='Video')
+        video.setInfo('video', {'title': 'Video title', 'plot': 'A plot'})
+        xbmcplugin.addDirectoryItem(handle, 'plugin://plugin.video.example/play?filename=video.mp4', video)
+        xbmcplugin.endOfDirectory(handle)
+        exit()
+
+    if route == '/echo':
+        # Echo the arguments after a short delay, so concurrent invocations overlap
+        import time
+        time.sleep(0.05)
+        handle = int(sys.argv[1])
+        xbmcplugin.addDirectoryItem(handle, sys.argv[0] + sys.argv[2], xbmc.ListItem(label=sys.argv[1]))
+        xbmcplugin.endOfDirectory(handle)
+        exit()
+
+    if route == '/fail':
+        raise RuntimeError('Failing on purpose')
+
     # Unknown route
     print('Unknown route %s' % route)
     exit(1)
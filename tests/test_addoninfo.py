@@ -0,0 +1,61 @@
+import os
+import pickle
+import unittest
+
+from sakee import addoninfo
+
+
+class TestAddonMetadata(unittest.TestCase):
+    add_on_path = os.path.abspath("./tests/home/addons/plugin.video.example")
+    add_on_xml = os.path.join(add_on_path, "addon.xml")
+
+    def test_parse_addon_xml(self) -> None:
+        metadata = addoninfo.parse_addon_xml(self.add_on_xml)
+
+        self.assertEqual("plugin.video.example", metadata.id)
+        self.assertEqual("Example Addon", metadata.name)
+        self.assertEqual("1.0.0", metadata.version)
+        self.assertEqual("Example", metadata.author)
+        self.assertEqual("xbmc.python.pluginsource", metadata.type)
+        self.assertEqual("An example add-on", metadata.summary)
+        self.assertEqual("v1.0.0 - Initial release", metadata.news)
+        self.assertEqual(os.path.join(self.add_on_path, "resources", "icon.png"), metadata.icon)
+        self.assertEqual("plugin.py", metadata.get_extension_attribute("xbmc.python.pluginsource", "library"))
+
+    def test_requires_and_extensions(self) -> None:
+        metadata = addoninfo.parse_addon_xml(self.add_on_xml)
+
+        self.assertEqual(
+            (addoninfo.AddonImport("xbmc.python", "3.0.0", False),
+             addoninfo.AddonImport("script.module.inputstreamhelper", "0.5.0", True)),
+            metadata.requires)
+        self.assertEqual(["xbmc.python.pluginsource", "xbmc.addon.metadata"], [e.point for e in metadata.extensions])
+        self.assertEqual(("video",), metadata.extensions[0].provides)
+
+    def test_metadata_is_read_only(self) -> None:
+        metadata = addoninfo.parse_addon_xml(self.add_on_xml)
+
+        with self.assertRaises(AttributeError):
+            metadata.version = "2.0.0"
+
+    def test_metadata_can_be_pickled(self) -> None:
+        metadata = addoninfo.parse_addon_xml(self.add_on_xml)
+
+        copy = pickle.loads(pickle.dumps(metadata))
+        self.assertEqual(metadata.id, copy.id)
+        self.assertEqual(metadata.requires, copy.requires)
+
+    def test_metadata_is_memoized(self) -> None:
+        addoninfo.metadata_cache.clear()
+
+        self.assertIs(addoninfo.get_addon_metadata(self.add_on_xml), addoninfo.get_addon_metadata(self.add_on_xml))
+        self.assertEqual(1, addoninfo.metadata_cache.info().misses)
+
+    def test_read_addon_xml(self) -> None:
+        info = addoninfo.read_addon_xml(self.add_on_xml)
+
+        self.assertEqual("plugin.video.example", info["id"])
+        self.assertEqual("Example", info["author"])
+        self.assertEqual("plugin.py", info["pluginsource"])
+        self.assertEqual("An example add-on", info["summary"])
+        self.assertEqual("resources/icon.png", info["icon"])
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import xbmc
+from sakee.addonregistry import AddonRegistry
+
+ADDON_XML = '<addon id="{0}" name="{0}" version="1.0.0" provider-name="Test">' \
+            '<extension point="xbmc.python.pluginsource" library="plugin.py"/></addon>'
+
+
+class TestAddonRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.kodi_home = os.path.join(self.root, "portable_data")
+        os.makedirs(os.path.join(self.kodi_home, "addons"))
+        os.makedirs(os.path.join(self.root, "addons"))
+
+    def __add_addon(self, folder, add_on_id):
+        path = os.path.join(folder, "addons", add_on_id)
+        os.makedirs(path)
+        with open(os.path.join(path, "addon.xml"), "w", encoding="utf-8") as fp:
+            fp.write(ADDON_XML.format(add_on_id))
+
+    def test_index_home_and_parent_addons(self) -> None:
+        self.__add_addon(self.kodi_home, "plugin.video.home")
+        self.__add_addon(self.root, "plugin.video.parent")
+        registry = AddonRegistry(self.kodi_home)
+
+        self.assertTrue(registry.has_addon("plugin.video.home"))
+        self.assertTrue(registry.has_addon("plugin.video.parent"))
+        self.assertFalse(registry.has_addon("plugin.video.missing"))
+        self.assertEqual("plugin.py", registry.get_addon("plugin.video.home").get_extension_attribute(
+            "xbmc.python.pluginsource", "library"))
+        self.assertEqual(["plugin.video.home", "plugin.video.parent"], [a.id for a in registry.addons()])
+
+    def test_folders_are_scanned_once(self) -> None:
+        self.__add_addon(self.kodi_home, "plugin.video.home")
+        registry = AddonRegistry(self.kodi_home)
+
+        for _ in range(10):
+            registry.has_addon("plugin.video.home")
+
+        self.assertEqual(1, registry.scans)
+
+    def test_new_addon_triggers_scan(self) -> None:
+        registry = AddonRegistry(self.kodi_home)
+        self.assertFalse(registry.has_addon("plugin.video.new"))
+
+        self.__add_addon(self.kodi_home, "plugin.video.new")
+        registry.refresh()  # the folder mtime resolution might be too coarse within a test
+
+        self.assertTrue(registry.has_addon("plugin.video.new"))
+
+    def test_has_addon_condition(self) -> None:
+        self.assertEqual(1, xbmc.getCondVisibility('System.HasAddon("plugin.video.example")'))
+        self.assertEqual(0, xbmc.getCondVisibility('System.HasAddon(plugin.video.missing)'))
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import xbmcaddon
+import xbmcvfs
+from sakee.context import EmulatorContext
+
+ADDON_XML = '<addon id="{0}" name="{0}" version="1.0.0" provider-name="Test">' \
+            '<extension point="xbmc.python.pluginsource" library="plugin.py"/></addon>'
+
+
+class TestEmulatorContext(unittest.TestCase):
+    kodi_home = os.path.abspath("./tests/home")
+
+    def setUp(self) -> None:
+        self.temp_home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_home)
+        os.makedirs(os.path.join(self.temp_home, "userdata"))
+        for add_on_id in ("plugin.video.one", "plugin.video.two"):
+            os.makedirs(os.path.join(self.temp_home, "addons", add_on_id))
+            with open(os.path.join(self.temp_home, "addons", add_on_id, "addon.xml"), "w", encoding="utf-8") as fp:
+                fp.write(ADDON_XML.format(add_on_id))
+
+    def test_addon_uses_active_context(self) -> None:
+        with EmulatorContext(self.kodi_home, "plugin.video.example"):
+            addon = xbmcaddon.Addon()
+            self.assertEqual("plugin.video.example", addon.getAddonInfo("id"))
+            self.assertEqual(os.path.join(self.kodi_home, "addons", "plugin.video.example"),
+                             addon.getAddonInfo("path"))
+
+        self.assertIsNone(EmulatorContext.current())
+
+    def test_translate_path_uses_active_context(self) -> None:
+        with EmulatorContext(self.temp_home, "plugin.video.one"):
+            self.assertEqual(os.path.join(self.temp_home, "userdata", "addon_data"),
+                             xbmcvfs.translatePath("special://profile/addon_data"))
+
+    def test_nested_contexts(self) -> None:
+        one = EmulatorContext(self.temp_home, "plugin.video.one")
+        two = EmulatorContext(self.temp_home, "plugin.video.two")
+
+        with one:
+            with two:
+                self.assertIs(two, EmulatorContext.current())
+            self.assertIs(one, EmulatorContext.current())
+
+    def test_contexts_per_thread(self) -> None:
+        results = {}
+
+        def run(add_on_id):
+            context = EmulatorContext(self.temp_home, add_on_id)
+            results[add_on_id] = context.run(lambda: xbmcaddon.Addon().getAddonInfo("name"))
+
+        threads = [threading.Thread(target=run, args=(add_on_id,)) for add_on_id in ("plugin.video.one", "plugin.video.two")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual({"plugin.video.one": "plugin.video.one", "plugin.video.two": "plugin.video.two"}, results)
+        self.assertIsNone(EmulatorContext.current())
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sakee import favourites
+from sakee.context import EmulatorContext
+from sakee.sakejsonrpc import execute_jsonrpc_obj
+
+FAVOURITES_XML = """<favourites>
+    <favourite name="Tom &amp; Jerry" thumb="special://home/icon.png">PlayMedia(&quot;plugin://plugin.video.example/?a=1&amp;b=2&quot;)</favourite>
+    <favourite name="Videos">ActivateWindow(10025,&quot;plugin://plugin.video.example/, with comma&quot;,return)</favourite>
+    <favourite name="Script">RunScript(&quot;script.example&quot;)</favourite>
+</favourites>
+"""
+
+
+class TestFavourites(unittest.TestCase):
+    def setUp(self) -> None:
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home)
+        os.makedirs(os.path.join(self.home, "userdata"))
+        self.path = os.path.join(self.home, "userdata", "favourites.xml")
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write(FAVOURITES_XML)
+
+        favourites.favourites_cache.clear()
+        self.context = EmulatorContext(self.home, "plugin.video.example")
+        self.context.__enter__()
+        self.addCleanup(self.context.__exit__, None, None, None)
+
+    def test_parse(self):
+        items = favourites.get_favourites(self.path)
+        self.assertEqual(3, len(items))
+        self.assertEqual("Tom & Jerry", items[0].title)
+        self.assertEqual("media", items[0].type)
+        self.assertEqual("plugin://plugin.video.example/?a=1&b=2", items[0].path)
+        self.assertEqual("10025", items[1].window)
+        self.assertEqual("plugin://plugin.video.example/, with comma", items[1].windowparameter)
+        self.assertEqual("script", items[2].type)
+
+    def test_cached(self):
+        for _ in range(10):
+            self.__get_favourites()
+        self.assertEqual(1, favourites.favourites_cache.info().misses)
+
+    def test_legacy_result(self):
+        result = self.__get_favourites()
+        self.assertEqual(dict(start=0, end=3, total=3), result["limits"])
+        self.assertEqual("plugin://plugin.video.example/?a=1&b=2", result["favourites"][0]["windowparameter"])
+
+    def test_properties_and_limits(self):
+        result = self.__get_favourites(properties=["window", "windowparameter", "path", "thumbnail"],
+                                       limits=dict(start=1, end=2))
+        self.assertEqual(dict(start=1, end=2, total=3), result["limits"])
+        self.assertEqual(
+            [dict(title="Videos", type="window", window="10025", thumbnail="",
+                  windowparameter="plugin://plugin.video.example/, with comma")],
+            result["favourites"])
+
+    def test_type(self):
+        result = self.__get_favourites(type="script", properties=["path"])
+        self.assertEqual([dict(title="Script", type="script", path="script.example")], result["favourites"])
+
+    def test_missing_file(self):
+        os.remove(self.path)
+        self.assertEqual(0, self.__get_favourites()["limits"]["total"])
+
+    def test_add_favourite(self):
+        execute_jsonrpc_obj(dict(jsonrpc="2.0", method="Favourites.AddFavourite", id=1, params=dict(
+            title="Added & new", type="media", path="plugin://plugin.video.example/?c=3&d=4")))
+
+        result = self.__get_favourites(properties=["path"])
+        self.assertEqual(4, result["limits"]["total"])
+        self.assertEqual(dict(title="Added & new", type="media", path="plugin://plugin.video.example/?c=3&d=4"),
+                         result["favourites"][-1])
+        self.assertEqual("plugin://plugin.video.example/?a=1&b=2", result["favourites"][0]["path"])
+
+    def test_entities_are_decoded_once(self):
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write('<favourites><favourite name="A &amp;amp; B">'
+                     'PlayMedia(&quot;plugin://x/?a=1&amp;param=2&amp;copy=3&quot;)</favourite></favourites>')
+
+        items = favourites.get_favourites(self.path)
+        self.assertEqual("A &amp; B", items[0].title)
+        self.assertEqual("plugin://x/?a=1&param=2&copy=3", items[0].path)
+
+        # Adding a favourite keeps the existing ones as they were
+        favourites.add_favourite(self.path, "New", "media", "plugin://x/")
+        self.assertEqual("A &amp; B", favourites.get_favourites(self.path)[0].title)
+
+    def test_add_invalid_favourite(self):
+        for params in (dict(title="Window", type="window"), dict(title="Media", type="media"),
+                       dict(title="Unknown", type="unknown", path="x")):
+            response = execute_jsonrpc_obj(
+                dict(jsonrpc="2.0", method="Favourites.AddFavourite", id=2, params=params))
+            self.assertEqual(-32602, response["error"]["code"], params)
+        self.assertEqual(3, self.__get_favourites()["limits"]["total"])
+
+    @staticmethod
+    def __get_favourites(**params):
+        return execute_jsonrpc_obj(
+            dict(jsonrpc="2.0", method="Favourites.GetFavourites", params=params, id=1))["result"]
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from sakee import guisettings
+from sakee.context import EmulatorContext
+from sakee.persistence import BatchedWriter
+from sakee.sakejsonrpc import execute_jsonrpc_obj
+
+GUISETTINGS_XML = """<settings version="2">
+    <setting id="network.usehttpproxy" default="true">false</setting>
+    <setting id="network.httpproxyport">8080</setting>
+    <setting id="locale.language">resource.language.en_gb</setting>
+    <setting id="subtitles.height">0.5</setting>
+</settings>
+"""
+
+
+class TestGuiSettings(unittest.TestCase):
+    def setUp(self) -> None:
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home)
+        os.makedirs(os.path.join(self.home, "userdata"))
+        self.path = os.path.join(self.home, "userdata", "guisettings.xml")
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write(GUISETTINGS_XML)
+
+        guisettings.guisettings_cache.clear()
+        self.context = EmulatorContext(self.home, "plugin.video.example")
+        self.context.__enter__()
+        self.addCleanup(self.context.__exit__, None, None, None)
+
+    def test_typed_values(self):
+        self.assertIs(False, self.__get_value("network.usehttpproxy"))
+        self.assertEqual(8080, self.__get_value("network.httpproxyport"))
+        self.assertEqual(0.5, self.__get_value("subtitles.height"))
+        self.assertEqual("resource.language.en_gb", self.__get_value("locale.language"))
+        self.assertEqual("", self.__get_value("unknown.setting"))
+
+    def test_parsed_once(self):
+        for _ in range(10):
+            self.__get_value("locale.language")
+        self.assertEqual(1, guisettings.guisettings_cache.info().misses)
+
+    def test_invalidation(self):
+        self.assertEqual("resource.language.en_gb", self.__get_value("locale.language"))
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write(GUISETTINGS_XML.replace("en_gb", "nl_nl"))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+        self.assertEqual("resource.language.nl_nl", self.__get_value("locale.language"))
+
+    def test_get_settings(self):
+        result = self.__execute("Settings.GetSettings", filter=dict(section="system", category="network"))
+        self.assertEqual(["network.usehttpproxy", "network.httpproxyport"], [s["id"] for s in result["settings"]])
+        self.assertEqual(["boolean", "integer"], [s["type"] for s in result["settings"]])
+        self.assertEqual(4, len(self.__execute("Settings.GetSettings")["settings"]))
+
+    def test_set_value(self):
+        self.assertTrue(self.__execute("Settings.SetSettingValue", setting="network.usehttpproxy", value=True))
+        self.assertTrue(self.__execute("Settings.SetSettingValue", setting="network.httpproxyserver", value="proxy"))
+        self.assertIs(True, self.__get_value("network.usehttpproxy"))
+        self.assertTrue(BatchedWriter.instance().is_pending(self.path))
+
+        guisettings.GuiSettings.get(self.path).flush()
+        with open(self.path, encoding="utf-8") as fp:
+            content = fp.read()
+        self.assertIn('<setting id="network.usehttpproxy">true</setting>', content)
+        self.assertIn('<setting id="network.httpproxyserver">proxy</setting>', content)
+        self.assertIn('<setting id="locale.language">resource.language.en_gb</setting>', content)
+
+        guisettings.guisettings_cache.clear()
+        self.assertEqual("proxy", guisettings.read_guisettings_xml(self.path)["network.httpproxyserver"].value)
+
+    def test_legacy_format(self):
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write("<settings><network><usehttpproxy>true</usehttpproxy></network></settings>")
+        self.assertIs(True, guisettings.read_guisettings_xml(self.path)["network.usehttpproxy"].value)
+
+    def __get_value(self, setting):
+        return self.__execute("Settings.GetSettingValue", setting=setting)["value"]
+
+    @staticmethod
+    def __execute(method, **params):
+        return execute_jsonrpc_obj(dict(jsonrpc="2.0", method=method, params=params, id=1))["result"]
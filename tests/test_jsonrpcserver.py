@@ -0,0 +1,68 @@
+import http.client
+import json
+import os
+import unittest
+
+from sakee.context import EmulatorContext
+from sakee.jsonrpcserver import JsonRpcServer
+
+
+class TestJsonRpcServer(unittest.TestCase):
+    kodi_home = os.path.abspath("./tests/home")
+
+    def setUp(self) -> None:
+        self.server = JsonRpcServer(port=0, context=EmulatorContext(self.kodi_home, "plugin.video.example"))
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        self.connection = http.client.HTTPConnection(self.server.host, self.server.port, timeout=10)
+        self.addCleanup(self.connection.close)
+
+    def test_request(self):
+        status, response = self.__post(dict(jsonrpc="2.0", method="Addons.GetAddons", params={}, id=1))
+        self.assertEqual(200, status)
+        self.assertEqual("plugin.video.example", response["result"]["addons"][0]["addonid"])
+
+    def test_batch_keep_alive(self):
+        for i in range(3):
+            status, response = self.__post([
+                dict(jsonrpc="2.0", method="Addons.GetAddons", id=i),
+                dict(jsonrpc="2.0", method="Addons.GetAddons", id=i + 100),
+            ])
+            self.assertEqual(200, status)
+            self.assertEqual([i, i + 100], [r["id"] for r in response])
+
+        stats = self.server.stats()["addons.getaddons"]
+        self.assertEqual(6, stats.count)
+        self.assertEqual(0, stats.errors)
+        self.assertLessEqual(stats.minimum, stats.average)
+        self.assertLessEqual(stats.average, stats.maximum)
+
+        self.connection.request("GET", "/jsonrpc/stats")
+        response = self.connection.getresponse()
+        self.assertEqual(6, json.loads(response.read())["addons.getaddons"]["count"])
+
+    def test_errors(self):
+        self.connection.request("POST", "/jsonrpc", body=b"{invalid", headers={"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        self.assertEqual(-32700, json.loads(response.read())["error"]["code"])
+
+        status, response = self.__post(dict(jsonrpc="2.0", method="Addons.GetAddons", params=dict(unknown=1), id=7))
+        self.assertEqual(-32602, response["error"]["code"])
+        self.assertEqual(7, response["id"])
+        self.assertEqual(1, self.server.stats()["addons.getaddons"].errors)
+
+    def test_notification(self):
+        status, response = self.__post(dict(jsonrpc="2.0", method="Addons.GetAddons"))
+        self.assertEqual(200, status)
+
+        status, response = self.__post([dict(jsonrpc="2.0", method="Addons.GetAddons")])
+        self.assertEqual(204, status)
+        self.assertIsNone(response)
+
+    def __post(self, json_data):
+        self.connection.request("POST", "/jsonrpc", body=json.dumps(json_data).encode("utf-8"),
+                                headers={"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        body = response.read()
+        return response.status, json.loads(body) if body else None
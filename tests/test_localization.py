@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from sakee import localization
+
+
+class TestStringsPo(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.path = os.path.join(temp_dir, "strings.po")
+        localization.strings_cache.clear()
+
+    def __write(self, content):
+        with open(self.path, "w", encoding="utf-8") as fp:
+            fp.write(content)
+
+    def test_single_line_strings(self) -> None:
+        self.__write('msgid ""\nmsgstr ""\n"Language: en_GB\\n"\n\n'
+                     'msgctxt "#30000"\nmsgid "General"\nmsgstr ""\n\n'
+                     'msgctxt "#30001"\nmsgid "Source"\nmsgstr "Translated"\n')
+
+        self.assertEqual({30000: "General", 30001: "Translated"}, localization.read_strings_po(self.path))
+
+    def test_multi_line_strings(self) -> None:
+        self.__write('msgctxt "#30000"\nmsgid ""\n"First line[CR]"\n"Second \\"line\\""\nmsgstr ""\n')
+
+        self.assertEqual({30000: 'First line\nSecond "line"'}, localization.read_strings_po(self.path))
+
+    def test_entries_without_numeric_context_are_ignored(self) -> None:
+        self.__write('# A comment\nmsgctxt "Addon Summary"\nmsgid "Summary"\nmsgstr ""\n')
+
+        self.assertEqual({}, localization.read_strings_po(self.path))
+
+    def test_catalog_is_cached(self) -> None:
+        self.__write('msgctxt "#30000"\nmsgid "General"\nmsgstr ""\n')
+
+        localization.get_strings(self.path)
+        localization.get_strings(self.path)
+
+        self.assertEqual(1, localization.strings_cache.info().misses)
+        self.assertEqual(1, localization.strings_cache.info().hits)
+
+
+class TestStringsPoBenchmark(unittest.TestCase):
+    entries = 20000
+
+    def test_parse_large_catalog(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "strings.po")
+
+        with open(path, "w", encoding="utf-8") as fp:
+            fp.write('msgid ""\nmsgstr ""\n"Language: en_GB\\n"\n\n')
+            for i in range(self.entries):
+                if i % 10 == 0:
+                    fp.write('msgctxt "#{}"\nmsgid ""\n"Multi-line string {} "\n"with a second line"\nmsgstr ""\n\n'.format(i, i))
+                else:
+                    fp.write('msgctxt "#{}"\nmsgid "String {}"\nmsgstr ""\n\n'.format(i, i))
+
+        localization.strings_cache.clear()
+        start = time.perf_counter()
+        strings = localization.get_strings(path)
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        localization.get_strings(path)
+        cached_time = time.perf_counter() - start
+
+        self.assertLess(cached_time, parse_time)
+        self.assertEqual(self.entries, len(strings))
+        self.assertEqual("String 1", strings[1])
+        self.assertEqual("Multi-line string 10 with a second line", strings[10])
@@ -0,0 +1,242 @@
+import threading
+import unittest
+
+from sakee import pluginrunner
+from sakee.sakejsonrpc import execute_jsonrpc_obj
+
+
+class TestPluginRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        pluginrunner.listing_cache.clear()
+
+    def test_parse_plugin_uri(self):
+        plugin = pluginrunner.parse_plugin_uri("plugin://plugin.video.example/list?page=1")
+        self.assertEqual("plugin.video.example", plugin.add_on_id)
+        self.assertEqual("plugin://plugin.video.example/list", plugin.route)
+        self.assertEqual("?page=1", plugin.params)
+        self.assertTrue(plugin.entrypoint.endswith("plugin.py"))
+
+        with self.assertRaises(ValueError):
+            pluginrunner.parse_plugin_uri("plugin://plugin.video.unknown/")
+
+    def test_new_handle(self):
+        self.assertNotEqual(pluginrunner.new_handle(), pluginrunner.new_handle())
+
+    def test_get_directory(self):
+        result = self.__get_directory(properties=["title", "plot", "thumbnail"])
+        self.assertEqual(dict(start=0, end=2, total=2), result["limits"])
+        self.assertEqual([
+            dict(file="plugin://plugin.video.example/list?page=2", filetype="directory", label="Folder", type="unknown",
+                 title="Folder", plot="", thumbnail="folder.png"),
+            dict(file="plugin://plugin.video.example/play?filename=video.mp4", filetype="file", label="Video",
+                 type="unknown", title="Video title", plot="A plot", thumbnail=""),
+        ], result["files"])
+
+    def test_get_directory_limits(self):
+        result = self.__get_directory(limits=dict(start=1, end=5))
+        self.assertEqual(dict(start=1, end=2, total=2), result["limits"])
+        self.assertEqual(["Video"], [f["label"] for f in result["files"]])
+
+    def test_listing_cached(self):
+        for _ in range(5):
+            self.__get_directory()
+        info = pluginrunner.listing_cache.info()
+        self.assertEqual(1, info.misses)
+        self.assertEqual(4, info.hits)
+
+    def test_get_directory_errors(self):
+        for directory, code in (("plugin://plugin.video.missing/", -32602),
+                                ("plugin://plugin.video.example/fail", -32603)):
+            response = execute_jsonrpc_obj(dict(
+                jsonrpc="2.0", method="Files.GetDirectory", params=dict(directory=directory), id=5))
+            self.assertEqual(5, response["id"])
+            self.assertEqual(code, response["error"]["code"], directory)
+
+    def test_other_directories_are_stubbed(self):
+        result = execute_jsonrpc_obj(dict(
+            jsonrpc="2.0", method="Files.GetDirectory", params=dict(directory="/tmp"), id=1))
+        self.assertEqual("OK", result["result"])
+
+    @staticmethod
+    def __get_directory(**params):
+        params["directory"] = "plugin://plugin.video.example/list"
+        return execute_jsonrpc_obj(
+            dict(jsonrpc="2.0", method="Files.GetDirectory", params=params, id=1))["result"]
+
+
+class TestPluginCodeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        pluginrunner.code_cache.clear()
+
+    def test_compiled_once(self):
+        import sys
+        from unittest import mock
+
+        plugin = pluginrunner.parse_plugin_uri("plugin://plugin.video.example/list")
+        with mock.patch("builtins.compile", wraps=compile) as compile_mock:
+            for _ in range(3):
+                pluginrunner.list_plugin("plugin://plugin.video.example/list")
+
+        self.assertEqual(1, compile_mock.call_count)
+        self.assertEqual(1, pluginrunner.code_cache.info().misses)
+        self.assertEqual(2, pluginrunner.code_cache.info().hits)
+        self.assertIn(plugin.add_on_path, sys.path)
+        self.assertEqual(1, sys.path.count(plugin.add_on_path))
+
+
+class TestAddonModules(unittest.TestCase):
+    PLUGIN = "\n".join([
+        "import sys",
+        "import xbmcgui, xbmcplugin",
+        "from resources.lib import naming",
+        "xbmcplugin.addDirectoryItem(int(sys.argv[1]), sys.argv[0], xbmcgui.ListItem(label=naming.NAME))",
+        "xbmcplugin.endOfDirectory(int(sys.argv[1]))",
+    ])
+
+    def setUp(self) -> None:
+        import os
+        import shutil
+        import tempfile
+        from sakee.context import EmulatorContext
+
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home)
+        for add_on_id, package in (("plugin.video.first", True), ("plugin.video.second", False)):
+            lib_path = os.path.join(self.home, "addons", add_on_id, "resources", "lib")
+            os.makedirs(lib_path)
+            with open(os.path.join(self.home, "addons", add_on_id, "addon.xml"), "w") as fp:
+                fp.write('<addon id="{}" name="{}" version="1.0.0">'
+                         '<extension point="xbmc.python.pluginsource" library="plugin.py"/></addon>'.format(add_on_id, add_on_id))
+            with open(os.path.join(self.home, "addons", add_on_id, "plugin.py"), "w") as fp:
+                fp.write(self.PLUGIN)
+            with open(os.path.join(lib_path, "naming.py"), "w") as fp:
+                fp.write("NAME = {!r}\n".format(add_on_id))
+            if package:
+                # The first add-on uses regular packages, the second namespace packages.
+                for folder in (os.path.dirname(lib_path), lib_path):
+                    open(os.path.join(folder, "__init__.py"), "w").close()
+
+        self.context = EmulatorContext(self.home, "plugin.video.first")
+
+    def test_add_ons_with_the_same_packages(self):
+        for add_on_id in ("plugin.video.first", "plugin.video.second", "plugin.video.first", "plugin.video.second"):
+            result = self.context.run(pluginrunner.run_plugin, "plugin://{}/".format(add_on_id))
+            self.assertIsNone(result.exception)
+            self.assertEqual(add_on_id, result.listing[0][0].getLabel())
+
+    def test_modules_stay_warm(self):
+        import sys
+
+        self.context.run(pluginrunner.run_plugin, "plugin://plugin.video.first/")
+        naming = sys.modules["resources.lib.naming"]
+        self.context.run(pluginrunner.run_plugin, "plugin://plugin.video.first/")
+        self.assertIs(naming, sys.modules["resources.lib.naming"])
+
+
+class TestPluginExecutor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.executor = pluginrunner.PluginExecutor(max_workers=2, mode=pluginrunner.PluginExecutor.MODE_THREAD)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_result(self):
+        result = self.executor.submit("plugin://plugin.video.example/list").result(timeout=10)
+        self.assertEqual("plugin://plugin.video.example/list", result.plugin_uri)
+        self.assertEqual(0, result.exit_code)
+        self.assertIsNone(result.exception)
+        self.assertEqual(["Folder", "Video"], [item.getLabel() for item, _, _ in result.listing])
+        self.assertGreater(result.duration, 0)
+        self.assertIsNone(result.output)
+
+    def test_exit_code_and_exception(self):
+        unknown_route = self.executor.submit("plugin://plugin.video.example/unknown")
+        failure = self.executor.submit("plugin://plugin.video.example/fail")
+
+        self.assertEqual(1, unknown_route.result(timeout=10).exit_code)
+        result = failure.result(timeout=10)
+        self.assertEqual(1, result.exit_code)
+        self.assertIsInstance(result.exception, RuntimeError)
+
+    def test_unknown_addon(self):
+        with self.assertRaises(ValueError):
+            self.executor.submit("plugin://plugin.video.unknown/")
+
+    def test_many_submissions(self):
+        futures = [self.executor.submit("plugin://plugin.video.example/list") for _ in range(20)]
+        self.assertTrue(all(f.result(timeout=10).exit_code == 0 for f in futures))
+
+
+class TestProcessPluginExecutor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.executor = pluginrunner.PluginExecutor(max_workers=2, mode=pluginrunner.PluginExecutor.MODE_PROCESS)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutdown = threading.Thread(target=cls.executor.shutdown, daemon=True)
+        shutdown.start()
+        shutdown.join(30)
+        if shutdown.is_alive():
+            raise AssertionError("The worker processes did not stop")
+
+    def test_result(self):
+        result = self.executor.submit("plugin://plugin.video.example/list").result(timeout=30)
+        self.assertEqual(0, result.exit_code)
+        self.assertIsNone(result.exception)
+        self.assertGreater(result.duration, 0)
+        self.assertIn("Invoked plugin.video.example with route /list", result.output)
+
+        folder, url, is_folder = result.listing[0]
+        self.assertIsInstance(folder, pluginrunner.ListingItem)
+        self.assertEqual("Folder", folder.label)
+        self.assertEqual("folder.png", folder.art["thumb"])
+        self.assertEqual("plugin://plugin.video.example/list?page=2", url)
+        self.assertTrue(is_folder)
+        self.assertEqual("Video title", result.listing[1][0].info_labels["title"])
+
+    def test_resolved_url(self):
+        from sakee.internalplayer import KodiInteralPlayer
+
+        player = KodiInteralPlayer.instance()
+        self.addCleanup(player.stop_playback)
+
+        result = self.executor.submit("plugin://plugin.video.example/play?filename=video.mp4").result(timeout=30)
+        self.assertEqual("video.mp4", result.resolved_url)
+        # The resolved url is played by the caller, not by the worker.
+        self.assertEqual("video.mp4", player.file)
+
+    def test_exception(self):
+        result = self.executor.submit("plugin://plugin.video.example/fail").result(timeout=30)
+        self.assertEqual(1, result.exit_code)
+        self.assertIsInstance(result.exception, RuntimeError)
+
+    def test_argv_isolation(self):
+        uris = ["plugin://plugin.video.example/echo?page={}".format(i) for i in range(4)]
+        results = [f.result(timeout=30) for f in [self.executor.submit(uri) for uri in uris]]
+        self.assertEqual(uris, [result.listing[0][1] for result in results])
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            pluginrunner.PluginExecutor(mode="fiber")
+
+
+class TestArgvIsolation(unittest.TestCase):
+    def test_concurrent_invocations(self):
+        executor = pluginrunner.PluginExecutor(max_workers=8, mode=pluginrunner.PluginExecutor.MODE_THREAD)
+        self.addCleanup(executor.shutdown)
+
+        uris = ["plugin://plugin.video.example/echo?page={}".format(i) for i in range(16)]
+        futures = [executor.submit(uri) for uri in uris]
+        results = [f.result(timeout=10) for f in futures]
+
+        self.assertEqual(uris, [result.listing[0][1] for result in results])
+        handles = [result.listing[0][0].getLabel() for result in results]
+        self.assertEqual(len(uris), len(set(handles)))
+
+    def test_argv_restored(self):
+        import sys
+
+        original = list(sys.argv)
+        pluginrunner.run_plugin("plugin://plugin.video.example/echo?page=1")
+        self.assertIsInstance(sys.argv, pluginrunner.ArgvProxy)
+        self.assertEqual(original, sys.argv)
+        self.assertEqual(original[1:], sys.argv[1:])
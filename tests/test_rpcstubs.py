@@ -0,0 +1,146 @@
+import http.server
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import xbmc
+from sakee import rpcstubs
+from sakee.persistence import BatchedWriter
+
+
+class TestRpcStubs(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        rpcstubs.stubs_cache.clear()
+
+        stubs = [
+            dict(request=dict(method="VideoLibrary.GetMovieDetails", params=dict(setting="setting.{}".format(i))),
+                 response=dict(id=1, jsonrpc="2.0", result=dict(value=i)))
+            for i in range(500)
+        ]
+        stubs.append(dict(request=dict(method="VideoLibrary.GetMovieDetails", params=dict(setting="setting.0", limit=1.0)),
+                          response=dict(id=1, jsonrpc="2.0", result=dict(value="limited"))))
+        self.__write("videolibrary.getmoviedetails.json", stubs)
+        self.__write("textures.gettextures.json", dict(id=1, jsonrpc="2.0", result=dict(textures=[])))
+
+        self.environ = os.environ.get("KODI_STUB_RPC_RESPONSES")
+        os.environ["KODI_STUB_RPC_RESPONSES"] = self.folder
+
+    def tearDown(self) -> None:
+        if self.environ is None:
+            os.environ.pop("KODI_STUB_RPC_RESPONSES", None)
+        else:
+            os.environ["KODI_STUB_RPC_RESPONSES"] = self.environ
+
+    def test_canonical_params(self):
+        self.assertEqual(rpcstubs.canonical_params({"a": 1.0, "b": [2, 3.0]}),
+                         rpcstubs.canonical_params({"b": [2.0, 3], "a": 1}))
+        self.assertNotEqual(rpcstubs.canonical_params({"a": 1}), rpcstubs.canonical_params({"a": 1.5}))
+
+    def test_lookup(self):
+        self.assertEqual(499, self.__execute("VideoLibrary.GetMovieDetails", setting="setting.499")["result"]["value"])
+        self.assertEqual("limited", self.__execute("VideoLibrary.GetMovieDetails", limit=1, setting="setting.0")["result"]["value"])
+
+    def test_single_response(self):
+        self.assertEqual([], self.__execute("Textures.GetTextures", type="media")["result"]["textures"])
+
+    def test_no_match(self):
+        self.assertEqual("OK", self.__execute("VideoLibrary.GetMovieDetails", setting="unknown")["result"])
+        self.assertEqual("OK", self.__execute("VideoLibrary.GetMovieDetails")["result"])
+
+    def test_parsed_once(self):
+        for i in range(100):
+            self.__execute("VideoLibrary.GetMovieDetails", setting="setting.{}".format(i))
+
+        info = rpcstubs.stubs_cache.info()
+        self.assertEqual(1, info.misses)
+        self.assertEqual(99, info.hits)
+
+    def test_reload_on_change(self):
+        self.assertEqual(1, self.__execute("VideoLibrary.GetMovieDetails", setting="setting.1")["result"]["value"])
+
+        path = self.__write("videolibrary.getmoviedetails.json", [
+            dict(request=dict(method="VideoLibrary.GetMovieDetails", params=dict(setting="setting.1")),
+                 response=dict(id=1, jsonrpc="2.0", result=dict(value="changed")))
+        ])
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+        self.assertEqual("changed", self.__execute("VideoLibrary.GetMovieDetails", setting="setting.1")["result"]["value"])
+
+    def __write(self, name, content):
+        path = os.path.join(self.folder, name)
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(content, fp)
+        return path
+
+    @staticmethod
+    def __execute(method, **params):
+        cmd = dict(jsonrpc="2.0", method=method, id=1)
+        if params:
+            cmd["params"] = params
+        return json.loads(xbmc.executeJSONRPC(json.dumps(cmd)))
+
+
+class TestStubRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.folder)
+        rpcstubs.stubs_cache.clear()
+
+        self.writer = BatchedWriter(delay=60)
+        self.addCleanup(self.writer.flush)
+
+        with open(os.path.join(self.folder, "videolibrary.getmoviedetails.json"), "w", encoding="utf-8") as fp:
+            json.dump([dict(request=dict(method="VideoLibrary.GetMovieDetails", params=dict(movieid=1)),
+                            response=dict(id=1, jsonrpc="2.0", result=dict(label="Existing")))], fp)
+
+    def test_record_placeholders(self):
+        recorder = rpcstubs.StubRecorder(writer=self.writer)
+        for movie_id in (1.0, 2, 2.0, 3):
+            request = dict(jsonrpc="2.0", method="VideoLibrary.GetMovieDetails", params=dict(movieid=movie_id), id=4)
+            if rpcstubs.find_response(self.folder, request) is None:
+                self.assertEqual("OK", recorder.record(self.folder, request)["result"])
+        recorder.record(self.folder, dict(jsonrpc="2.0", method="JSONRPC.Version", id=5))
+
+        self.assertTrue(self.writer.is_pending(os.path.join(self.folder, "videolibrary.getmoviedetails.json")))
+        self.writer.flush()
+
+        with open(os.path.join(self.folder, "videolibrary.getmoviedetails.json"), encoding="utf-8") as fp:
+            stubs = json.load(fp)
+        self.assertEqual([1, 2, 3], [stub["request"]["params"]["movieid"] for stub in stubs])
+
+        with open(os.path.join(self.folder, "jsonrpc.version.json"), encoding="utf-8") as fp:
+            self.assertEqual(5, json.load(fp)["id"])
+
+        # The recorded stubs are now used
+        request = dict(jsonrpc="2.0", method="VideoLibrary.GetMovieDetails", params=dict(movieid=3), id=4)
+        self.assertEqual("OK", rpcstubs.find_response(self.folder, request)["result"])
+
+    def test_record_from_endpoint(self):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):  # NOSONAR
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                body = json.dumps(dict(id=request["id"], jsonrpc="2.0", result=dict(method=request["method"])))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        recorder = rpcstubs.StubRecorder(url="http://127.0.0.1:{}/jsonrpc".format(server.server_port), writer=self.writer)
+        request = dict(jsonrpc="2.0", method="VideoLibrary.GetMovieDetails", params=dict(movieid=7), id=9)
+        response = recorder.record(self.folder, request)
+        self.assertEqual(dict(id=9, jsonrpc="2.0", result=dict(method="VideoLibrary.GetMovieDetails")), response)
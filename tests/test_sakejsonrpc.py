@@ -0,0 +1,142 @@
+import unittest
+
+from sakee.sakejsonrpc import JsonRpcApi, execute_jsonrpc_obj
+
+
+class TestJsonRpcApi(unittest.TestCase):
+    def test_case_insensitive(self):
+        self.assertTrue(JsonRpcApi.has_method("Addons.GetAddons"))
+        self.assertTrue(JsonRpcApi.has_method("addons.getaddons"))
+        self.assertFalse(JsonRpcApi.has_method("Addons.Unknown"))
+
+        result = execute_jsonrpc_obj(dict(jsonrpc="2.0", method="ADDONS.GETADDONS", params={}, id=1))
+        self.assertEqual("plugin.video.example", result["result"]["addons"][0]["addonid"])
+
+    def test_not_implemented(self):
+        with self.assertRaises(NotImplementedError):
+            JsonRpcApi().handle(dict(jsonrpc="2.0", method="Addons.Unknown", id=1))
+
+    def test_namespace_instantiated_once(self):
+        class Counter(object):
+            instances = 0
+
+            def __init__(self, addon_info):
+                Counter.instances += 1
+                self.addon_info = addon_info
+
+            # noinspection PyPep8Naming
+            def Ping(self):  # NOSONAR
+                return "pong"
+
+        JsonRpcApi.register_namespace(Counter, "Test")
+        self.addCleanup(JsonRpcApi.unregister_namespace, "Test")
+        for _ in range(3):
+            self.assertEqual("pong", execute_jsonrpc_obj(dict(jsonrpc="2.0", method="test.ping", id=1))["result"])
+        self.assertEqual(1, Counter.instances)
+
+    def test_batch(self):
+        result = execute_jsonrpc_obj([
+            dict(jsonrpc="2.0", method="Addons.GetAddons", id=3),
+            dict(jsonrpc="2.0", method="Addons.GetAddons"),
+        ])
+        self.assertEqual(1, len(result))
+        self.assertEqual(3, result[0]["id"])
+
+
+class TestJsonRpcAddons(unittest.TestCase):
+    def test_get_addons_filters(self):
+        self.assertEqual(1, self.__execute("Addons.GetAddons", type="xbmc.python.pluginsource")["limits"]["total"])
+        self.assertEqual(1, self.__execute("Addons.GetAddons", content="video")["limits"]["total"])
+        self.assertEqual(0, self.__execute("Addons.GetAddons", content="audio")["limits"]["total"])
+        self.assertEqual(0, self.__execute("Addons.GetAddons", type="xbmc.service")["limits"]["total"])
+        self.assertEqual(0, self.__execute("Addons.GetAddons", enabled=False)["limits"]["total"])
+
+    def test_get_addons_limits(self):
+        result = self.__execute("Addons.GetAddons", limits=dict(start=1, end=10))
+        self.assertEqual([], result["addons"])
+        self.assertEqual(dict(start=1, end=1, total=1), result["limits"])
+
+    def test_get_addon_details(self):
+        result = self.__execute("Addons.GetAddonDetails", addonid="plugin.video.example",
+                                properties=["name", "version", "summary", "dependencies", "enabled"])
+        self.assertEqual(dict(
+            addonid="plugin.video.example",
+            type="xbmc.python.pluginsource",
+            name="Example Addon",
+            version="1.0.0",
+            summary="An example add-on",
+            dependencies=[
+                dict(addonid="xbmc.python", version="3.0.0", optional=False),
+                dict(addonid="script.module.inputstreamhelper", version="0.5.0", optional=True)
+            ],
+            enabled=True), result["addon"])
+
+    def test_get_addon_details_unknown(self):
+        response = execute_jsonrpc_obj(dict(
+            jsonrpc="2.0", method="Addons.GetAddonDetails", params=dict(addonid="plugin.video.unknown"), id=4))
+        self.assertEqual(4, response["id"])
+        self.assertEqual(-32602, response["error"]["code"])
+
+    def test_execute_addon(self):
+        self.assertEqual("OK", self.__execute("Addons.ExecuteAddon", addonid="plugin.video.example",
+                                              params=dict(page=1), wait=True))
+
+        response = execute_jsonrpc_obj(dict(
+            jsonrpc="2.0", method="Addons.ExecuteAddon", params=dict(addonid="plugin.video.unknown"), id=5))
+        self.assertEqual(-32602, response["error"]["code"])
+
+    @staticmethod
+    def __execute(method, **params):
+        return execute_jsonrpc_obj(dict(jsonrpc="2.0", method=method, params=params, id=1))["result"]
+
+
+class TestJsonRpcPlayer(unittest.TestCase):
+    def setUp(self) -> None:
+        import xbmc
+
+        self.play_list = xbmc.PlayList(xbmc.PLAYLIST_VIDEO)
+        self.play_list.clear()
+        self.addCleanup(self.play_list.clear)
+
+    def test_no_active_player(self):
+        from sakee.internalplayer import KodiInteralPlayer
+
+        if KodiInteralPlayer.instance().status != KodiInteralPlayer.STATUS_STOPPED:
+            self.skipTest("The player is still active")
+
+        self.assertEqual([], self.__execute("Player.GetActivePlayers")["result"])
+        self.assertEqual(-32100, self.__execute("Player.GetProperties", playerid=1, properties=["time"])["error"]["code"])
+
+    def test_player_properties(self):
+        from unittest import mock
+        from sakee.internalplayer import KodiInteralPlayer
+
+        player = KodiInteralPlayer.instance()
+        with mock.patch.multiple(player, status=KodiInteralPlayer.STATUS_PAUSED, current_time=3725, total_time=7450):
+            self.assertEqual([dict(playerid=1, playertype="internal", type="video")],
+                             self.__execute("Player.GetActivePlayers")["result"])
+            result = self.__execute("Player.GetProperties", playerid=1, properties=["time", "percentage", "speed"])
+            self.assertEqual(dict(
+                time=dict(hours=1, minutes=2, seconds=5, milliseconds=0),
+                percentage=50.0,
+                speed=0), result["result"])
+
+    def test_playlist_shared(self):
+        import xbmc
+        import xbmcgui
+
+        self.play_list.add("http://example.com/1.mp4")
+        xbmc.PlayList(xbmc.PLAYLIST_VIDEO).add("http://example.com/2.mp4", xbmcgui.ListItem(label="Second"))
+        self.assertEqual(2, len(self.play_list))
+        self.assertEqual(0, len(xbmc.PlayList(xbmc.PLAYLIST_MUSIC)))
+
+        result = self.__execute("Playlist.GetItems", playlistid=1, properties=["file", "title"])["result"]
+        self.assertEqual(dict(start=0, end=2, total=2), result["limits"])
+        self.assertEqual([
+            dict(label="http://example.com/1.mp4", type="unknown", file="http://example.com/1.mp4"),
+            dict(label="Second", type="unknown", file="http://example.com/2.mp4", title="Second"),
+        ], result["items"])
+
+    @staticmethod
+    def __execute(method, **params):
+        return execute_jsonrpc_obj(dict(jsonrpc="2.0", method=method, params=params, id=1))
@@ -44,3 +44,53 @@ class XbmcTest(unittest.TestCase):
         self.assertIsInstance(result.get('result'), dict)
         self.assertIsInstance(result.get('result').get('addons'), list)
         self.assertEqual(result.get('result').get('addons')[0].get('addonid'), 'plugin.video.example')
+
+
+class XbmcJsonRpcBatchTest(unittest.TestCase):
+    def test_batch(self):
+        cmd = [
+            dict(jsonrpc='2.0', method='Addons.GetAddons', params={'type': 'xbmc.python.pluginsource'}, id=10),
+            dict(jsonrpc='2.0', method='JSONRPC.Ping', id="ping"),
+            dict(jsonrpc='2.0', method='JSONRPC.Ping'),
+        ]
+        result = json.loads(xbmc.executeJSONRPC(json.dumps(cmd)))
+
+        self.assertIsInstance(result, list)
+        self.assertEqual(2, len(result))
+        self.assertEqual(10, result[0]['id'])
+        self.assertEqual('plugin.video.example', result[0]['result']['addons'][0]['addonid'])
+        self.assertEqual("ping", result[1]['id'])
+
+    def test_batch_invalid(self):
+        result = json.loads(xbmc.executeJSONRPC(json.dumps([1, dict(jsonrpc='2.0', method='JSONRPC.Ping', id=2)])))
+        self.assertEqual(-32600, result[0]['error']['code'])
+        self.assertIsNone(result[0]['id'])
+        self.assertEqual(2, result[1]['id'])
+
+    def test_batch_invalid_params(self):
+        cmd = [
+            dict(jsonrpc='2.0', method='Addons.GetAddonDetails', params={}, id=1),
+            dict(jsonrpc='2.0', method='Addons.GetAddonDetails', params={'addonid': 'plugin.video.example', 'bogus': 1}, id=2),
+            dict(jsonrpc='2.0', method='Addons.GetAddonDetails', params=['plugin.video.example'], id=3),
+            dict(jsonrpc='2.0', method='Addons.GetAddons', params=None, id=4),
+            dict(jsonrpc='2.0', method='Addons.GetAddons', params="invalid", id=5),
+        ]
+        result = json.loads(xbmc.executeJSONRPC(json.dumps(cmd)))
+
+        self.assertEqual([1, 2, 3, 4, 5], [response['id'] for response in result])
+        self.assertEqual(-32602, result[0]['error']['code'])
+        self.assertEqual(-32602, result[1]['error']['code'])
+        self.assertEqual('plugin.video.example', result[2]['result']['addon']['addonid'])
+        self.assertEqual('plugin.video.example', result[3]['result']['addons'][0]['addonid'])
+        self.assertEqual(-32602, result[4]['error']['code'])
+
+    def test_single_request_id(self):
+        cmd = dict(jsonrpc='2.0', method='Addons.GetAddons', id=42)
+        self.assertEqual(42, json.loads(xbmc.executeJSONRPC(json.dumps(cmd)))['id'])
+
+    def test_empty_batch(self):
+        result = json.loads(xbmc.executeJSONRPC("[]"))
+        self.assertEqual(-32600, result['error']['code'])
+
+    def test_notifications_only(self):
+        self.assertEqual("", xbmc.executeJSONRPC(json.dumps([dict(jsonrpc='2.0', method='JSONRPC.Ping')])))
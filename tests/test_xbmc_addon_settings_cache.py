@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from sakee.filecache import FileCache
+from xbmcaddon import Settings
+
+
+class TestSettingsCache(unittest.TestCase):
+    default_path = os.path.abspath("./tests/data/old_settings_default.xml")
+    profile_path = os.path.abspath("./tests/data/old_settings_profile.xml")
+
+    def setUp(self) -> None:
+        Settings.default_settings_cache.clear()
+        Settings.profile_settings_cache.clear()
+
+    def test_settings_files_are_parsed_once(self) -> None:
+        for _ in range(5):
+            Settings(self.default_path, self.profile_path)
+
+        self.assertEqual(1, Settings.default_settings_cache.info().misses)
+        self.assertEqual(4, Settings.default_settings_cache.info().hits)
+        self.assertEqual(1, Settings.profile_settings_cache.info().misses)
+        self.assertEqual(4, Settings.profile_settings_cache.info().hits)
+
+    def test_instances_do_not_share_values(self) -> None:
+        first = Settings(self.default_path)
+        first.setString("text", "Changed")
+
+        second = Settings(self.default_path)
+        self.assertEqual("Hello World", second.getString("text"))
+
+    def test_changed_file_is_parsed_again(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        profile_path = os.path.join(temp_dir, "settings.xml")
+        shutil.copy(self.profile_path, profile_path)
+
+        self.assertEqual("Kodi", Settings(self.default_path, profile_path).getString("text"))
+
+        with open(profile_path, "w", encoding="utf-8") as fp:
+            fp.write('<settings><setting id="text" value="Changed on disk" /></settings>')
+
+        self.assertEqual("Changed on disk", Settings(self.default_path, profile_path).getString("text"))
+        self.assertEqual(2, Settings.profile_settings_cache.info().misses)
+
+
+class TestOnDiskCache(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.cache_dir = os.path.join(temp_dir, "cache")
+        self.source = os.path.join(temp_dir, "source.txt")
+        with open(self.source, "w", encoding="utf-8") as fp:
+            fp.write("content")
+
+        patcher = mock.patch.dict(os.environ, {"KODI_STUB_CACHE_DIR": self.cache_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_new_cache_loads_from_disk(self) -> None:
+        loader = mock.Mock(return_value={"parsed": True})
+        FileCache("test").get(self.source, loader)
+
+        # A new (empty) in-memory cache, like in a new process
+        cache = FileCache("test")
+        self.assertEqual({"parsed": True}, cache.get(self.source, loader))
+        self.assertEqual(1, loader.call_count)
+        self.assertEqual(1, cache.info().disk_hits)
+        self.assertEqual(0, cache.info().misses)
+
+    def test_changed_source_is_parsed_again(self) -> None:
+        loader = mock.Mock(return_value="parsed")
+        FileCache("test").get(self.source, loader)
+
+        with open(self.source, "w", encoding="utf-8") as fp:
+            fp.write("changed content")
+
+        cache = FileCache("test")
+        cache.get(self.source, loader)
+        self.assertEqual(2, loader.call_count)
+        self.assertEqual(1, cache.info().misses)
+
+    def test_non_persistent_cache_does_not_write(self) -> None:
+        FileCache("test", persistent=False).get(self.source, lambda path: "parsed")
+
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_settings_are_loaded_from_disk(self) -> None:
+        default_path = os.path.abspath("./tests/data/old_settings_default.xml")
+        Settings.default_settings_cache.clear()
+        Settings(default_path)
+        Settings.default_settings_cache.clear()
+
+        self.assertEqual("Hello World", Settings(default_path).getString("text"))
+        self.assertEqual(1, Settings.default_settings_cache.info().disk_hits)
@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from sakee import persistence
+from sakee.persistence import BatchedWriter
+from xbmcaddon import Settings
+
+
+class TestSettingsPersistence(unittest.TestCase):
+    default_path = os.path.abspath("./tests/data/old_settings_default.xml")
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.profile_path = os.path.join(temp_dir, "addon_data", "plugin.video.example", "settings.xml")
+
+    def test_flush_writes_profile_settings(self) -> None:
+        settings = Settings(self.default_path, self.profile_path)
+        settings.setString("text", "Persisted <text>")
+        settings.setBool("bool", False)
+        settings.setInt("slider_int", 12)
+        settings.setNumber("number", 1.5)
+        settings.flush()
+
+        reloaded = Settings(self.default_path, self.profile_path)
+        self.assertEqual("Persisted <text>", reloaded.getString("text"))
+        self.assertFalse(reloaded.getBool("bool"))
+        self.assertEqual(12, reloaded.getInt("slider_int"))
+        self.assertEqual(1.5, reloaded.getNumber("number"))
+        self.assertEqual("Hello World", Settings(self.default_path).getString("text"))
+
+    def test_many_updates_result_in_a_single_write(self) -> None:
+        settings = Settings(self.default_path, self.profile_path)
+
+        with mock.patch.object(persistence, "write_atomic", wraps=persistence.write_atomic) as write_atomic:
+            for i in range(50):
+                settings.setInt("slider_int", i)
+            settings.flush()
+            settings.flush()
+
+        self.assertEqual(1, write_atomic.call_count)
+        self.assertEqual(49, Settings(self.default_path, self.profile_path).getInt("slider_int"))
+
+    def test_concurrent_updates_and_flushes(self) -> None:
+        settings = Settings(self.default_path, self.profile_path)
+
+        def update():
+            for i in range(200):
+                settings.setInt("slider_int", i)
+
+        def flush():
+            for _ in range(200):
+                settings.flush()
+
+        threads = [threading.Thread(target=update, daemon=True), threading.Thread(target=flush, daemon=True)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+            self.assertFalse(thread.is_alive())
+
+        settings.flush()
+        self.assertEqual(199, Settings(self.default_path, self.profile_path).getInt("slider_int"))
+
+    def test_settings_without_profile_are_not_persisted(self) -> None:
+        settings = Settings(self.default_path)
+        settings.setString("text", "Not persisted")
+
+        self.assertFalse(BatchedWriter.instance().is_pending(self.profile_path))
+
+
+class TestBatchedWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self.path = os.path.join(temp_dir, "file.txt")
+
+    def test_writes_are_debounced(self) -> None:
+        writer = BatchedWriter(delay=0.1)
+        for i in range(10):
+            writer.schedule(self.path, lambda: "content {}".format(i))
+
+        deadline = time.time() + 3
+        while writer.is_pending(self.path) and time.time() < deadline:
+            time.sleep(0.05)
+
+        self.assertEqual(1, writer.writes)
+        with open(self.path, encoding="utf-8") as fp:
+            self.assertEqual("content 9", fp.read())
+
+    def test_write_atomic_leaves_no_temporary_files(self) -> None:
+        persistence.write_atomic(self.path, "first")
+        persistence.write_atomic(self.path, "second")
+
+        self.assertEqual(["file.txt"], os.listdir(os.path.dirname(self.path)))
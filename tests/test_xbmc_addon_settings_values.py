@@ -1,4 +1,3 @@
-from unittest import skip
 from xbmcaddon import Settings
 import os
 import unittest
@@ -98,18 +97,23 @@ class TestSettingsValues(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, "Setting 'bool' is 'boolean', not 'string'"):
             self.settings.getString("bool")
 
+    def test_raw_value_updates_typed_value(self) -> None:
+        self.settings["slider_int"] = "7"
+        self.settings["bool"] = "false"
+
+        self.assertEqual(7, self.settings.getInt("slider_int"))
+        self.assertFalse(self.settings.getBool("bool"))
+
     def test_len_and_raw_settings(self) -> None:
         self.assertEqual(19, len(self.settings))
         self.assertEqual("Hello World", self.settings._raw_settings()["text"])
 
 
-@skip
 class TestSettingsListValues(unittest.TestCase):
-    default_path = os.path.abspath("./tests/data/old_settings_default.xml")
-    profile_path = os.path.abspath("./tests/data/old_settings_profile.xml")
+    default_path = os.path.abspath("./tests/data/list_settings_default.xml")
 
     def setUp(self) -> None:
-        self.settings = Settings(TestSettingsValues.default_path)
+        self.settings = Settings(TestSettingsListValues.default_path)
 
     def test_get_and_set_string_list(self) -> None:
         self.assertEqual(["alpha", "beta"], self.settings.getStringList("strings"))
@@ -160,5 +164,15 @@ class TestSettingsListValues(unittest.TestCase):
     def test_set_number_list_rejects_invalid_values(self) -> None:
         for invalid_value in ((1.5,), [1.5, 2], "1.5,2.0"):
             with self.subTest(value=invalid_value):
-                with self.assertRaisesRegex(TypeError, "requires a list of integer values"):
+                with self.assertRaisesRegex(TypeError, "requires a list of floating-point values"):
                     self.settings.setNumberList("numbers", invalid_value)  # type: ignore[arg-type]
+
+    def test_list_values_are_stored_with_separator(self) -> None:
+        self.settings.setIntList("integers", [3, 4, 5])
+
+        self.assertEqual("3|4|5", self.settings["integers"])
+
+    def test_getter_returns_a_copy(self) -> None:
+        self.settings.getStringList("strings").append("gamma")
+
+        self.assertEqual(["alpha", "beta"], self.settings.getStringList("strings"))
@@ -27,6 +27,15 @@ class XbmcBuiltinTest(unittest.TestCase):
         xbmc.executebuiltin('RunPlugin(plugin://plugin.video.example/touch?filename=%s)' % filename)
         self.assertTrue(_wait_for_file(full_filename))
 
+    def test_runplugin_wait(self):
+        filename = 'sakee_runplugin_wait.txt'
+        full_filename = os.path.join(tempfile.gettempdir(), filename)
+        if os.path.exists(full_filename):
+            os.remove(full_filename)
+
+        xbmc.executebuiltin('RunPlugin(plugin://plugin.video.example/touch?filename=%s)' % filename, wait=True)
+        self.assertTrue(os.path.exists(full_filename))
+
     def test_playmedia(self):
 
         def _wait_for_playing(player, filename, timeout=3):
@@ -59,3 +68,64 @@ class XbmcBuiltinTest(unittest.TestCase):
 
         xbmc.executebuiltin('PlayerControl(Stop)')  # This is instant
         self.assertFalse(player.isPlaying())
+
+
+class XbmcBuiltinParserTest(unittest.TestCase):
+    def test_parse_builtin(self):
+        from sakee.sakebuiltin import parse_builtin
+
+        self.assertEqual(("Container.Refresh", ()), parse_builtin("Container.Refresh"))
+        self.assertEqual(("PlayerControl", ("Play",)), parse_builtin("PlayerControl(Play)"))
+        self.assertEqual(
+            ("RunPlugin", ("plugin://plugin.video.example/?a=1,2", "Notify(x,y)", 'say "hi"', " b ")),
+            parse_builtin('RunPlugin("plugin://plugin.video.example/?a=1,2", Notify(x,y), "say \\"hi\\"", " b ")'))
+        self.assertIs(parse_builtin("SetProperty(a,b)"), parse_builtin("SetProperty(a,b)"))
+
+        with self.assertRaises(ValueError):
+            parse_builtin("Set Property(a,b)")
+
+    def test_case_insensitive(self):
+        xbmc.executebuiltin('setproperty(CaseTest,1)')
+        xbmc.executebuiltin('SETPROPERTY(CaseTest2,2,Home)')
+        self.assertEqual("1", xbmc.getInfoLabel("Window(Home).Property(casetest)"))
+        self.assertEqual("2", xbmc.getInfoLabel("Window(10000).Property(CaseTest2)"))
+        self.assertEqual("", xbmc.getInfoLabel("Window.Property(unknown)"))
+
+    def test_notifyall(self):
+        notifications = []
+
+        class Monitor(xbmc.Monitor):
+            def onNotification(self, sender, method, data):  # NOSONAR
+                notifications.append((sender, method, data))
+
+        monitor = Monitor()
+        xbmc.executebuiltin('NotifyAll(plugin.video.example, refresh, "{\\"id\\": 1}")')
+        xbmc.executebuiltin('NotifyAll(plugin.video.example, ping)')
+        self.assertEqual([
+            ("plugin.video.example", "Other.refresh", '{"id": 1}'),
+            ("plugin.video.example", "Other.ping", "null"),
+        ], notifications)
+        del monitor
+
+    def test_runscript(self):
+        output = os.path.join(tempfile.gettempdir(), 'sakee_runscript.txt')
+        script = os.path.join(tempfile.gettempdir(), 'sakee_runscript.py')
+        with open(script, 'w') as fdesc:
+            fdesc.write("import sys\nwith open(%r, 'w') as f:\n    f.write('|'.join(sys.argv[1:]))\n" % output)
+        self.addCleanup(os.remove, script)
+
+        xbmc.executebuiltin('RunScript(%s, first, "second, with comma")' % script, wait=True)
+        with open(output) as fdesc:
+            self.assertEqual("first|second, with comma", fdesc.read())
+
+    def test_runaddon_and_container(self):
+        for builtin in ('RunAddon(plugin.video.example, /touch?filename=%s)',
+                        'Container.Update(plugin://plugin.video.example/touch?filename=%s, replace)',
+                        'Container.Refresh'):
+            filename = 'sakee_container.txt'
+            full_filename = os.path.join(tempfile.gettempdir(), filename)
+            if os.path.exists(full_filename):
+                os.remove(full_filename)
+
+            xbmc.executebuiltin(builtin.replace('%s', filename), wait=True)
+            self.assertTrue(os.path.exists(full_filename), builtin)
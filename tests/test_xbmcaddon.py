@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import xbmcaddon
+from sakee import addoninfo, localization
+
+_io_open = io.open
+
+
+class TestAddon(unittest.TestCase):
+    add_on_id = "plugin.video.example"
+
+    def setUp(self) -> None:
+        xbmcaddon.AddonCore.clear()
+
+    def test_addon_info(self) -> None:
+        addon = xbmcaddon.Addon(self.add_on_id)
+
+        self.assertEqual(self.add_on_id, addon.getAddonInfo("id"))
+        self.assertEqual("Example Addon", addon.getAddonInfo("name"))
+        self.assertEqual("1.0.0", addon.getAddonInfo("version"))
+        self.assertEqual("Example", addon.getAddonInfo("author"))
+        self.assertEqual("An example add-on", addon.getAddonInfo("summary"))
+        self.assertEqual("xbmc.python.pluginsource", addon.getAddonInfo("type"))
+
+    def test_localized_string(self) -> None:
+        addon = xbmcaddon.Addon(self.add_on_id)
+
+        self.assertEqual("Username", addon.getLocalizedString(30001))
+        self.assertEqual("Translated 39999", addon.getLocalizedString(39999))
+
+    def test_instances_share_core(self) -> None:
+        first = xbmcaddon.Addon(self.add_on_id)
+        second = xbmcaddon.Addon(self.add_on_id)
+
+        self.assertIs(first.getSettings(), second.getSettings())
+
+        first.getSettings().setString("username", "kodi")
+        self.assertEqual("kodi", second.getSettings().getString("username"))
+
+        # The change is persisted to the add-on's profile folder
+        profile_path = first.getAddonInfo("profile")
+        self.addCleanup(shutil.rmtree, profile_path, ignore_errors=True)
+        first.getSettings().flush()
+
+        xbmcaddon.AddonCore.clear()
+        self.assertEqual("kodi", xbmcaddon.Addon(self.add_on_id).getSettings().getString("username"))
+
+
+    def test_changed_profile_settings_are_read_again(self) -> None:
+        profile_path = xbmcaddon.Addon(self.add_on_id).getAddonInfo("profile")
+        self.addCleanup(shutil.rmtree, profile_path, ignore_errors=True)
+        os.makedirs(profile_path, exist_ok=True)
+        settings_path = os.path.join(profile_path, "settings.xml")
+
+        for username in ("first", "changed externally"):
+            with io.open(settings_path, "w", encoding="utf-8") as fp:
+                fp.write('<settings version="2"><setting id="username">{}</setting></settings>'.format(username))
+            self.assertEqual(username, xbmcaddon.Addon(self.add_on_id).getSetting("username"))
+
+class TestAddonLazyLoading(unittest.TestCase):
+    add_on_id = "plugin.video.example"
+
+    def setUp(self) -> None:
+        xbmcaddon.AddonCore.clear()
+        xbmcaddon.Settings.default_settings_cache.clear()
+        xbmcaddon.Settings.profile_settings_cache.clear()
+        localization.strings_cache.clear()
+        addoninfo.metadata_cache.clear()
+
+        self.opened = []
+        for target in ("io.open", "builtins.open"):
+            patcher = mock.patch(target, side_effect=self.__open)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def __open(self, file, *args, **kwargs):
+        self.opened.append(os.path.basename(file))
+        return _io_open(file, *args, **kwargs)
+
+    def __count_opens(self, call):
+        del self.opened[:]
+        call()
+        return list(self.opened)
+
+    def test_construction_does_not_open_files(self) -> None:
+        self.assertEqual([], self.__count_opens(lambda: xbmcaddon.Addon(self.add_on_id)))
+
+    def test_path_info_does_not_open_files(self) -> None:
+        addon = xbmcaddon.Addon(self.add_on_id)
+
+        for info in ("id", "path", "profile"):
+            with self.subTest(info=info):
+                self.assertEqual([], self.__count_opens(lambda: addon.getAddonInfo(info)))
+
+    def test_metadata_opens_addon_xml_once(self) -> None:
+        addon = xbmcaddon.Addon(self.add_on_id)
+
+        self.assertEqual(["addon.xml"], self.__count_opens(lambda: addon.getAddonInfo("name")))
+        self.assertEqual([], self.__count_opens(lambda: addon.getAddonInfo("version")))
+
+    def test_localized_string_opens_strings_once(self) -> None:
+        addon = xbmcaddon.Addon(self.add_on_id)
+
+        self.assertEqual(["strings.po"], self.__count_opens(lambda: addon.getLocalizedString(30000)))
+        self.assertEqual([], self.__count_opens(lambda: addon.getLocalizedString(30001)))
+
+    def test_settings_open_settings_once(self) -> None:
+        addon = xbmcaddon.Addon(self.add_on_id)
+
+        self.assertEqual(["settings.xml"], self.__count_opens(lambda: addon.getSettings().getBool("hd")))
+        self.assertEqual([], self.__count_opens(lambda: addon.getSetting("username")))
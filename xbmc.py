@@ -1,12 +1,15 @@
 # SPDX-License-Identifier: GPL-3.0
 
-import io
 import json
 import os
+import re
 import signal
+import threading
 import time
+import weakref
 
 from sakee import addoninfo
+from sakee.addonregistry import AddonRegistry
 from sakee.colors import Colors
 from sakee.internalplayer import KodiInteralPlayer
 from sakee.stub import KodiStub
@@ -40,12 +43,19 @@ TRAY_OPEN = 16
 
 # noinspection PyPep8Naming
 class Monitor(KodiStub):
+    # The monitors that receive notifications
+    __monitors = weakref.WeakSet()
+    __monitors_lock = threading.Lock()
+
     def __init__(self):
         """ Creates a Dummy Kodi Monitor class """
 
         super(Monitor, self).__init__()
         self.__abort = False
 
+        with Monitor.__monitors_lock:
+            Monitor.__monitors.add(self)
+
         # noinspection PyUnusedLocal
         def stop_requested(signum, frame):
             self.__abort = True
@@ -83,6 +93,34 @@ class Monitor(KodiStub):
 
         return False
 
+    def onNotification(self, sender, method, data):  # NOSONAR
+        """ onNotification method.
+
+        Will be called when Kodi receives or sends a notification.
+
+        :param str sender:  Sender of the notification.
+        :param str method:  Name of the notification.
+        :param str data:    JSON-encoded data of the notification.
+
+        """
+
+    @staticmethod
+    def notify_all(sender, method, data):
+        """ Sends a notification to all monitors.
+
+        :param str sender:  Sender of the notification.
+        :param str method:  Name of the notification.
+        :param str data:    JSON-encoded data of the notification.
+
+        """
+
+        with Monitor.__monitors_lock:
+            monitors = list(Monitor.__monitors)
+
+        KodiStub.print_line("Notification: {0} {1} {2}".format(sender, method, data), color=Colors.Blue, verbose=True)
+        for monitor in monitors:
+            monitor.onNotification(sender, method, data)
+
 
 # noinspection PyPep8Naming
 class Keyboard(KodiStub):
@@ -184,18 +222,21 @@ class Keyboard(KodiStub):
 
 # noinspection PyArgumentList,PyPep8Naming
 class PlayList(KodiStub):
+    # The items of the playlists, by playlist id. Just like in Kodi, all instances share the items.
+    __play_list_items = {}
+
     def __init__(self, playList):  # NOSONAR
         """ Playlist object
 
         :param int playList:    The type of playlist
 
-        PLAYLIST_MUSIC = 13
-        PLAYLIST_VIDEO = 14
+        PLAYLIST_MUSIC = 0
+        PLAYLIST_VIDEO = 1
 
         """
 
         self.__play_list_type = playList
-        self.__items = []
+        self.__items = PlayList.__play_list_items.setdefault(playList, [])
 
         super(PlayList, self).__init__()
 
@@ -210,7 +251,7 @@ class PlayList(KodiStub):
 
     def clear(self):
         """ Clear all items in the playlist. """
-        self.__items = []
+        del self.__items[:]
 
     def getposition(self):
         """ Returns the position of the current song in this playlist.
@@ -671,44 +712,19 @@ class Player(KodiStub):
 def executeJSONRPC(jsonrpccommand):  # NOSONAR
     """ Execute an JSONRPC command.
 
-    :param str jsonrpccommand:   jsonrpc command to execute.
+    :param str jsonrpccommand:   jsonrpc command to execute. This can also be a batch (an array) of commands.
 
-    :return: jsonrpc return string
+    :return: jsonrpc return string (an array for batches)
     :rtype: str
 
     See https://codedocs.xyz/xbmc/xbmc/namespace_j_s_o_n_r_p_c.html
     """
-    from sakee.sakejsonrpc import JsonRpcApi
+    from sakee.sakejsonrpc import execute_jsonrpc_obj
 
-    json_data = json.loads(jsonrpccommand)
-    try:
-        # Implement some methods for real
-        return json.dumps(JsonRpcApi().handle(json_data))
-
-    except NotImplementedError:
-        # Fallback to stubs
-        pass
-
-    json_responses = os.environ.get("KODI_STUB_RPC_RESPONSES")
-    if json_responses:
-        path = "{}.json".format(os.path.join(json_responses, json_data["method"].lower()))
-        if os.path.isfile(path):
-            with io.open(path, mode='r', encoding='utf-8') as fd:
-                stub_content = json.loads(fd.read())
-                if isinstance(stub_content, dict):
-                    return json.dumps(stub_content)
-                try:
-                    return json.dumps(next(stub.get('response')
-                                           for stub in stub_content
-                                           if json_data.get('params')
-                                           and stub.get('request', {}).get('method') == json_data.get('method')
-                                           and stub.get('request', {}).get('params') == json_data.get('params')))
-                except StopIteration:
-                    pass
-    else:
-        KodiStub.print_line("Warning: Could not find JSON Response folder. Use the environment variable KODI_STUB_RPC_RESPONSES to set one.", color=Colors.Red)
-
-    return json.dumps(dict(id=1, jsonrpc="2.0", result="OK"))
+    response = execute_jsonrpc_obj(json.loads(jsonrpccommand))
+    if response is None:
+        return ""
+    return json.dumps(response)
 
 
 # noinspection PyPep8Naming
@@ -737,10 +753,11 @@ def translatePath(path):  # NOSONAR
     return xbmcvfs.translatePath(path)
 
 
-def executebuiltin(function):
+def executebuiltin(function, wait=False):
     """ Execute a built in Kodi function.
 
     :param str function:    builtin function to execute.
+    :param bool wait:       If the function runs in the background (RunPlugin, ...), wait until it finished.
 
     See: http://kodi.wiki/view/List_of_Built_In_Functions
 
@@ -749,7 +766,7 @@ def executebuiltin(function):
 
     try:
         # Implement some methods for real
-        BuiltinApi().handle(function)
+        BuiltinApi().handle(function, wait)
 
     except NotImplementedError:
         # Fallback to stubs
@@ -788,18 +805,15 @@ def getCondVisibility(condition):  # NOSONAR
     return final_result
 
 
+__window_property_regex = re.compile(r'^Window(?:\((\w+)\))?\.Property\((.*)\)$', re.IGNORECASE)
+
+
 def __get_cond_visibility(condition):
     result = False
     condition = condition.strip()
     if condition.startswith('System.HasAddon('):
         add_on_id = condition.replace('System.HasAddon(', '').replace(')', '').strip('"')
-        add_ons = os.listdir(os.path.join(__add_on_info.kodi_home_path, "addons"))
-
-        parent_path = os.path.join(__add_on_info.kodi_home_path, "..", "addons")
-        if os.path.isdir(parent_path):
-            add_ons += os.listdir(parent_path)
-
-        result = add_on_id in add_ons
+        result = AddonRegistry.get(__get_add_on_info().kodi_home_path).has_addon(add_on_id)
 
     elif condition.startswith('System.AddonIsEnabled('):
         result = True
@@ -843,6 +857,11 @@ def getInfoLabel(infoTag):  # NOSONAR
         ip_address = socket.gethostbyname(hostname)
         return ip_address
 
+    match = __window_property_regex.match(infoTag)
+    if match:
+        from sakee.sakebuiltin import get_window_property
+        return get_window_property(match.group(2), match.group(1))
+
     return "InfoLabel:{}".format(infoTag)
 
 
@@ -920,4 +939,7 @@ def log(msg, level=0):
         print(msg)
 
 
-__add_on_info = addoninfo.get_add_on_info_from_calling_script(print_info=True)
+def __get_add_on_info():
+    """ The paths of the active add-on: from the active EmulatorContext or the working directory. """
+
+    return addoninfo.get_add_on_info_from_calling_script(print_info=True)
@@ -2,12 +2,15 @@
 from sakee.colors import Colors
 import io
 import os
-import re
+import threading
 import xml.etree.ElementTree as ElementTree
-from typing import Dict, List, Literal
+from typing import Dict, List, Literal, Tuple, Union
 from typing import Optional
+from xml.sax.saxutils import escape, quoteattr
 
-from sakee import addoninfo
+from sakee import addoninfo, localization
+from sakee.filecache import FileCache
+from sakee.persistence import BatchedWriter
 from sakee.stub import KodiStub
 
 SettingType = Literal[
@@ -21,126 +24,114 @@ SettingType = Literal[
     "float_list",
 ]
 
+SettingValue = Union[str, bool, int, float, Tuple[str, ...], Tuple[bool, ...], Tuple[int, ...], Tuple[float, ...]]
+
+# The separator that Kodi uses to store the values of list settings.
+LIST_SEPARATOR = "|"
+
 
 # noinspection PyPep8Naming,PyShadowingBuiltins
 class Settings:
     __profile_settings_path: Optional[str]
     __default_settings_path: str
     __settings: Dict[str, str]
+    __values: Dict[str, SettingValue]
     __setting_types: Dict[str, SettingType]
+    __default_values: Dict[str, str]
+
+    # Parsed settings files are shared by all instances until the files change on disk.
+    default_settings_cache = FileCache("settings.xml (default)")
+    profile_settings_cache = FileCache("settings.xml (profile)")
 
     def __init__(self, default_settings_path: str, profile_settings_path: Optional[str] = None) -> None:
         self.__default_settings_path = default_settings_path
         self.__profile_settings_path = profile_settings_path
         self.__settings = {}
+        self.__values = {}
         self.__setting_types = {}
+        self.__default_values = {}
+        # Settings can be shared between Addon instances (and threads), so guard the updates.
+        self.__lock = threading.RLock()
         self.__read_settings()
 
     # String settings
     def getString(self, id: str) -> str:
-        self.__validate_setting_type(id, "string")
-        return self.__settings[id]
+        return self.__get_value(id, "string")
 
     def setString(self, id: str, value: str) -> None:
-        self.__validate_setting_type(id, "string")
         if not isinstance(value, str):
             raise TypeError(f"Setting '{id}' requires a string value")
-        self.__settings[id] = value
+        self.__set_value(id, "string", value)
 
     def getStringList(self, id: str) -> List[str]:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "string_list")
-        # values = json.loads(self.__settings[id])
-        # return [str(value) for value in values]
+        return list(self.__get_value(id, "string_list"))
 
     def setStringList(self, id: str, values: List[str]) -> None:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "string_list")
-        # if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
-        #     raise TypeError(f"Setting '{id}' requires a list of strings")
-        # self.__settings[id] = json.dumps(values)
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise TypeError(f"Setting '{id}' requires a list of strings")
+        self.__set_value(id, "string_list", tuple(values))
 
     # Boolean settings
     def getBool(self, id: str) -> bool:
-        self.__validate_setting_type(id, "boolean")
-        return self.__settings[id].strip().lower() == "true"
+        return self.__get_value(id, "boolean")
 
     def setBool(self, id: str, value: bool) -> None:
-        self.__validate_setting_type(id, "boolean")
         if not isinstance(value, bool):
             raise TypeError(f"Setting '{id}' requires a boolean value")
-        self.__settings[id] = "true" if value else "false"
+        self.__set_value(id, "boolean", value)
 
     def getBoolList(self, id: str) -> List[bool]:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "boolean_list")
-        # values = json.loads(self.__settings[id])
-        # return [bool(value) for value in values]
+        return list(self.__get_value(id, "boolean_list"))
 
     def setBoolList(self, id: str, values: List[bool]) -> None:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "boolean_list")
-        # if not isinstance(values, list) or not all(isinstance(value, bool) for value in values):
-        #     raise TypeError(f"Setting '{id}' requires a list of booleans")
-        # self.__settings[id] = json.dumps(values)
+        if not isinstance(values, list) or not all(isinstance(value, bool) for value in values):
+            raise TypeError(f"Setting '{id}' requires a list of booleans")
+        self.__set_value(id, "boolean_list", tuple(values))
 
     # Integer settings
     def getInt(self, id: str) -> int:
-        self.__validate_setting_type(id, "integer")
-        return int(self.__settings[id])
+        return self.__get_value(id, "integer")
 
     def setInt(self, id: str, value: int) -> None:
-        self.__validate_setting_type(id, "integer")
         if not isinstance(value, int) or isinstance(value, bool):
             raise TypeError(f"Setting '{id}' requires an integer value")
-        self.__settings[id] = str(value)
+        self.__set_value(id, "integer", value)
 
     def getIntList(self, id: str) -> List[int]:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "integer_list")
-        # values = json.loads(self.__settings[id])
-        # return [int(value) for value in values]
+        return list(self.__get_value(id, "integer_list"))
 
     def setIntList(self, id: str, values: List[int]) -> None:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "integer_list")
-        # if not isinstance(values, list) or not all(
-        #     isinstance(value, int) and not isinstance(value, bool) for value in values
-        # ):
-        #     raise TypeError(f"Setting '{id}' requires a list of integers")
-        # self.__settings[id] = json.dumps(values)
+        if not isinstance(values, list) or not all(
+            isinstance(value, int) and not isinstance(value, bool) for value in values
+        ):
+            raise TypeError(f"Setting '{id}' requires a list of integers")
+        self.__set_value(id, "integer_list", tuple(values))
 
     # Number settings
     def getNumber(self, id: str) -> float:
-        self.__validate_setting_type(id, "float")
-        return float(self.__settings[id])
+        return self.__get_value(id, "float")
 
     def setNumber(self, id: str, value: float) -> None:
-        self.__validate_setting_type(id, "float")
         if not isinstance(value, float):
             raise TypeError(f"Setting '{id}' requires a floating-point value")
-        self.__settings[id] = str(value)
+        self.__set_value(id, "float", value)
 
     def getNumberList(self, id: str) -> List[float]:
-        raise NotImplementedError("Not Yet Implemented")
-
-        # self.__validate_setting_type(id, "integer_list")
-        # values = json.loads(self.__settings[id])
-        # return [float(value) for value in values]
+        return list(self.__get_value(id, "float_list"))
 
     def setNumberList(self, id: str, values: List[float]) -> None:
-        raise NotImplementedError("Not Yet Implemented")
+        if not isinstance(values, list) or not all(isinstance(value, float) for value in values):
+            raise TypeError(f"Setting '{id}' requires a list of floating-point values")
+        self.__set_value(id, "float_list", tuple(values))
 
-        # self.__validate_setting_type(id, "integer_list")
-        # if not isinstance(values, list) or not all(isinstance(value, float) for value in values):
-        #     raise TypeError(f"Setting '{id}' requires a list of integer values")
-        # self.__settings[id] = json.dumps(values)
+    def flush(self) -> None:
+        """ Writes pending changes to the profile settings.xml now instead of waiting for the
+        batched write.
+
+        """
+
+        if self.__profile_settings_path:
+            BatchedWriter.instance().flush(self.__profile_settings_path)
 
     def _raw_settings(self) -> Dict[str, str]:
         return self.__settings
@@ -164,7 +155,12 @@ class Settings:
 
         """
 
-        self.__settings[id] = value
+        with self.__lock:
+            self.__settings[id] = value
+            if id in self.__setting_types:
+                self.__values[id] = Settings.__decode(self.__setting_types[id], value)
+        # Schedule the write after releasing the lock, so this lock is never held while taking the lock of the writer.
+        self.__persist()
 
     def items(self):
         return self.__settings.items()
@@ -179,42 +175,148 @@ class Settings:
         if not os.path.isfile(self.__default_settings_path):
             return
 
-        with io.open(self.__default_settings_path, encoding="utf-8") as fp:
+        default_settings = Settings.default_settings_cache.get(
+            self.__default_settings_path, Settings.__parse_default_settings)
+        for setting_id, (setting_type, default_value, value) in default_settings.items():
+            self.__setting_types[setting_id] = setting_type
+            self.__default_values[setting_id] = default_value
+            self.__settings[setting_id] = default_value
+            self.__values[setting_id] = value
+
+        if not self.__profile_settings_path or not os.path.isfile(self.__profile_settings_path):
+            return
+
+        profile_settings = Settings.profile_settings_cache.get(
+            self.__profile_settings_path, Settings.__parse_profile_settings)
+        for setting_id, value in profile_settings.items():
+            if setting_id not in self.__setting_types:
+                continue
+
+            self.__settings[setting_id] = value
+            self.__values[setting_id] = Settings.__decode(self.__setting_types[setting_id], value)
+
+    def __get_value(self, id: str, expected_type: SettingType) -> SettingValue:
+        self.__validate_setting_type(id, expected_type)
+        return self.__values[id]
+
+    def __set_value(self, id: str, expected_type: SettingType, value: SettingValue) -> None:
+        with self.__lock:
+            self.__validate_setting_type(id, expected_type)
+            self.__values[id] = value
+            self.__settings[id] = Settings.__encode(expected_type, value)
+        self.__persist()
+
+    def __persist(self) -> None:
+        """ Schedules a batched write of the settings to the profile settings.xml. """
+
+        if not self.__profile_settings_path:
+            return
+
+        BatchedWriter.instance().schedule(self.__profile_settings_path, self.__render_profile_settings)
+
+    def __render_profile_settings(self) -> str:
+        """ Renders the settings in the format Kodi uses for the profile settings.xml.
+
+        :return: The XML content.
+
+        """
+
+        lines = ['<settings version="2">']
+        with self.__lock:
+            for setting_id, value in self.__settings.items():
+                if value == self.__default_values.get(setting_id):
+                    lines.append('    <setting id={} default="true">{}</setting>'.format(
+                        quoteattr(setting_id), escape(value)))
+                else:
+                    lines.append('    <setting id={}>{}</setting>'.format(quoteattr(setting_id), escape(value)))
+        lines.append('</settings>')
+        lines.append('')
+        return "\n".join(lines)
+
+    @staticmethod
+    def __parse_default_settings(path: str) -> Dict[str, Tuple[SettingType, str, SettingValue]]:
+        with io.open(path, encoding="utf-8") as fp:
             default_root = ElementTree.parse(fp).getroot()
 
+        default_settings = {}
         for element in default_root.iter("setting"):
             setting_id = element.get("id")
 
             if not setting_id:
                 continue
 
-            setting_type = self.__get_setting_type(element)
+            setting_type = Settings.__get_setting_type(element)
             default_node = [a for a in element.iterfind("default")]
             if default_node:
                 default_value = default_node[0].text or ""
             else:
                 default_value = element.get("default", "")
 
-            self.__setting_types[setting_id] = setting_type
-            self.__settings[setting_id] = default_value
+            default_settings[setting_id] = (
+                setting_type, default_value, Settings.__decode(setting_type, default_value))
 
-        if not self.__profile_settings_path or not os.path.isfile(self.__profile_settings_path):
-            return
+        return default_settings
 
-        with io.open(self.__profile_settings_path, encoding="utf-8") as fp:
+    @staticmethod
+    def __parse_profile_settings(path: str) -> Dict[str, str]:
+        with io.open(path, encoding="utf-8") as fp:
             profile_root = ElementTree.parse(fp).getroot()
 
+        profile_settings = {}
         for element in profile_root.iter("setting"):
             setting_id = element.get("id")
 
-            if not setting_id or setting_id not in self.__setting_types:
+            if not setting_id:
                 continue
 
             value = element.get("value")
             if value is None:
                 value = element.text or ""
 
-            self.__settings[setting_id] = value
+            profile_settings[setting_id] = value
+
+        return profile_settings
+
+    @staticmethod
+    def __decode(setting_type: SettingType, text: str) -> SettingValue:
+        """ Converts the stored string value into the typed value.
+
+        Values that cannot be converted result in the 'empty' value for the type, just like Kodi
+        falls back for invalid values.
+
+        """
+
+        if setting_type.endswith("_list"):
+            item_type = setting_type[:-len("_list")]
+            if not text:
+                return ()
+            return tuple(Settings.__decode(item_type, item) for item in text.split(LIST_SEPARATOR))
+
+        if setting_type == "boolean":
+            return text.strip().lower() == "true"
+
+        try:
+            if setting_type == "integer":
+                return int(text)
+            if setting_type == "float":
+                return float(text)
+        except ValueError:
+            return 0 if setting_type == "integer" else 0.0
+
+        return text
+
+    @staticmethod
+    def __encode(setting_type: SettingType, value: SettingValue) -> str:
+        """ Converts a typed value into the string value stored in the settings.xml. """
+
+        if setting_type.endswith("_list"):
+            item_type = setting_type[:-len("_list")]
+            return LIST_SEPARATOR.join(Settings.__encode(item_type, item) for item in value)
+
+        if setting_type == "boolean":
+            return "true" if value else "false"
+
+        return str(value)
 
     @staticmethod
     def __get_setting_type(element: ElementTree.Element) -> SettingType:
@@ -239,9 +341,16 @@ class Settings:
         if setting_type == "number_list":
             return "integer_list"
 
-        if setting_type in {"string_list", "boolean_list", "integer_list"}:
+        if setting_type in {"string_list", "boolean_list", "integer_list", "float_list"}:
             return setting_type
 
+        if setting_type.startswith("list[") and setting_type.endswith("]"):
+            item_type = setting_type[len("list["):-1]
+            if item_type == "number":
+                return "float_list"
+            if item_type in {"string", "boolean", "integer"}:
+                return f"{item_type}_list"
+
         return "string"
 
     def __validate_setting_type(self, id: str, expected_type: SettingType) -> None:
@@ -252,44 +361,109 @@ class Settings:
         if actual_type != expected_type:
             raise TypeError(f"Setting '{id}' is '{actual_type}', not '{expected_type}'")
 
+
+class AddonCore(object):
+    __cores: Dict[addoninfo.AddonData, "AddonCore"] = {}
+    __cores_lock = threading.Lock()
+
+    __settings: Optional[Settings]
+    __settings_signatures: Optional[Tuple[Optional[tuple], Optional[tuple]]]
+
+    def __init__(self, paths: addoninfo.AddonData) -> None:
+        """ The parsed state of an add-on that is shared by all Addon instances with the same id.
+
+        The metadata (addon.xml), strings (strings.po) and settings (settings.xml) are read on
+        first access and again when the files changed on disk. The metadata and strings are
+        read-only. The settings are a single store for all instances and its setters are protected
+        by a lock.
+
+        :param paths:   The paths for the add-on.
+
+        """
+
+        self.kodi_home_path = paths.kodi_home_path
+        self.add_on_id = paths.add_on_id
+        self.add_on_path = paths.add_on_path
+        self.add_on_profile_path = os.path.join(paths.kodi_profile_path, "addon_data", self.add_on_id)
+
+        self.__settings = None
+        self.__settings_signatures = None
+        self.__lock = threading.RLock()
+
+    @property
+    def metadata(self) -> addoninfo.AddonMetadata:
+        """ The metadata from the addon.xml. """
+
+        # The metadata cache only parses the file again when it changed.
+        return addoninfo.get_addon_metadata(os.path.join(self.add_on_path, "addon.xml"))
+
+    @property
+    def localization(self) -> Dict[int, str]:
+        """ The English strings from the strings.po. """
+
+        return self.__get_strings()
+
+    @property
+    def settings(self) -> Settings:
+        """ The settings store for the add-on.
+
+        The store is created again when one of the settings.xml files changed on disk, unless
+        there are changes in the store that were not written yet.
+
+        """
+
+        default_settings_path = os.path.join(self.add_on_path, "resources", "settings.xml")
+        profile_settings_path = os.path.join(self.add_on_profile_path, "settings.xml")
+        signatures = (FileCache.signature(default_settings_path), FileCache.signature(profile_settings_path))
+
+        if self.__settings is None or signatures != self.__settings_signatures:
+            with self.__lock:
+                if self.__settings is None or (signatures != self.__settings_signatures and
+                                               not BatchedWriter.instance().is_pending(profile_settings_path)):
+                    self.__settings = Settings(default_settings_path, profile_settings_path)
+                self.__settings_signatures = signatures
+        return self.__settings
+
+    @staticmethod
+    def get(add_on_id: Optional[str] = None) -> "AddonCore":
+        """ Returns the shared core for an add-on, creating it on first use.
+
+        :param add_on_id:   The ID of the add-on or None for the calling add-on.
+
+        """
+
+        paths = addoninfo.get_add_on_info_from_calling_script(add_on_id)
+        with AddonCore.__cores_lock:
+            core = AddonCore.__cores.get(paths)
+            if core is None:
+                core = AddonCore(paths)
+                AddonCore.__cores[paths] = core
+            return core
+
+    @staticmethod
+    def clear() -> None:
+        """ Removes all shared add-on cores, so they are read again on next use. """
+
+        with AddonCore.__cores_lock:
+            AddonCore.__cores.clear()
+
+    def __get_strings(self):
+        english = os.path.join(self.add_on_path, "resources", "language", "resource.language.en_gb", "strings.po")
+        if not os.path.isfile(english):
+            return {}
+
+        return localization.get_strings(english)
+
+
 # noinspection PyPep8Naming,PyShadowingBuiltins
 class Addon(KodiStub):
-    __version: Optional[str]
-    __name: Optional[str]
-    __author: Optional[str]
-    __icon: Optional[str]
-    __summary: Optional[str]
-    __news: Optional[str]
-    __disclaimer: Optional[str]
-    __description: Optional[str]
-    __settings: Settings
+    __core: AddonCore
 
     def __init__(self, id=None):
         super(Addon, self).__init__()
 
-        self.__add_on_id = id
-        # Get some data from the path of the calling file
-        paths = addoninfo.get_add_on_info_from_calling_script(id)
-        self.__kodi_home_path = paths.kodi_home_path
-        self.__add_on_id = paths.add_on_id
-        self.__add_on_path = paths.add_on_path
-        self.__add_on_profile_path = os.path.join(paths.kodi_profile_path, "addon_data", self.__add_on_id)
-
-        # actual live data
-        self.__version = None
-        self.__name = None
-        self.__author = None
-        self.__icon = None
-        self.__summary = None
-        self.__news = None
-        self.__disclaimer = None
-        self.__description = None
-        self.__load_add_on_xml()
-        self.__localization = self.__get_strings()
-
-        default_settings_path = os.path.join(self.__add_on_path, "resources", "settings.xml")
-        profile_settings_path = os.path.join(self.__add_on_profile_path, "settings.xml")
-        self.__settings = Settings(default_settings_path, profile_settings_path)
+        # All instances for the same add-on share the (lazily) parsed add-on data.
+        self.__core = AddonCore.get(id)
 
     def getLocalizedString(self, id: int) -> str:
         """ Returns an addon's localized 'unicode string'.
@@ -301,7 +475,7 @@ class Addon(KodiStub):
 
         """
 
-        return self.__localization.get(id, "Translated {}".format(id))
+        return self.__core.localization.get(id, "Translated {}".format(id))
 
     def getSettings(self):
         """ Returns a wrapper around the addon’s settings.
@@ -310,7 +484,7 @@ class Addon(KodiStub):
 
         """
 
-        return self.__settings
+        return self.__core.settings
 
     def getSetting(self, id: str) -> Optional[str]:
         """ Returns the value of a setting as a unicode string.
@@ -334,7 +508,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.getBool() instead.", color=Colors.Red)
-        return self.__settings.getBool(id)
+        return self.__core.settings.getBool(id)
 
     def getSettingInt(self, id: str) -> int:
         """ Returns the value of a setting as an integer.
@@ -347,7 +521,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.getInt() instead.", color=Colors.Red)
-        return self.__settings.getInt(id)
+        return self.__core.settings.getInt(id)
 
     def getSettingNumber(self, id: str) -> float:
         """ Returns the value of a setting as a floating point number.
@@ -359,7 +533,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.getNumber() instead.", color=Colors.Red)
-        return self.__settings.getNumber(id)
+        return self.__core.settings.getNumber(id)
 
     def getSettingString(self, id: str) -> str:
         """ Returns the value of a setting as a string.
@@ -371,7 +545,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.getString() instead.", color=Colors.Red)
-        return self.__settings.getString(id)
+        return self.__core.settings.getString(id)
 
     def setSetting(self, id: str, value: str) -> None:
         """ Sets a script setting.
@@ -381,7 +555,7 @@ class Addon(KodiStub):
 
         """
 
-        self.__settings[id] = value
+        self.__core.settings[id] = value
 
     def setSettingBool(self, id: str, value: bool) -> bool:
         """ Sets a script setting.
@@ -394,7 +568,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.setBool() instead.", color=Colors.Red)
-        self.__settings.setBool(id, value)
+        self.__core.settings.setBool(id, value)
         return True
 
     def setSettingInt(self, id: str, value: int) -> bool:
@@ -408,7 +582,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.setInt() instead.", color=Colors.Red)
-        self.__settings.setInt(id, value)
+        self.__core.settings.setInt(id, value)
         return True
 
     def setSettingNumber(self, id: str, value: float) -> bool:
@@ -422,7 +596,7 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.setNumber() instead.", color=Colors.Red)
-        self.__settings.setNumber(id, value)
+        self.__core.settings.setNumber(id, value)
         return True
 
     def setSettingString(self, id: str, value: str) -> bool:  # NOSONAR
@@ -436,12 +610,12 @@ class Addon(KodiStub):
         """
 
         self.print_line("Deprecated. Use Settings.setString() instead.", color=Colors.Red)
-        self.__settings.setString(id, value)
+        self.__core.settings.setString(id, value)
         return True
 
     def openSettings(self) -> None:
         self.print_heading("Add-on settings")
-        for setting, value in self.__settings.items():
+        for setting, value in self.__core.settings.items():
             self.print_line("{}:{}".format(setting, value), verbose=True)
 
     def getAddonInfo(self, id: str) -> str:
@@ -455,103 +629,40 @@ class Addon(KodiStub):
                               name, path, profile, stars, summary, type, version
         """
         id = id.lower()
-        # missing: starts - type
+        # missing: stars
 
+        core = self.__core
+        if id == "id":
+            return core.add_on_id or ""
+        elif id == "path":
+            return core.add_on_path or ""
+        elif id == "profile":
+            return core.add_on_profile_path
+
+        # All other properties require the addon.xml
+        metadata = core.metadata
         if id == "author":
-            return self.__author or ""
+            return metadata.author or ""
         elif id == "changelog":
-            return self.__news or ""
+            return metadata.news or ""
         elif id == "description":
-            return self.__description or ""
+            return metadata.description or ""
         elif id == "disclaimer":
-            return self.__disclaimer or ""
+            return metadata.disclaimer or ""
         elif id == "fanart":
-            return str(self.__fanart)
+            return metadata.fanart or ""
         elif id == "icon":
-            return self.__icon or ""
-        elif id == "id":
-            return self.__add_on_id or ""
+            return metadata.icon or ""
         elif id == "name":
-            return self.__name or ""
-        elif id == "path":
-            return self.__add_on_path or ""
-        elif id == "profile":
-            return self.__add_on_profile_path
+            return metadata.name or ""
         elif id == "summary":
-            return self.__summary or ""
+            return metadata.summary or ""
+        elif id == "type":
+            return metadata.type or ""
         elif id == "version":
-            return self.__version or ""
+            return metadata.version or ""
 
         raise ValueError("Cannot find info '%s'" % (id,))
 
     def __repr__(self):
-        return repr(self.__settings)
-
-    def __get_strings(self):
-        english = os.path.join(self.__add_on_path, "resources", "language", "resource.language.en_gb", "strings.po")
-        if not os.path.isfile(english):
-            return {}
-
-        with io.open(english, "r", encoding='utf-8') as fp:
-            english_data = fp.read()
-
-        translations = {}
-        if not english_data:
-            return translations
-
-        # Take into account that there could be multi-line translations.
-        strings = re.findall(
-            r'msgctxt "#(\d+)"\W+msgid ((?:"[^\n\r]*"\W{1,2})+)msgstr ((?:"[^\n\r]*"\W{1,2})+)',
-            english_data, flags=re.IGNORECASE)
-
-        for string in strings:
-            translation = string[1]
-            # See if there was a translation present, if so, use it.
-            if string[2].strip('\n\r"'):
-                translation = string[2]
-            parts = translation.split('"')
-            msgs = [t for t in parts if t.strip()]
-            translation = "".join(msgs)
-            translation = translation.replace("[CR]", "\n")
-            translations[int(string[0])] = translation
-
-        return translations
-
-    def __filter_lang_xmltag(self, tag, xml_content):
-        tag_matches = re.findall(r'<' + tag + r'(?:\s*lang=\"([a-zA-Z-_]+)\")?\s*>(.*?)</' + tag + '>', xml_content, flags=re.DOTALL)
-        if tag_matches:
-            for match in tag_matches:
-                if match[0].startswith('en'):
-                    return match[1]
-            else:
-                return tag_matches[0][1]
-        return None
-
-    def __load_add_on_xml(self):
-        add_on_xml = os.path.join(self.__add_on_path, "addon.xml")
-
-        with io.open(add_on_xml, encoding='utf-8') as fp:
-            xml_content = fp.read()
-            self.__version = re.findall(r'<addon.*?version="([^"]*)', xml_content, flags=re.DOTALL)[0]
-            self.__add_on_id = re.findall(r'addon.*?id="([^"]+)"', xml_content, flags=re.DOTALL)[0]
-            self.__name = re.findall(r'name="([^"]+)"', xml_content)[0]
-
-            self.__description = self.__filter_lang_xmltag('description', xml_content)
-            self.__disclaimer = self.__filter_lang_xmltag('disclaimer', xml_content)
-            self.__summary = self.__filter_lang_xmltag('summary', xml_content)
-
-            author_matches = re.findall(r'<addon.*?provider-name="([^"]+)', xml_content, flags=re.DOTALL)
-            if author_matches:
-                self.__author = author_matches[0]
-
-            news_matches = re.findall(r'<news>(.*?)</news>', xml_content, flags=re.DOTALL)
-            if news_matches:
-                self.__news = news_matches[0]
-
-            fanart_matches = re.findall(r'<fanart>(.*?)</fanart>', xml_content, flags=re.DOTALL)
-            if fanart_matches:
-                self.__fanart = os.path.join(self.__add_on_path, fanart_matches[0])
-
-            icon_matches = re.findall(r'<icon>(.*?)</icon>', xml_content, flags=re.DOTALL)
-            if icon_matches:
-                self.__icon = os.path.join(self.__add_on_path, icon_matches[0])
+        return repr(self.__core.settings)
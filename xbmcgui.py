@@ -123,6 +123,49 @@ class ListItem(KodiStub):
         self.__art.update(values)
         self.print_line("Updating artwork with {}".format(values), verbose=True)
 
+    def getArt(self, key):  # NOSONAR
+        """ Returns a listitem art path as a string, similar to an infolabel.
+
+        :param str key:     The art type (thumb, poster, fanart, ...).
+
+        :return: The path of the art or an empty string.
+        :rtype: str
+
+        """
+
+        return self.__art.get(key, "")
+
+    def get_art(self):
+        """ Returns all the art of this listitem (not part of the Kodi API).
+
+        :return: Pairs of { label: value }.
+        :rtype: dict[str,str]
+
+        """
+
+        # setLabel() and setLabel2() also store the labels with the art
+        return dict((k, v) for k, v in self.__art.items() if k not in ("label1", "label2"))
+
+    def get_properties(self):
+        """ Returns the properties of this listitem (not part of the Kodi API).
+
+        :return: Pairs of { key: value }.
+        :rtype: dict[str,str]
+
+        """
+
+        return dict(self.__properties)
+
+    def get_info_labels(self):
+        """ Returns the infolabels of this listitem (not part of the Kodi API).
+
+        :return: Pairs of { label: value }.
+        :rtype: dict[str,any]
+
+        """
+
+        return dict((k, v) for k, v in self.__info.items() if not k.startswith("*"))
+
     def setLabel(self, label):  # NOSONAR
         """ Sets the listitem's label.
 
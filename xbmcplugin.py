@@ -238,7 +238,10 @@ def setResolvedUrl(handle, succeeded, listitem):  # NOSONAR
 
     if succeeded:
         KodiStub.print_line("Item resolved to: {}".format(listitem), color=Colors.Blue)
-        KodiInteralPlayer.instance().play_resolved_item(listitem.getPath(), listitem)
+        handle_info = PluginHandler.get_handle_info(handle)
+        handle_info.resolved_url = listitem.getPath()
+        if handle_info.play_resolved:
+            KodiInteralPlayer.instance().play_resolved_item(listitem.getPath(), listitem)
     else:
         KodiStub.print_line("Item failed to resolve: {}".format(listitem), color=Colors.Red)
 
@@ -358,18 +358,19 @@ def translatePath(path):  # NOSONAR
 
         return new_path
 
+    add_on_info = __get_add_on_info()
     if path.startswith("special://profile/"):
-        return_path = get_return_path(__add_on_info.kodi_profile_path,
+        return_path = get_return_path(add_on_info.kodi_profile_path,
                                       "profile",
                                       path.replace("special://profile/", ""))
 
     elif path.startswith("special://home/"):
-        return_path = get_return_path(__add_on_info.kodi_home_path,
+        return_path = get_return_path(add_on_info.kodi_home_path,
                                       "home",
                                       path.replace("special://home/", ""))
 
     elif path.startswith("special://xbmcbin/"):
-        return_path = get_return_path(__add_on_info.kodi_home_path,
+        return_path = get_return_path(add_on_info.kodi_home_path,
                                       "home",
                                       "system",
                                       path.replace("special://xbmcbin/", ""))
@@ -385,4 +386,7 @@ def translatePath(path):  # NOSONAR
     return actual_path
 
 
-__add_on_info = addoninfo.get_add_on_info_from_calling_script()
+def __get_add_on_info():
+    """ The paths of the active add-on: from the active EmulatorContext or the working directory. """
+
+    return addoninfo.get_add_on_info_from_calling_script()